@@ -14,25 +14,39 @@ Features:
 
 import pandas as pd
 import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
 import random
 import datetime
 from datetime import timedelta
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+import contextlib
+import multiprocessing as mp
 import uuid
 import hashlib
 from faker import Faker
-import json
+import orjson
 import os
+import gc
+import itertools
+import pathlib
+import shutil
+import sys
 from dataclasses import dataclass
-from typing import List, Dict, Optional, Tuple
+from typing import List, Dict, Iterator, Optional, Tuple
 import warnings
 warnings.filterwarnings('ignore')
 
 # Set random seeds for reproducibility
-np.random.seed(42)
 random.seed(42)
 fake = Faker(['en_GB'])
 Faker.seed(42)
 
+# Name pools drawn from Faker once and indexed per organisation
+NAME_POOL = np.array([fake.last_name() for _ in range(1000)], dtype=object)
+COMPANY_POOL = np.array([fake.company() for _ in range(500)], dtype=object)
+
 @dataclass
 class DataGenerationConfig:
     """Configuration for NHS data generation"""
@@ -45,6 +59,154 @@ class DataGenerationConfig:
     data_quality_degradation: float = 0.15  # 15% various quality issues
     seasonal_variation: bool = True
     covid_impact: bool = True
+    workers: int = os.cpu_count() or 1  # processes for sharded generation
+    seed: Optional[int] = 50  # quality-issue rng (generators keep their own seeds); None for fresh entropy
+
+# Common ICD-10 diagnosis codes with realistic prevalence
+ICD10_CODES = {
+    'I10': {'name': 'Essential hypertension', 'prevalence': 0.15},
+    'E11': {'name': 'Type 2 diabetes mellitus', 'prevalence': 0.08},
+    'I25': {'name': 'Chronic ischaemic heart disease', 'prevalence': 0.06},
+    'J44': {'name': 'Chronic obstructive pulmonary disease', 'prevalence': 0.04},
+    'N18': {'name': 'Chronic kidney disease', 'prevalence': 0.03},
+    'F32': {'name': 'Depressive episode', 'prevalence': 0.12},
+    'F41': {'name': 'Anxiety disorders', 'prevalence': 0.09},
+    'M79': {'name': 'Soft tissue disorders', 'prevalence': 0.07},
+    'R06': {'name': 'Abnormalities of breathing', 'prevalence': 0.05},
+    'Z51': {'name': 'Encounter for other aftercare', 'prevalence': 0.04},
+    'S72': {'name': 'Fracture of femur', 'prevalence': 0.002},
+    'I21': {'name': 'Acute myocardial infarction', 'prevalence': 0.001},
+    'J18': {'name': 'Pneumonia', 'prevalence': 0.02},
+    'K80': {'name': 'Cholelithiasis', 'prevalence': 0.015}
+}
+
+ICD10_KEYS = np.array(list(ICD10_CODES), dtype=object)
+
+# Common OPCS-4 procedure codes
+OPCS4_CODES = {
+    'Z92': {'name': 'Monitoring', 'frequency': 0.25},
+    'U07': {'name': 'Computer tomography', 'frequency': 0.12},
+    'W37': {'name': 'Cataract extraction', 'frequency': 0.08},
+    'H01': {'name': 'Cardiac catheterisation', 'frequency': 0.05},
+    'T87': {'name': 'Arthroscopy', 'frequency': 0.04},
+    'M65': {'name': 'Endoscopy of colon', 'frequency': 0.06},
+    'J27': {'name': 'Cholecystectomy', 'frequency': 0.03},
+    'W19': {'name': 'Excision of lesion of skin', 'frequency': 0.07}
+}
+
+# Healthcare Resource Groups for payment grouping
+HRG_CODES = {
+    'AA22': {'name': 'Non-elective long stay', 'tariff': 4500.00},
+    'AA23': {'name': 'Non-elective short stay', 'tariff': 1800.00},
+    'DZ19': {'name': 'Cardiac procedures', 'tariff': 8900.00},
+    'FF01': {'name': 'Cataract procedures', 'tariff': 950.00},
+    'HN12': {'name': 'Arthroscopic procedures', 'tariff': 2100.00},
+    'FZ92': {'name': 'Outpatient procedures', 'tariff': 180.00},
+    'WJ11': {'name': 'Emergency medicine', 'tariff': 280.00}
+}
+
+# British National Formulary prescription codes
+BNF_CODES = {
+    '0101010': {'name': 'Antacids', 'avg_cost': 3.50},
+    '0201010': {'name': 'Cardiac glycosides', 'avg_cost': 12.80},
+    '0206020': {'name': 'ACE inhibitors', 'avg_cost': 8.90},
+    '0301011': {'name': 'Beta2 agonists', 'avg_cost': 15.60},
+    '0401020': {'name': 'Anxiolytics', 'avg_cost': 6.70},
+    '0601060': {'name': 'Insulin', 'avg_cost': 45.20},
+    '0501130': {'name': 'Penicillins', 'avg_cost': 7.30},
+    '1001010': {'name': 'Non-opioid analgesics', 'avg_cost': 2.10},
+    '0403040': {'name': 'Antidepressants', 'avg_cost': 18.40}
+}
+
+BNF_KEYS = list(BNF_CODES)
+
+# Mental health referral sources
+MH_REFERRAL_SOURCES = {
+    'A01': 'GP',
+    'A02': 'Self referral',
+    'A03': 'A&E',
+    'A04': 'Acute hospital',
+    'A05': 'Criminal justice',
+    'A06': 'Other'
+}
+
+MH_REFERRAL_SOURCE_KEYS = list(MH_REFERRAL_SOURCES)
+
+# Mental health primary diagnoses (ICD-10 F codes)
+MH_DIAGNOSES = {
+    'F32': 'Depressive episode',
+    'F41': 'Anxiety disorders',
+    'F43': 'Stress-related disorders',
+    'F20': 'Schizophrenia',
+    'F31': 'Bipolar disorder',
+    'F60': 'Personality disorders',
+    'F10': 'Alcohol use disorders'
+}
+
+MH_DIAGNOSIS_KEYS = list(MH_DIAGNOSES)
+
+# Mental health care clusters (payment grouping)
+MH_CARE_CLUSTERS = {
+    1: 'Non-psychotic (low severity)',
+    2: 'Non-psychotic (medium severity)', 
+    3: 'Non-psychotic (high severity)',
+    4: 'Non-psychotic (very high severity)',
+    11: 'Ongoing recurrent psychosis',
+    12: 'Ongoing recurrent psychosis (high support)',
+    21: 'Cognitive impairment'
+}
+
+# Community service types
+COMMUNITY_SERVICES = {
+    'N01': 'District nursing',
+    'N02': 'Health visiting', 
+    'A01': 'Physiotherapy',
+    'A02': 'Occupational therapy',
+    'A03': 'Speech and language therapy',
+    'A04': 'Dietitian',
+    'N03': 'Community mental health',
+    'N04': 'Specialist nursing'
+}
+
+COMMUNITY_SERVICE_KEYS = list(COMMUNITY_SERVICES)
+
+# Community contact settings
+CONTACT_SETTINGS = {
+    '01': 'Patient home',
+    '02': 'Community clinic',
+    '03': 'GP practice',
+    '04': 'School',
+    '05': 'Care home'
+}
+
+CONTACT_SETTING_KEYS = list(CONTACT_SETTINGS)
+
+# Social care package types with weekly cost ranges
+SOCIAL_CARE_PACKAGE_TYPES = {
+    'HOMECARE': 'Home care',
+    'DAYCARE': 'Day care',
+    'RESIDENTIAL': 'Residential care',
+    'NURSING': 'Nursing home',
+    'EQUIPMENT': 'Equipment/adaptations',
+    'DIRECT_PAYMENT': 'Direct payment'
+}
+
+SOCIAL_CARE_COST_RANGES = {
+    'HOMECARE': (100, 500),
+    'DAYCARE': (150, 300),
+    'RESIDENTIAL': (600, 1200),
+    'NURSING': (800, 1500),
+    'EQUIPMENT': (50, 200),
+    'DIRECT_PAYMENT': (200, 800)
+}
+
+# Social care assessment outcomes
+SOCIAL_CARE_ASSESSMENT_OUTCOMES = {
+    'LOW': 'Low needs',
+    'MODERATE': 'Moderate needs', 
+    'SUBSTANTIAL': 'Substantial needs',
+    'CRITICAL': 'Critical needs'
+}
 
 class NHSCodebooks:
     """NHS standard code systems and lookup tables"""
@@ -52,64 +214,22 @@ class NHSCodebooks:
     @staticmethod
     def get_icd10_codes():
         """Common ICD-10 diagnosis codes with realistic prevalence"""
-        return {
-            'I10': {'name': 'Essential hypertension', 'prevalence': 0.15},
-            'E11': {'name': 'Type 2 diabetes mellitus', 'prevalence': 0.08},
-            'I25': {'name': 'Chronic ischaemic heart disease', 'prevalence': 0.06},
-            'J44': {'name': 'Chronic obstructive pulmonary disease', 'prevalence': 0.04},
-            'N18': {'name': 'Chronic kidney disease', 'prevalence': 0.03},
-            'F32': {'name': 'Depressive episode', 'prevalence': 0.12},
-            'F41': {'name': 'Anxiety disorders', 'prevalence': 0.09},
-            'M79': {'name': 'Soft tissue disorders', 'prevalence': 0.07},
-            'R06': {'name': 'Abnormalities of breathing', 'prevalence': 0.05},
-            'Z51': {'name': 'Encounter for other aftercare', 'prevalence': 0.04},
-            'S72': {'name': 'Fracture of femur', 'prevalence': 0.002},
-            'I21': {'name': 'Acute myocardial infarction', 'prevalence': 0.001},
-            'J18': {'name': 'Pneumonia', 'prevalence': 0.02},
-            'K80': {'name': 'Cholelithiasis', 'prevalence': 0.015}
-        }
+        return ICD10_CODES
     
     @staticmethod
     def get_opcs4_codes():
         """Common OPCS-4 procedure codes"""
-        return {
-            'Z92': {'name': 'Monitoring', 'frequency': 0.25},
-            'U07': {'name': 'Computer tomography', 'frequency': 0.12},
-            'W37': {'name': 'Cataract extraction', 'frequency': 0.08},
-            'H01': {'name': 'Cardiac catheterisation', 'frequency': 0.05},
-            'T87': {'name': 'Arthroscopy', 'frequency': 0.04},
-            'M65': {'name': 'Endoscopy of colon', 'frequency': 0.06},
-            'J27': {'name': 'Cholecystectomy', 'frequency': 0.03},
-            'W19': {'name': 'Excision of lesion of skin', 'frequency': 0.07}
-        }
+        return OPCS4_CODES
     
     @staticmethod
     def get_hrg_codes():
         """Healthcare Resource Groups for payment grouping"""
-        return {
-            'AA22': {'name': 'Non-elective long stay', 'tariff': 4500.00},
-            'AA23': {'name': 'Non-elective short stay', 'tariff': 1800.00},
-            'DZ19': {'name': 'Cardiac procedures', 'tariff': 8900.00},
-            'FF01': {'name': 'Cataract procedures', 'tariff': 950.00},
-            'HN12': {'name': 'Arthroscopic procedures', 'tariff': 2100.00},
-            'FZ92': {'name': 'Outpatient procedures', 'tariff': 180.00},
-            'WJ11': {'name': 'Emergency medicine', 'tariff': 280.00}
-        }
+        return HRG_CODES
     
     @staticmethod
     def get_bnf_codes():
         """British National Formulary prescription codes"""
-        return {
-            '0101010': {'name': 'Antacids', 'avg_cost': 3.50},
-            '0201010': {'name': 'Cardiac glycosides', 'avg_cost': 12.80},
-            '0206020': {'name': 'ACE inhibitors', 'avg_cost': 8.90},
-            '0301011': {'name': 'Beta2 agonists', 'avg_cost': 15.60},
-            '0401020': {'name': 'Anxiolytics', 'avg_cost': 6.70},
-            '0601060': {'name': 'Insulin', 'avg_cost': 45.20},
-            '0501130': {'name': 'Penicillins', 'avg_cost': 7.30},
-            '1001010': {'name': 'Non-opioid analgesics', 'avg_cost': 2.10},
-            '0403040': {'name': 'Antidepressants', 'avg_cost': 18.40}
-        }
+        return BNF_CODES
 
 class PatientGenerator:
     """Generates realistic synthetic patient population"""
@@ -117,124 +237,126 @@ class PatientGenerator:
     def __init__(self, config: DataGenerationConfig):
         self.config = config
         self.patients = []
+        self.rng = np.random.default_rng(42)
         
-    def generate_nhs_number(self, index: int) -> str:
-        """Generate realistic NHS number with check digit"""
-        # Use deterministic generation for consistency
-        base = f"9{index:09d}"
+    @classmethod
+    def generate_nhs_numbers_bulk(cls, n: int, start: int = 0) -> np.ndarray:
+        """Generate NHS numbers for indices start..start+n-1 in one batch"""
+        # Use deterministic generation for consistency: base is "9" followed by the 9-digit index
+        base = np.arange(start, start + n, dtype=np.int64) + 9 * 10**9
         
-        # Calculate check digit using NHS algorithm
-        check_sum = 0
-        for i, digit in enumerate(base):
-            check_sum += int(digit) * (10 - i)
+        # Calculate check digits using NHS algorithm, all rows in one matmul
+        digits = (base[:, None] // 10 ** np.arange(9, -1, -1, dtype=np.int64)) % 10
+        check_digits = (11 - (digits @ np.arange(10, 0, -1)) % 11) % 11
+        check_digits[check_digits == 10] = 0
         
-        check_digit = (11 - (check_sum % 11)) % 11
-        if check_digit == 10:
-            check_digit = 0
-            
-        return f"{base}{check_digit}"
-    
-    def generate_postcode(self) -> Tuple[str, int]:
-        """Generate UK postcode with deprivation decile"""
-        # Realistic postcode patterns with deprivation correlation
-        postcodes = [
-            ('LE1 7RH', 8), ('LE2 3BD', 4), ('LE3 9HY', 6), ('LE4 5GF', 3),
-            ('LE5 4PQ', 7), ('CV1 2NB', 5), ('CV21 3FD', 2), ('CV31 1HG', 9),
-            ('B1 1TT', 4), ('B15 2TT', 6), ('B28 8QY', 8), ('B44 8SF', 2),
-            ('NG1 5DT', 5), ('NG7 2RD', 3), ('NG11 8NS', 7), ('DE1 1PP', 6),
-            ('M1 1AD', 4), ('M14 7DU', 3), ('M20 4BX', 8), ('OX1 2JD', 9)
-        ]
-        return random.choice(postcodes)
+        return np.char.add(base.astype('U10'), check_digits.astype('U1'))
+    
+    # Realistic postcode patterns with deprivation correlation
+    POSTCODES = [
+        ('LE1 7RH', 8), ('LE2 3BD', 4), ('LE3 9HY', 6), ('LE4 5GF', 3),
+        ('LE5 4PQ', 7), ('CV1 2NB', 5), ('CV21 3FD', 2), ('CV31 1HG', 9),
+        ('B1 1TT', 4), ('B15 2TT', 6), ('B28 8QY', 8), ('B44 8SF', 2),
+        ('NG1 5DT', 5), ('NG7 2RD', 3), ('NG11 8NS', 7), ('DE1 1PP', 6),
+        ('M1 1AD', 4), ('M14 7DU', 3), ('M20 4BX', 8), ('OX1 2JD', 9)
+    ]
+    
+    # Ethnicity distribution (ONS 2021 Census approximation)
+    ETHNICITY_CODES = ['A', 'B', 'C', 'D', 'E', 'F', 'G', 'H', 'J', 'K', 'L', 'M', 'N', 'P', 'R', 'S', 'Z']
+    ETHNICITY_WEIGHTS = [0.82, 0.04, 0.025, 0.025, 0.015, 0.015, 0.015, 0.01, 0.005, 0.005, 0.005, 0.005, 0.005, 0.003, 0.003, 0.003, 0.001]
     
     def generate_patients(self) -> pd.DataFrame:
         """Generate complete patient population with demographics"""
-        patients = []
-        
-        for i in range(self.config.base_population):
-            # Introduce some missing/invalid NHS numbers (5%)
-            if random.random() < 0.05:
-                nhs_number = None if random.random() < 0.5 else "INVALID"
-            else:
-                nhs_number = self.generate_nhs_number(i)
-            
-            # Age distribution matching UK demographics
-            age = int(np.random.gamma(2.5, 15))  # Realistic age distribution
-            age = max(0, min(age, 95))  # Cap at realistic range
-            
-            # Birth date calculation
-            birth_date = self.config.start_date - timedelta(days=age * 365.25)
-            
-            # Gender distribution
-            gender = np.random.choice(['M', 'F', 'U'], p=[0.49, 0.49, 0.02])
-            
-            # Ethnicity distribution (ONS 2021 Census approximation)
-            ethnicity = np.random.choice([
-                'A', 'B', 'C', 'D', 'E', 'F', 'G', 'H', 'J', 'K', 'L', 'M', 'N', 'P', 'R', 'S', 'Z'
-            ], p=[0.82, 0.04, 0.025, 0.025, 0.015, 0.015, 0.015, 0.01, 0.005, 0.005, 0.005, 0.005, 0.005, 0.003, 0.003, 0.003, 0.001])
-            
-            postcode, deprivation_decile = self.generate_postcode()
-            
-            # Practice registration (some patients may not be registered)
-            practice_code = f"M{random.randint(81001, 81200):05d}" if random.random() > 0.02 else None
-            
-            patients.append({
-                'patient_id': f'PAT_{i:06d}',
-                'nhs_number': nhs_number,
-                'date_of_birth': birth_date,
-                'gender': gender,
-                'ethnicity': ethnicity,
-                'postcode': postcode,
-                'deprivation_decile': deprivation_decile,
-                'registered_practice': practice_code,
-                'age_at_start': age,
-                'created_date': self.config.start_date
-            })
-        
-        return pd.DataFrame(patients)
+        # Every attribute is drawn for the whole population in one call
+        n = self.config.base_population
+        
+        # Introduce some missing/invalid NHS numbers (5%)
+        nhs_numbers = self.generate_nhs_numbers_bulk(n).astype(object)
+        invalid = self.rng.random(n) < 0.05
+        nhs_numbers[invalid] = np.where(self.rng.random(int(invalid.sum())) < 0.5, None, "INVALID")
+        
+        # Age distribution matching UK demographics, capped at a realistic range
+        ages = np.clip(self.rng.gamma(2.5, 15, n).astype(np.int64), 0, 95)
+        
+        # Birth date calculation (whole days, as date - timedelta(days=age * 365.25) gives)
+        birth_dates = (np.datetime64(self.config.start_date, 'D')
+                       - np.floor(ages * 365.25).astype('timedelta64[D]')).astype(object)
+        
+        # Small fixed domains are kept as category codes
+        genders = pd.Categorical.from_codes(self.rng.choice(3, size=n, p=[0.49, 0.49, 0.02]),
+                                            categories=['M', 'F', 'U'])
+        ethnicities = pd.Categorical.from_codes(
+            self.rng.choice(len(self.ETHNICITY_CODES), size=n, p=self.ETHNICITY_WEIGHTS),
+            categories=self.ETHNICITY_CODES)
+        
+        postcode_idx = self.rng.integers(0, len(self.POSTCODES), n)
+        postcodes, deprivation_deciles = (np.array(col) for col in zip(*self.POSTCODES))
+        
+        # Practice registration (some patients may not be registered)
+        practice_codes = np.char.add('M', self.rng.integers(81001, 81201, n).astype(str)).astype(object)
+        practice_codes[self.rng.random(n) <= 0.02] = None
+        
+        return pd.DataFrame({
+            'patient_id': format_ids('PAT_', 0, n, width=6),
+            'nhs_number': nhs_numbers,
+            'date_of_birth': birth_dates,
+            'gender': genders,
+            'ethnicity': ethnicities,
+            'postcode': postcodes[postcode_idx],
+            'deprivation_decile': deprivation_deciles[postcode_idx],
+            'registered_practice': practice_codes,
+            'age_at_start': ages,
+            'created_date': self.config.start_date
+        })
 
 class ProviderGenerator:
     """Generates NHS provider organizations"""
     
     def __init__(self, config: DataGenerationConfig):
         self.config = config
+        self.rng = np.random.default_rng(45)
     
     def generate_trusts(self) -> pd.DataFrame:
         """Generate NHS Trust organizations"""
-        trusts = []
+        trusts = [None] * self.config.trusts
+        companies = COMPANY_POOL[self.rng.integers(0, len(COMPANY_POOL), self.config.trusts)]
         
         trust_types = ['Foundation Trust', 'NHS Trust', 'Mental Health Trust', 'Community Trust']
         regions = ['Midlands', 'North', 'South', 'London', 'East']
+        choice, randint = random.choice, random.randint
         
         for i in range(self.config.trusts):
             trust_code = f"R{chr(65 + i//26)}{chr(65 + i%26)}"
             
-            trusts.append({
+            trusts[i] = {
                 'trust_code': trust_code,
-                'trust_name': fake.company() + ' ' + random.choice(trust_types),
-                'trust_type': random.choice(trust_types),
-                'region': random.choice(regions),
-                'commissioner_code': f"CCG{random.randint(1, 50):03d}",
-                'beds': random.randint(200, 1200),
-                'annual_income': random.randint(50, 500) * 1000000
-            })
+                'trust_name': companies[i] + ' ' + choice(trust_types),
+                'trust_type': choice(trust_types),
+                'region': choice(regions),
+                'commissioner_code': f"CCG{randint(1, 50):03d}",
+                'beds': randint(200, 1200),
+                'annual_income': randint(50, 500) * 1000000
+            }
         
         return pd.DataFrame(trusts)
     
     def generate_practices(self) -> pd.DataFrame:
         """Generate GP practices"""
-        practices = []
+        practices = [None] * self.config.practices
+        surnames = NAME_POOL[self.rng.integers(0, len(NAME_POOL), self.config.practices)]
+        choice, randint = random.choice, random.randint
         
         for i in range(self.config.practices):
-            practice_code = f"M{random.randint(81001, 81999)}"
+            practice_code = f"M{randint(81001, 81999)}"
             
-            practices.append({
+            practices[i] = {
                 'practice_code': practice_code,
-                'practice_name': f"Dr {fake.last_name()} & Partners",
+                'practice_name': f"Dr {surnames[i]} & Partners",
                 'postcode': self.generate_practice_postcode(),
-                'list_size': random.randint(2000, 15000),
-                'partners': random.randint(1, 8),
-                'commissioning_region': random.choice(['Leicester', 'Coventry', 'Birmingham', 'Nottingham'])
-            })
+                'list_size': randint(2000, 15000),
+                'partners': randint(1, 8),
+                'commissioning_region': choice(['Leicester', 'Coventry', 'Birmingham', 'Nottingham'])
+            }
         
         return pd.DataFrame(practices)
     
@@ -243,227 +365,307 @@ class ProviderGenerator:
         postcodes = ['LE1 6NB', 'LE2 7LX', 'CV1 2HG', 'B15 2TH', 'NG1 5DT']
         return random.choice(postcodes)
 
+def build_alias_table(weights: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Walker/Vose alias table for repeated draws from a fixed weight vector"""
+    n = len(weights)
+    probs = np.asarray(weights, dtype=float) * n / np.sum(weights)
+    aliases = np.arange(n)
+    small = np.flatnonzero(probs < 1.0).tolist()
+    large = np.flatnonzero(probs >= 1.0).tolist()
+    while small and large:
+        s, l = small.pop(), large[-1]
+        aliases[s] = l
+        probs[l] -= 1.0 - probs[s]
+        if probs[l] < 1.0:
+            small.append(large.pop())
+    # Whatever is left is a full column up to rounding
+    probs[small + large] = 1.0
+    return probs, aliases
+
+def sample_alias(rng: np.random.Generator, probs: np.ndarray, aliases: np.ndarray, n: int) -> np.ndarray:
+    """Draw n indices from an alias table: one column pick and one coin flip per draw"""
+    k = rng.integers(0, len(probs), n)
+    return np.where(rng.random(n) < probs[k], k, aliases[k])
+
+def format_ids(prefix: str, first: int, n: int, width: int = 8) -> np.ndarray:
+    """Record ids prefix + zero-padded sequence number for first..first+n-1"""
+    # np.char.zfill fails on an empty array, and small populations can leave a table empty
+    if n == 0:
+        return np.empty(0, dtype=object)
+    return np.char.add(prefix, np.char.zfill(np.arange(first, first + n).astype(str), width))
+
 class SUSPlusGenerator:
     """Secondary Uses Service Plus - Hospital activity data"""
     
+    # Admission method and urgency
+    ADMISSION_METHODS = {
+        '11': 'Waiting list',  # Elective
+        '12': 'Booked',       # Elective
+        '21': 'A&E',          # Emergency
+        '22': 'GP referral',  # Emergency
+        '23': 'Bed bureau',   # Emergency
+        '24': 'Consultant clinic', # Emergency
+        '28': 'Other emergency'
+    }
+    EMERGENCY_METHODS = ['21', '22', '23', '24', '28']
+    
+    # Primary diagnoses by admission type and age
+    EMERGENCY_ELDERLY_DIAGNOSES = ['J18', 'I21', 'S72', 'R06', 'N18']
+    EMERGENCY_ADULT_DIAGNOSES = ['J18', 'R06', 'I25', 'M79', 'K80']
+    ELECTIVE_DIAGNOSES = ['Z51', 'H01', 'W37', 'J27', 'T87']
+    
+    # Procedure mapping based on diagnosis
+    PROCEDURE_MAPPING = {
+        'I21': ['H01', 'H02'],  # MI - cardiac procedures
+        'S72': ['T87'],         # Fracture - orthopedic
+        'K80': ['J27'],         # Gallbladder - surgery
+        'W37': ['W37'],         # Cataract
+        'J18': ['Z92']          # Pneumonia - monitoring
+    }
+    
+    # Patient columns read per episode
+    PATIENT_COLUMNS = ['patient_id', 'nhs_number', 'age_at_start']
+    
+    # Days per shard for parallel generation; fixed so output does not depend on worker count
+    SHARD_DAYS = 91
+    
     def __init__(self, patients_df: pd.DataFrame, trusts_df: pd.DataFrame, config: DataGenerationConfig):
         self.patients_df = patients_df
         self.trusts_df = trusts_df
         self.config = config
+        self.rng = np.random.default_rng(43)
         self.icd10_codes = NHSCodebooks.get_icd10_codes()
         self.opcs4_codes = NHSCodebooks.get_opcs4_codes()
         self.hrg_codes = NHSCodebooks.get_hrg_codes()
-    
-    def generate_episodes(self) -> pd.DataFrame:
-        """Generate SUS+ admitted patient care episodes"""
-        episodes = []
-        episode_id = 1
         
-        # Generate episodes over time period
-        current_date = self.config.start_date
-        end_date = self.config.start_date + timedelta(days=365 * self.config.years_of_data)
+        # Admission weights don't change during a run: keep them as an alias table for O(1) draws
+        self._weights = self.get_admission_weights().to_numpy(dtype=float)
+        self._alias_probs, self._alias_idx = build_alias_table(self._weights)
         
-        while current_date < end_date:
-            # Daily volume with seasonal variation
-            base_daily_episodes = 150
-            if self.config.seasonal_variation:
-                # Winter pressure (Nov-Mar)
-                if current_date.month in [11, 12, 1, 2, 3]:
-                    daily_episodes = int(base_daily_episodes * 1.4)
-                # Summer reduction (Jul-Aug)
-                elif current_date.month in [7, 8]:
-                    daily_episodes = int(base_daily_episodes * 0.8)
-                else:
-                    daily_episodes = base_daily_episodes
-            else:
-                daily_episodes = base_daily_episodes
-            
-            # COVID impact simulation
-            if self.config.covid_impact and current_date >= datetime.date(2020, 3, 1):
-                if current_date <= datetime.date(2020, 6, 1):
-                    daily_episodes = int(daily_episodes * 0.4)  # First lockdown
-                elif current_date <= datetime.date(2021, 6, 1):
-                    daily_episodes = int(daily_episodes * 0.7)  # Gradual recovery
-            
-            # Weekend effect
-            if current_date.weekday() >= 5:  # Saturday/Sunday
-                daily_episodes = int(daily_episodes * 0.6)
-            
-            for _ in range(daily_episodes):
-                episode = self.generate_single_episode(episode_id, current_date)
-                episodes.append(episode)
-                episode_id += 1
-            
-            current_date += timedelta(days=1)
-        
-        return pd.DataFrame(episodes)
-    
-    def generate_single_episode(self, episode_id: int, admission_date: datetime.date) -> dict:
-        """Generate individual episode with realistic clinical patterns"""
-        # Select patient with age-based admission probability
-        patient = self.patients_df.sample(n=1, weights=self.get_admission_weights()).iloc[0]
-        
-        # Select trust
-        trust = self.trusts_df.sample(n=1).iloc[0]
-        
-        # Admission method and urgency
-        admission_methods = {
-            '11': 'Waiting list',  # Elective
-            '12': 'Booked',       # Elective
-            '21': 'A&E',          # Emergency
-            '22': 'GP referral',  # Emergency
-            '23': 'Bed bureau',   # Emergency
-            '24': 'Consultant clinic', # Emergency
-            '28': 'Other emergency'
-        }
+        # Admission method mix by age band, as CDFs over ADMISSION_METHODS order
+        self._admission_keys = np.array(list(self.ADMISSION_METHODS.keys()), dtype=object)
+        self._cdf_elderly = np.cumsum([0.2, 0.15, 0.35, 0.15, 0.05, 0.05, 0.05])
+        self._cdf_young = np.cumsum([0.4, 0.25, 0.2, 0.08, 0.03, 0.02, 0.02])
         
-        # Age influences admission type
-        if patient['age_at_start'] > 70:
-            admission_method = random.choices(
-                list(admission_methods.keys()),
-                weights=[0.2, 0.15, 0.35, 0.15, 0.05, 0.05, 0.05]
-            )[0]
-        else:
-            admission_method = random.choices(
-                list(admission_methods.keys()),
-                weights=[0.4, 0.25, 0.2, 0.08, 0.03, 0.02, 0.02]
-            )[0]
+        # Per-method lookups indexed by the drawn method position
+        self._emergency_methods = np.isin(self._admission_keys, self.EMERGENCY_METHODS)
         
-        # Length of stay based on age and admission type
-        if admission_method in ['11', '12']:  # Elective
-            los = max(1, int(np.random.gamma(1.5, 2)))
-        else:  # Emergency
-            los = max(1, int(np.random.gamma(2, 3)))
+        # Fixed category sets, so shards concatenate as categoricals
+        self._diagnosis_categories = list(dict.fromkeys(
+            self.EMERGENCY_ELDERLY_DIAGNOSES + self.EMERGENCY_ADULT_DIAGNOSES + self.ELECTIVE_DIAGNOSES + ['INVALID']))
+        self._specialty_categories = sorted({self.get_specialty(d) for d in self._diagnosis_categories})
+        self._admission_sources = np.array([self.get_admission_source(method) for method in self._admission_keys],
+                                           dtype=object)
+    
+    def generate_episodes(self, shard: Optional[Tuple[int, int]] = None) -> pd.DataFrame:
+        """Generate SUS+ admitted patient care episodes, for the whole period or a (first_day, n_days) shard"""
+        # Generate episodes over time period: one admission date per episode
+        dates = pd.date_range(self.config.start_date, periods=365 * self.config.years_of_data, freq='D')
+        daily_episodes = self.get_daily_episode_counts(dates)
+        first_episode_id = 1
+        if shard is not None:
+            first_day, n_days = shard
+            first_episode_id += int(daily_episodes[:first_day].sum())
+            dates = dates[first_day:first_day + n_days]
+            daily_episodes = daily_episodes[first_day:first_day + n_days]
+        episode_dates = np.repeat(dates.values.astype('datetime64[D]'), daily_episodes)
+        n = len(episode_dates)
+        
+        # Select patients with age-based admission probability, and trusts, for every episode at once
+        patient_idx = self.sample_patient_indices(n)
+        trust_idx = self.rng.integers(0, len(self.trusts_df), n)
+        
+        return self.build_episodes_df(n, patient_idx, trust_idx, episode_dates, first_episode_id)
+    
+    def generate_parallel(self) -> pd.DataFrame:
+        """Generate SUS+ episodes in date-range shards spread over worker processes"""
+        return pd.concat(self.iter_episode_shards(), ignore_index=True)
+    
+    def iter_episode_shards(self) -> Iterator[pd.DataFrame]:
+        """Yield SUS+ episodes one date-range shard at a time, in date order"""
+        total_days = 365 * self.config.years_of_data
+        shards = [(first_day, min(self.SHARD_DAYS, total_days - first_day))
+                  for first_day in range(0, total_days, self.SHARD_DAYS)]
+        seeds = np.random.SeedSequence(43).spawn(len(shards))  # one independent stream per shard
+        
+        # Forked workers inherit the generator (and its patient/trust frames) instead of re-pickling it per shard
+        if self.config.workers > 1 and len(shards) > 1 and 'fork' in mp.get_all_start_methods():
+            workers = min(self.config.workers, len(shards))
+            with ProcessPoolExecutor(max_workers=workers, mp_context=mp.get_context('fork'),
+                                     initializer=_init_shard_worker, initargs=(self,)) as pool:
+                # One shard per worker in flight, topped up as each is handed on, so finished shards
+                # cannot pile up while the caller is still saving earlier ones
+                pending = [pool.submit(_run_episode_shard, shard, seed)
+                           for shard, seed in zip(shards[:workers], seeds[:workers])]
+                for i in range(len(shards)):
+                    df = pending[i].result()
+                    pending[i] = None
+                    if i + workers < len(shards):
+                        pending.append(pool.submit(_run_episode_shard, shards[i + workers], seeds[i + workers]))
+                    yield df
+                    del df
+            return
+        
+        saved = self.rng
+        try:
+            _init_shard_worker(self)
+            for shard, seed in zip(shards, seeds):
+                yield _run_episode_shard(shard, seed)
+        finally:
+            # Don't let the module global keep this generator (and its frames) alive after the run
+            _init_shard_worker(None)
+            self.rng = saved
+    
+    def get_daily_episode_counts(self, dates: pd.DatetimeIndex) -> np.ndarray:
+        """Daily episode volumes with seasonal, COVID and weekend multipliers, for all dates at once"""
+        # Each multiplier truncates to whole episodes in turn, as the day-by-day calculation did
+        base_daily_episodes = 150
+        daily_episodes = np.full(len(dates), base_daily_episodes)
+        
+        # Daily volume with seasonal variation
+        if self.config.seasonal_variation:
+            winter = np.isin(dates.month, [11, 12, 1, 2, 3])  # Winter pressure (Nov-Mar)
+            summer = np.isin(dates.month, [7, 8])  # Summer reduction (Jul-Aug)
+            daily_episodes[winter] = int(base_daily_episodes * 1.4)
+            daily_episodes[summer] = int(base_daily_episodes * 0.8)
+        
+        # COVID impact simulation
+        if self.config.covid_impact:
+            lockdown = (dates >= pd.Timestamp(2020, 3, 1)) & (dates <= pd.Timestamp(2020, 6, 1))  # First lockdown
+            recovery = (dates > pd.Timestamp(2020, 6, 1)) & (dates <= pd.Timestamp(2021, 6, 1))  # Gradual recovery
+            daily_episodes[lockdown] = (daily_episodes[lockdown] * 0.4).astype(int)
+            daily_episodes[recovery] = (daily_episodes[recovery] * 0.7).astype(int)
+        
+        # Weekend effect
+        weekend = dates.weekday >= 5  # Saturday/Sunday
+        daily_episodes[weekend] = (daily_episodes[weekend] * 0.6).astype(int)
+        
+        return daily_episodes
+    
+    def sample_patient_indices(self, n: int) -> np.ndarray:
+        """Draw n patient row positions with admission weights (alias method)"""
+        return sample_alias(self.rng, self._alias_probs, self._alias_idx, n)
+    
+    def build_episodes_df(self, n: int, patient_idx: np.ndarray, trust_idx: np.ndarray,
+                          admission_dates: np.ndarray, first_episode_id: int = 1) -> pd.DataFrame:
+        """Build all episodes column by column with realistic clinical patterns"""
+        # Gather only the patient columns an episode carries, not whole patient rows
+        patients = {column: self.patients_df[column].to_numpy()[patient_idx] for column in self.PATIENT_COLUMNS}
+        ages = patients['age_at_start']
+        
+        # Age influences admission type: one uniform draw per episode against the band's CDF
+        u = self.rng.random(n)
+        method_idx = np.where(ages > 70,
+                              np.searchsorted(self._cdf_elderly, u, side='right'),
+                              np.searchsorted(self._cdf_young, u, side='right'))
+        method_idx = np.minimum(method_idx, len(self._admission_keys) - 1)
+        emergency = self._emergency_methods[method_idx]
+        
+        # Length of stay based on age and admission type (elective vs emergency)
+        los = np.maximum(1, self.rng.gamma(np.where(emergency, 2, 1.5), np.where(emergency, 3, 2)).astype(int))
         
         # Age factor for length of stay
-        if patient['age_at_start'] > 75:
-            los = int(los * 1.5)
+        los = (los * (1 + 0.5 * (ages > 75))).astype(int)
         
-        discharge_date = admission_date + timedelta(days=los)
+        discharge_dates = (admission_dates + los.astype('timedelta64[D]')).astype(object)
         
         # Primary diagnosis based on age and admission type
-        primary_diagnosis = self.select_diagnosis(patient['age_at_start'], admission_method)
-        
-        # Secondary diagnoses (0-5 additional)
-        secondary_diagnoses = []
-        num_secondary = np.random.poisson(1.2)
-        for _ in range(min(num_secondary, 5)):
-            sec_diag = random.choice(list(self.icd10_codes.keys()))
-            if sec_diag != primary_diagnosis:
-                secondary_diagnoses.append(sec_diag)
-        
-        # Procedures
-        procedures = self.select_procedures(primary_diagnosis, admission_method)
-        
-        # HRG grouping
-        hrg_code = self.assign_hrg(primary_diagnosis, procedures, los)
+        primary_diagnosis = np.empty(n, dtype=object)
+        for group, codes in [
+            (emergency & (ages > 75), self.EMERGENCY_ELDERLY_DIAGNOSES),
+            (emergency & (ages <= 75), self.EMERGENCY_ADULT_DIAGNOSES),
+            (~emergency, self.ELECTIVE_DIAGNOSES),
+        ]:
+            primary_diagnosis[group] = self.rng.choice(codes, size=int(group.sum()))
+        
+        # Secondary diagnoses (0-5 additional, repeats of the primary dropped), joined column by column
+        drawn = ICD10_KEYS[self.rng.integers(0, len(ICD10_KEYS), (n, 5))]
+        keep = (np.arange(5) < np.minimum(self.rng.poisson(1.2, n), 5)[:, None]) & (drawn != primary_diagnosis[:, None])
+        secondary_diagnoses = np.full(n, '', dtype=object)
+        for j in range(5):
+            secondary_diagnoses = secondary_diagnoses + np.where(keep[:, j], ',' + drawn[:, j], '')
+        secondary_diagnoses = np.array([s[1:] for s in secondary_diagnoses], dtype=object)
+        
+        # Procedures depend only on (diagnosis, monitoring): work them out once per combination and index
+        # into the table with the integer diagnosis code
+        diagnosis_codes, diagnoses = pd.factorize(primary_diagnosis)
+        monitored = self.rng.random(n) > 0.3
+        combo_table = []
+        for diagnosis in diagnoses:
+            for monitoring in (False, True):
+                procedures = self.procedures_for(diagnosis, monitoring)
+                combo_table.append((
+                    procedures[0] if procedures else None,
+                    ','.join(procedures[1:]) if len(procedures) > 1 else None,
+                    any(proc in ['H01', 'H02'] for proc in procedures),
+                    'W37' in procedures,
+                    'T87' in procedures,
+                ))
+        combos = np.array(combo_table, dtype=object).reshape(-1, 5)[diagnosis_codes * 2 + monitored]
+        hrg_code = self.assign_hrg_codes(combos[:, 2].astype(bool), combos[:, 3].astype(bool),
+                                         combos[:, 4].astype(bool), los)
+        specialty = np.array([self.get_specialty(diagnosis) for diagnosis in diagnoses], dtype=object)[diagnosis_codes]
+        
+        # Discharge destination based on age
+        discharge_destination = np.empty(n, dtype=object)
+        over_80 = ages > 80
+        discharge_destination[over_80] = self.rng.choice(['19', '65', '87', '79'], size=int(over_80.sum()),
+                                                          p=[0.6, 0.2, 0.15, 0.05])
+        discharge_destination[~over_80] = self.rng.choice(['19', '65', '87'], size=int((~over_80).sum()),
+                                                           p=[0.85, 0.1, 0.05])
+        
+        episodes = pd.DataFrame({
+            'episode_id': format_ids('EP', first_episode_id, n),
+            'patient_id': patients['patient_id'],
+            'nhs_number': patients['nhs_number'],
+            'trust_code': pd.Categorical.from_codes(trust_idx, categories=self.trusts_df['trust_code']),
+            'admission_date': admission_dates.astype(object),
+            'discharge_date': discharge_dates,
+            'admission_method': pd.Categorical.from_codes(method_idx, categories=self._admission_keys),
+            'admission_source': self._admission_sources[method_idx],
+            'discharge_destination': discharge_destination,
+            'length_of_stay': los,
+            'primary_diagnosis': pd.Categorical(primary_diagnosis, categories=self._diagnosis_categories),
+            'secondary_diagnoses': secondary_diagnoses,
+            'primary_procedure': combos[:, 0],
+            'secondary_procedures': combos[:, 1],
+            'hrg_code': pd.Categorical(hrg_code, categories=list(HRG_CODES)),
+            'consultant_code': np.char.add('C', self.rng.integers(1000, 10000, n).astype(str)),
+            'specialty': pd.Categorical(specialty, categories=self._specialty_categories),
+            'ward_code': np.char.add('W', self.rng.integers(10, 100, n).astype(str)),
+            'created_timestamp': np.datetime64(datetime.datetime.now(), 'ns')  # one timestamp per batch, broadcast
+        })
         
         # Introduce data quality issues
-        if random.random() < self.config.data_quality_degradation:
-            episode_data = self.introduce_data_issues({
-                'episode_id': f'EP{episode_id:08d}',
-                'patient_id': patient['patient_id'],
-                'nhs_number': patient['nhs_number'],
-                'trust_code': trust['trust_code'],
-                'admission_date': admission_date,
-                'discharge_date': discharge_date,
-                'admission_method': admission_method,
-                'admission_source': self.get_admission_source(admission_method),
-                'discharge_destination': self.get_discharge_destination(patient['age_at_start']),
-                'length_of_stay': los,
-                'primary_diagnosis': primary_diagnosis,
-                'secondary_diagnoses': ','.join(secondary_diagnoses),
-                'primary_procedure': procedures[0] if procedures else None,
-                'secondary_procedures': ','.join(procedures[1:]) if len(procedures) > 1 else None,
-                'hrg_code': hrg_code,
-                'consultant_code': f'C{random.randint(1000, 9999)}',
-                'specialty': self.get_specialty(primary_diagnosis),
-                'ward_code': f'W{random.randint(10, 99)}',
-                'created_timestamp': datetime.datetime.now()
-            })
-        else:
-            episode_data = {
-                'episode_id': f'EP{episode_id:08d}',
-                'patient_id': patient['patient_id'],
-                'nhs_number': patient['nhs_number'],
-                'trust_code': trust['trust_code'],
-                'admission_date': admission_date,
-                'discharge_date': discharge_date,
-                'admission_method': admission_method,
-                'admission_source': self.get_admission_source(admission_method),
-                'discharge_destination': self.get_discharge_destination(patient['age_at_start']),
-                'length_of_stay': los,
-                'primary_diagnosis': primary_diagnosis,
-                'secondary_diagnoses': ','.join(secondary_diagnoses),
-                'primary_procedure': procedures[0] if procedures else None,
-                'secondary_procedures': ','.join(procedures[1:]) if len(procedures) > 1 else None,
-                'hrg_code': hrg_code,
-                'consultant_code': f'C{random.randint(1000, 9999)}',
-                'specialty': self.get_specialty(primary_diagnosis),
-                'ward_code': f'W{random.randint(10, 99)}',
-                'created_timestamp': datetime.datetime.now()
-            }
-        
-        return episode_data
+        return self.introduce_data_issues(episodes)
     
     def get_admission_weights(self) -> pd.Series:
         """Calculate admission probability weights based on age"""
         # Older patients more likely to be admitted
-        age_factor = np.where(self.patients_df['age_at_start'] > 65, 3.0, 1.0)
-        age_factor = np.where(self.patients_df['age_at_start'] > 80, 5.0, age_factor)
+        ages = self.patients_df['age_at_start'].to_numpy()
+        age_factor = 1.0 + 2.0 * (ages > 65) + 2.0 * (ages > 80)
         
         # Deprivation factor
         deprivation_factor = 11 - self.patients_df['deprivation_decile']  # Higher deprivation = higher admission
         
         return pd.Series(age_factor * deprivation_factor, index=self.patients_df.index)
     
-    def select_diagnosis(self, age: int, admission_method: str) -> str:
-        """Select realistic primary diagnosis based on age and admission type"""
-        if admission_method in ['21', '22', '23', '24', '28']:  # Emergency
-            if age > 75:
-                emergency_elderly = ['J18', 'I21', 'S72', 'R06', 'N18']
-                return random.choice(emergency_elderly)
-            else:
-                emergency_adult = ['J18', 'R06', 'I25', 'M79', 'K80']
-                return random.choice(emergency_adult)
-        else:  # Elective
-            elective_codes = ['Z51', 'H01', 'W37', 'J27', 'T87']
-            return random.choice(elective_codes)
-    
-    def select_procedures(self, primary_diagnosis: str, admission_method: str) -> List[str]:
-        """Select procedures based on diagnosis and admission type"""
-        procedures = []
-        
-        # Procedure mapping based on diagnosis
-        procedure_mapping = {
-            'I21': ['H01', 'H02'],  # MI - cardiac procedures
-            'S72': ['T87'],         # Fracture - orthopedic
-            'K80': ['J27'],         # Gallbladder - surgery
-            'W37': ['W37'],         # Cataract
-            'J18': ['Z92']          # Pneumonia - monitoring
-        }
-        
-        if primary_diagnosis in procedure_mapping:
-            procedures.extend(procedure_mapping[primary_diagnosis])
+    def procedures_for(self, primary_diagnosis: str, monitored: bool) -> List[str]:
+        """Procedures for a diagnosis, with or without monitoring"""
+        procedures = list(self.PROCEDURE_MAPPING.get(primary_diagnosis, []))
         
-        # Add monitoring for all admissions
-        if random.random() > 0.3:
+        if monitored:
             procedures.append('Z92')
         
         return procedures[:3]  # Max 3 procedures
     
-    def assign_hrg(self, diagnosis: str, procedures: List[str], los: int) -> str:
-        """Assign Healthcare Resource Group for payment"""
-        if los > 7:
-            return 'AA22'  # Long stay
-        elif any(proc in ['H01', 'H02'] for proc in procedures):
-            return 'DZ19'  # Cardiac
-        elif 'W37' in procedures:
-            return 'FF01'  # Cataract
-        elif 'T87' in procedures:
-            return 'HN12'  # Orthopedic
-        else:
-            return 'AA23'  # Short stay
+    @staticmethod
+    def assign_hrg_codes(cardiac: np.ndarray, cataract: np.ndarray, orthopaedic: np.ndarray,
+                         los: np.ndarray) -> np.ndarray:
+        """Assign Healthcare Resource Groups for payment from procedure flags and lengths of stay"""
+        # Long stay first, then cardiac, cataract and orthopaedic procedures; everything else is short stay
+        return np.select([los > 7, cardiac, cataract, orthopaedic],
+                         ['AA22', 'DZ19', 'FF01', 'HN12'], 'AA23').astype(object)
     
     def get_admission_source(self, admission_method: str) -> str:
         """Get admission source based on method"""
@@ -478,13 +680,6 @@ class SUSPlusGenerator:
         }
         return sources.get(admission_method, '19')
     
-    def get_discharge_destination(self, age: int) -> str:
-        """Get discharge destination based on age"""
-        if age > 80:
-            return random.choices(['19', '65', '87', '79'], weights=[0.6, 0.2, 0.15, 0.05])[0]
-        else:
-            return random.choices(['19', '65', '87'], weights=[0.85, 0.1, 0.05])[0]
-    
     def get_specialty(self, diagnosis: str) -> str:
         """Get medical specialty based on diagnosis"""
         specialty_mapping = {
@@ -499,100 +694,112 @@ class SUSPlusGenerator:
         }
         return specialty_mapping.get(diagnosis, '300')  # General Medicine
     
-    def introduce_data_issues(self, episode: dict) -> dict:
-        """Introduce realistic data quality issues"""
-        issue_type = random.choice(['missing_field', 'invalid_code', 'date_issue', 'duplicate'])
-        
-        if issue_type == 'missing_field':
-            # Random field becomes None
-            fields_to_null = ['secondary_diagnoses', 'secondary_procedures', 'ward_code']
-            field = random.choice(fields_to_null)
-            episode[field] = None
-            
-        elif issue_type == 'invalid_code':
-            # Invalid diagnosis code
-            episode['primary_diagnosis'] = 'INVALID'
-            
-        elif issue_type == 'date_issue':
-            # Discharge before admission (data entry error)
-            if random.random() < 0.3:
-                episode['discharge_date'] = episode['admission_date'] - timedelta(days=1)
-        
-        return episode
+    def introduce_data_issues(self, episodes: pd.DataFrame) -> pd.DataFrame:
+        """Introduce realistic data quality issues, one issue type drawn per affected episode"""
+        n = len(episodes)
+        affected = self.rng.random(n) < self.config.data_quality_degradation
+        issue_type = self.rng.choice(['missing_field', 'invalid_code', 'date_issue', 'duplicate'], size=n)
+        
+        # Random field becomes None
+        fields_to_null = ['secondary_diagnoses', 'secondary_procedures', 'ward_code']
+        field_choice = self.rng.integers(0, len(fields_to_null), n)
+        missing = affected & (issue_type == 'missing_field')
+        for i, field in enumerate(fields_to_null):
+            episodes.loc[missing & (field_choice == i), field] = None
+        
+        # Invalid diagnosis code
+        episodes.loc[affected & (issue_type == 'invalid_code'), 'primary_diagnosis'] = 'INVALID'
+        
+        # Discharge before admission (data entry error)
+        date_issue = affected & (issue_type == 'date_issue') & (self.rng.random(n) < 0.3)
+        episodes.loc[date_issue, 'discharge_date'] = episodes.loc[date_issue, 'admission_date'] - timedelta(days=1)
+        
+        return episodes
+
+# Generator shared by the shard workers, set once per process
+_shard_generator = None
+
+def _init_shard_worker(generator):
+    global _shard_generator
+    _shard_generator = generator
+
+def _run_episode_shard(shard: Tuple[int, int], seed: np.random.SeedSequence) -> pd.DataFrame:
+    _shard_generator.rng = np.random.default_rng(seed)
+    return _shard_generator.generate_episodes(shard)
 
 class ECDSGenerator:
     """Emergency Care Data Set Generator"""
     
+    # Patient columns read per attendance
+    PATIENT_COLUMNS = ['patient_id', 'nhs_number', 'age_at_start']
+    
+    # Arrival time distribution (more at evening/night)
+    HOUR_WEIGHTS = [2, 1, 1, 1, 1, 2, 3, 4, 5, 6, 7, 8, 8, 8, 8, 8, 9, 10, 11, 12, 10, 8, 6, 4]
+    
     def __init__(self, patients_df: pd.DataFrame, trusts_df: pd.DataFrame, config: DataGenerationConfig):
         self.patients_df = patients_df
         self.trusts_df = trusts_df
         self.config = config
+        self.rng = np.random.default_rng(44)
+        
+        # Hour-of-arrival CDF for inverse-CDF draws
+        self._hour_cdf = np.cumsum(self.HOUR_WEIGHTS) / sum(self.HOUR_WEIGHTS)
+        
+        # Attendance weights don't change during a run: keep them as an alias table for patient draws
+        self._alias_probs, self._alias_idx = build_alias_table(self.get_attendance_weights().to_numpy(dtype=float))
     
     def generate_attendances(self) -> pd.DataFrame:
         """Generate A&E attendances with realistic patterns"""
-        attendances = []
-        attendance_id = 1
-        
-        current_date = self.config.start_date
-        end_date = self.config.start_date + timedelta(days=365 * self.config.years_of_data)
-        
-        while current_date < end_date:
-            # Daily A&E volume with patterns
-            base_daily = 80
-            
-            # Day of week pattern
-            if current_date.weekday() == 5:  # Saturday
-                daily_attendances = int(base_daily * 1.3)
-            elif current_date.weekday() == 6:  # Sunday
-                daily_attendances = int(base_daily * 1.1)
-            elif current_date.weekday() == 0:  # Monday
-                daily_attendances = int(base_daily * 1.2)
-            else:
-                daily_attendances = base_daily
-            
-            # Seasonal variation
-            if current_date.month in [12, 1, 2]:  # Winter
-                daily_attendances = int(daily_attendances * 1.4)
-            elif current_date.month in [7, 8]:  # Summer
-                daily_attendances = int(daily_attendances * 0.9)
-            
-            for _ in range(daily_attendances):
-                attendance = self.generate_single_attendance(attendance_id, current_date)
-                attendances.append(attendance)
-                attendance_id += 1
-            
-            current_date += timedelta(days=1)
-        
-        return pd.DataFrame(attendances)
+        dates = pd.date_range(self.config.start_date, periods=365 * self.config.years_of_data, freq='D')
+        daily_attendances = self.get_daily_attendance_counts(dates)
+        attendance_dates = np.repeat(dates.values.astype('datetime64[D]'), daily_attendances)
+        return self.build_attendances_df(len(attendance_dates), attendance_dates)
     
-    def generate_single_attendance(self, attendance_id: int, attendance_date: datetime.date) -> dict:
-        """Generate single A&E attendance"""
-        patient = self.patients_df.sample(n=1, weights=self.get_attendance_weights()).iloc[0]
-        trust = self.trusts_df.sample(n=1).iloc[0]
-        
-        # Arrival time distribution (more at evening/night)
-        hour_weights = [2, 1, 1, 1, 1, 2, 3, 4, 5, 6, 7, 8, 8, 8, 8, 8, 9, 10, 11, 12, 10, 8, 6, 4]
-        arrival_hour = random.choices(range(24), weights=hour_weights)[0]
-        arrival_time = datetime.datetime.combine(attendance_date, datetime.time(arrival_hour, random.randint(0, 59)))
+    def get_daily_attendance_counts(self, dates: pd.DatetimeIndex) -> np.ndarray:
+        """Daily A&E volumes with weekday and seasonal multipliers, for all dates at once"""
+        # Daily A&E volume with patterns; each multiplier truncates to whole attendances in turn
+        base_daily = 80
+        
+        # Day of week pattern: Saturday, Sunday and Monday peaks
+        dow = dates.weekday
+        daily_attendances = (base_daily * (1.0 + 0.3 * (dow == 5) + 0.1 * (dow == 6) + 0.2 * (dow == 0))).astype(int)
+        
+        # Seasonal variation: winter (Dec-Feb) up, summer (Jul-Aug) down
+        month = dates.month
+        winter = np.isin(month, [12, 1, 2])
+        summer = np.isin(month, [7, 8])
+        return (daily_attendances * (1.0 + 0.4 * winter - 0.1 * summer)).astype(int)
+    
+    def build_attendances_df(self, n: int, attendance_dates: np.ndarray) -> pd.DataFrame:
+        """Build all A&E attendances column by column, one array per field"""
+        # Draw patient positions, then gather only the patient columns an attendance carries
+        patient_idx = sample_alias(self.rng, self._alias_probs, self._alias_idx, n)
+        patients = {column: self.patients_df[column].to_numpy()[patient_idx] for column in self.PATIENT_COLUMNS}
+        ages = patients['age_at_start']
+        trust_codes = pd.Categorical.from_codes(self.rng.integers(0, len(self.trusts_df), n),
+                                                categories=self.trusts_df['trust_code'])
+        
+        # Arrival hour from the precomputed CDF, then a uniform minute within it
+        arrival_hour = np.minimum(np.searchsorted(self._hour_cdf, self.rng.random(n), side='right'), 23)
+        arrival_time = (attendance_dates.astype('datetime64[h]') + arrival_hour.astype('timedelta64[h]')
+                        + self.rng.integers(0, 60, n).astype('timedelta64[m]'))
         
         # Triage category (1=immediate, 5=non-urgent)
-        if patient['age_at_start'] > 75:
-            triage = random.choices([1, 2, 3, 4, 5], weights=[0.05, 0.25, 0.4, 0.25, 0.05])[0]
-        else:
-            triage = random.choices([1, 2, 3, 4, 5], weights=[0.02, 0.15, 0.35, 0.35, 0.13])[0]
+        triage = np.empty(n, dtype=np.int64)
+        elderly = ages > 75
+        triage[elderly] = self.rng.choice([1, 2, 3, 4, 5], size=int(elderly.sum()),
+                                           p=[0.05, 0.25, 0.4, 0.25, 0.05])
+        triage[~elderly] = self.rng.choice([1, 2, 3, 4, 5], size=int((~elderly).sum()),
+                                            p=[0.02, 0.15, 0.35, 0.35, 0.13])
         
-        # Time to treatment based on triage
-        treatment_times = {1: 0, 2: 15, 3: 60, 4: 120, 5: 240}  # Minutes
-        time_to_treatment = treatment_times[triage] + random.randint(-10, 30)
-        time_to_treatment = max(0, time_to_treatment)
+        # Time to treatment based on triage (minutes, indexed by category)
+        treatment_times = np.array([0, 0, 15, 60, 120, 240])
+        time_to_treatment = np.maximum(0, treatment_times[triage] + self.rng.integers(-10, 31, n))
         
-        # Total time in department
-        if triage <= 2:
-            total_time = random.randint(120, 480)  # 2-8 hours
-        else:
-            total_time = random.randint(60, 360)   # 1-6 hours
+        # Total time in department: 2-8 hours for triage 1-2, 1-6 hours otherwise
+        total_time = np.where(triage <= 2, self.rng.integers(120, 481, n), self.rng.integers(60, 361, n))
         
-        departure_time = arrival_time + timedelta(minutes=total_time)
+        departure_time = arrival_time + total_time.astype('timedelta64[m]')
         
         # Presenting complaint
         complaints = {
@@ -607,59 +814,49 @@ class ECDSGenerator:
             'Back pain': 0.06,
             'Other': 0.22
         }
-        
-        presenting_complaint = random.choices(
-            list(complaints.keys()),
-            weights=list(complaints.values())
-        )[0]
-        
-        # Discharge destination
-        if patient['age_at_start'] > 80 and triage <= 2:
-            discharge_dest = random.choices(
-                ['01', '02', '03', '04', '05'],  # Home, ward, other hosp, died, left
-                weights=[0.5, 0.35, 0.08, 0.02, 0.05]
-            )[0]
-        else:
-            discharge_dest = random.choices(
-                ['01', '02', '03', '04', '05'],
-                weights=[0.75, 0.15, 0.05, 0.01, 0.04]
-            )[0]
-        
-        # Investigations
-        investigations = []
-        if triage <= 3:
-            if random.random() < 0.6:
-                investigations.append('Blood tests')
-            if random.random() < 0.4:
-                investigations.append('X-ray')
-            if random.random() < 0.2:
-                investigations.append('CT scan')
-            if random.random() < 0.1:
-                investigations.append('ECG')
-        
-        return {
-            'attendance_id': f'ATT{attendance_id:08d}',
-            'patient_id': patient['patient_id'],
-            'nhs_number': patient['nhs_number'],
-            'trust_code': trust['trust_code'],
-            'arrival_datetime': arrival_time,
-            'departure_datetime': departure_time,
+        complaint_weights = np.array(list(complaints.values()))
+        presenting_complaint = self.rng.choice(list(complaints.keys()), size=n,
+                                                p=complaint_weights / complaint_weights.sum()).astype(object)
+        
+        # Discharge destination: home, ward, other hosp, died, left
+        destinations = ['01', '02', '03', '04', '05']
+        discharge_dest = np.empty(n, dtype=object)
+        frail = (ages > 80) & (triage <= 2)
+        discharge_dest[frail] = self.rng.choice(destinations, size=int(frail.sum()),
+                                                 p=[0.5, 0.35, 0.08, 0.02, 0.05])
+        discharge_dest[~frail] = self.rng.choice(destinations, size=int((~frail).sum()),
+                                                  p=[0.75, 0.15, 0.05, 0.01, 0.04])
+        
+        # Investigations, for triage 1-3 only, joined column by column
+        investigations = np.full(n, '', dtype=object)
+        ordered = (triage <= 3)[:, None] & (self.rng.random((n, 4)) < [0.6, 0.4, 0.2, 0.1])
+        for j, investigation in enumerate(['Blood tests', 'X-ray', 'CT scan', 'ECG']):
+            investigations = investigations + np.where(ordered[:, j], ',' + investigation, '')
+        investigations = np.array([s[1:] for s in investigations], dtype=object)
+        
+        return pd.DataFrame({
+            'attendance_id': format_ids('ATT', 1, n),
+            'patient_id': patients['patient_id'],
+            'nhs_number': patients['nhs_number'],
+            'trust_code': trust_codes,
+            'arrival_datetime': arrival_time.astype('datetime64[ns]'),
+            'departure_datetime': departure_time.astype('datetime64[ns]'),
             'triage_category': triage,
             'presenting_complaint': presenting_complaint,
             'discharge_destination': discharge_dest,
             'time_to_treatment_mins': time_to_treatment,
             'total_time_mins': total_time,
-            'investigations': ','.join(investigations),
-            'referred_to_specialist': random.choice([True, False]) if discharge_dest == '01' else False,
-            'safeguarding_concern': random.random() < 0.02,
-            'created_timestamp': datetime.datetime.now()
-        }
+            'investigations': investigations,
+            'referred_to_specialist': (discharge_dest == '01') & (self.rng.random(n) < 0.5),
+            'safeguarding_concern': self.rng.random(n) < 0.02,
+            'created_timestamp': np.datetime64(datetime.datetime.now(), 'ns')  # one timestamp per batch, broadcast
+        })
     
     def get_attendance_weights(self) -> pd.Series:
         """Calculate A&E attendance probability weights"""
         # Young adults and elderly more likely to attend A&E
-        age_weights = np.where(self.patients_df['age_at_start'] < 25, 2.0, 1.0)
-        age_weights = np.where(self.patients_df['age_at_start'] > 70, 2.5, age_weights)
+        ages = self.patients_df['age_at_start'].to_numpy()
+        age_weights = 1.0 + 1.0 * (ages < 25) + 1.5 * (ages > 70)
         
         # Deprivation correlation
         deprivation_weights = 11 - self.patients_df['deprivation_decile']
@@ -669,334 +866,299 @@ class ECDSGenerator:
 class MHSDSGenerator:
     """Mental Health Services Data Set Generator"""
     
+    # Uniformly drawn referral labels, gathered by index
+    URGENCIES = np.array(['Routine', 'Urgent', 'Emergency'], dtype=object)
+    DISCHARGE_REASONS = np.array(['Treatment completed', 'DNA', 'Moved area', 'Stepped down'], dtype=object)
+    RISK_LEVELS = np.array(['Low', 'Medium', 'High'], dtype=object)
+    
     def __init__(self, patients_df: pd.DataFrame, config: DataGenerationConfig):
         self.patients_df = patients_df
         self.config = config
+        self.rng = np.random.default_rng(46)
     
     def generate_referrals(self) -> pd.DataFrame:
         """Generate mental health referrals and care episodes"""
-        referrals = []
-        referral_id = 1
-        
         # Mental health prevalence by age
         mh_population = self.patients_df[
             (self.patients_df['age_at_start'] >= 16) &  # Adult services
             (self.patients_df['age_at_start'] <= 65)
-        ].copy()
+        ]
         
         # Select patients with mental health needs (prevalence ~15%)
-        mh_patients = mh_population.sample(n=int(len(mh_population) * 0.15))
-        
-        for _, patient in mh_patients.iterrows():
-            # Generate 1-3 referrals per patient over the period
-            num_referrals = random.choices([1, 2, 3], weights=[0.6, 0.3, 0.1])[0]
-            
-            for ref_num in range(num_referrals):
-                referral_date = self.config.start_date + timedelta(
-                    days=random.randint(0, 365 * self.config.years_of_data)
-                )
-                
-                referral = self.generate_single_referral(referral_id, patient, referral_date)
-                referrals.append(referral)
-                referral_id += 1
-        
-        return pd.DataFrame(referrals)
+        mh_idx = self.rng.choice(len(mh_population), size=int(len(mh_population) * 0.15), replace=False)
+        
+        # Generate 1-3 referrals per patient over the period
+        num_referrals = self.rng.choice([1, 2, 3], size=len(mh_idx), p=[0.6, 0.3, 0.1])
+        patient_idx = np.repeat(mh_idx, num_referrals)
+        n = len(patient_idx)
+        referral_dates = (np.datetime64(self.config.start_date, 'D')
+                          + self.rng.integers(0, 365 * self.config.years_of_data + 1, n).astype('timedelta64[D]'))
+        
+        patients = {column: mh_population[column].to_numpy()[patient_idx]
+                    for column in ['patient_id', 'nhs_number', 'age_at_start']}
+        return self.build_referrals_df(n, patients, referral_dates)
     
-    def generate_single_referral(self, referral_id: int, patient: pd.Series, referral_date: datetime.date) -> dict:
-        """Generate single mental health referral"""
-        # Referral source
-        referral_sources = {
-            'A01': 'GP',
-            'A02': 'Self referral',
-            'A03': 'A&E',
-            'A04': 'Acute hospital',
-            'A05': 'Criminal justice',
-            'A06': 'Other'
-        }
+    def build_referrals_df(self, n: int, patients: Dict[str, np.ndarray], referral_dates: np.ndarray) -> pd.DataFrame:
+        """Build all mental health referrals column by column"""
+        ages = patients['age_at_start']
         
-        source = random.choices(
-            list(referral_sources.keys()),
-            weights=[0.65, 0.15, 0.08, 0.05, 0.04, 0.03]
-        )[0]
-        
-        # Primary diagnosis (ICD-10 F codes)
-        mh_diagnoses = {
-            'F32': 'Depressive episode',
-            'F41': 'Anxiety disorders',
-            'F43': 'Stress-related disorders',
-            'F20': 'Schizophrenia',
-            'F31': 'Bipolar disorder',
-            'F60': 'Personality disorders',
-            'F10': 'Alcohol use disorders'
-        }
-        
-        # Age influences diagnosis
-        if patient['age_at_start'] < 30:
-            diagnosis = random.choices(
-                list(mh_diagnoses.keys()),
-                weights=[0.3, 0.35, 0.2, 0.05, 0.05, 0.03, 0.02]
-            )[0]
-        else:
-            diagnosis = random.choices(
-                list(mh_diagnoses.keys()),
-                weights=[0.4, 0.25, 0.15, 0.08, 0.07, 0.03, 0.02]
-            )[0]
-        
-        # Care cluster (payment grouping)
-        care_clusters = {
-            1: 'Non-psychotic (low severity)',
-            2: 'Non-psychotic (medium severity)', 
-            3: 'Non-psychotic (high severity)',
-            4: 'Non-psychotic (very high severity)',
-            11: 'Ongoing recurrent psychosis',
-            12: 'Ongoing recurrent psychosis (high support)',
-            21: 'Cognitive impairment'
-        }
-        
-        if diagnosis in ['F32', 'F41', 'F43']:
-            cluster = random.choices([1, 2, 3, 4], weights=[0.4, 0.35, 0.2, 0.05])[0]
-        elif diagnosis in ['F20', 'F31']:
-            cluster = random.choices([11, 12], weights=[0.7, 0.3])[0]
-        else:
-            cluster = random.choice([1, 2, 3])
+        # Referral source
+        source = self.rng.choice(MH_REFERRAL_SOURCE_KEYS, size=n,
+                                 p=[0.65, 0.15, 0.08, 0.05, 0.04, 0.03]).astype(object)
+        
+        # Primary diagnosis (ICD-10 F codes): age influences diagnosis
+        diagnosis = np.empty(n, dtype=object)
+        young = ages < 30
+        diagnosis[young] = self.rng.choice(MH_DIAGNOSIS_KEYS, size=int(young.sum()),
+                                           p=[0.3, 0.35, 0.2, 0.05, 0.05, 0.03, 0.02])
+        diagnosis[~young] = self.rng.choice(MH_DIAGNOSIS_KEYS, size=int((~young).sum()),
+                                            p=[0.4, 0.25, 0.15, 0.08, 0.07, 0.03, 0.02])
+        
+        # Care cluster (payment grouping, see MH_CARE_CLUSTERS)
+        cluster = np.empty(n, dtype=np.int64)
+        non_psychotic = np.isin(diagnosis, ['F32', 'F41', 'F43'])
+        psychosis = np.isin(diagnosis, ['F20', 'F31'])
+        other = ~(non_psychotic | psychosis)
+        cluster[non_psychotic] = self.rng.choice([1, 2, 3, 4], size=int(non_psychotic.sum()),
+                                                 p=[0.4, 0.35, 0.2, 0.05])
+        cluster[psychosis] = self.rng.choice([11, 12], size=int(psychosis.sum()), p=[0.7, 0.3])
+        cluster[other] = self.rng.choice([1, 2, 3], size=int(other.sum()))
         
         # Generate care contacts
-        contacts = self.generate_care_contacts(referral_date, diagnosis)
-        
-        # HoNOS scores (Health of Nation Outcome Scales)
-        initial_honos = random.randint(15, 35)  # Higher = more severe
-        final_honos = max(0, initial_honos - random.randint(0, 10))  # Improvement
-        
-        return {
-            'referral_id': f'MH{referral_id:08d}',
-            'patient_id': patient['patient_id'],
-            'nhs_number': patient['nhs_number'],
-            'referral_date': referral_date,
-            'referral_source': source,
-            'primary_diagnosis': diagnosis,
+        total_contacts, first_contact, last_contact = self.build_care_contacts(referral_dates, diagnosis)
+        
+        # HoNOS scores (Health of Nation Outcome Scales): higher = more severe, then some improvement
+        initial_honos = self.rng.integers(15, 36, n)
+        final_honos = np.maximum(0, initial_honos - self.rng.integers(0, 11, n))
+        
+        return pd.DataFrame({
+            'referral_id': format_ids('MH', 1, n),
+            'patient_id': patients['patient_id'],
+            'nhs_number': patients['nhs_number'],
+            'referral_date': referral_dates.astype(object),
+            'referral_source': pd.Categorical(source, categories=MH_REFERRAL_SOURCE_KEYS),
+            'primary_diagnosis': pd.Categorical(diagnosis, categories=MH_DIAGNOSIS_KEYS),
             'care_cluster': cluster,
-            'urgency': random.choice(['Routine', 'Urgent', 'Emergency']),
+            'urgency': pd.Categorical.from_codes(self.rng.integers(0, len(self.URGENCIES), n),
+                                                 categories=self.URGENCIES),
             'initial_honos_score': initial_honos,
             'latest_honos_score': final_honos,
-            'total_contacts': len(contacts),
-            'first_contact_date': min(contacts) if contacts else None,
-            'last_contact_date': max(contacts) if contacts else None,
-            'discharge_date': max(contacts) + timedelta(days=30) if contacts else None,
-            'discharge_reason': random.choice(['Treatment completed', 'DNA', 'Moved area', 'Stepped down']),
-            'risk_assessment': random.choice(['Low', 'Medium', 'High']),
-            'created_timestamp': datetime.datetime.now()
-        }
+            'total_contacts': total_contacts,
+            'first_contact_date': first_contact.astype(object),
+            'last_contact_date': last_contact.astype(object),
+            'discharge_date': (last_contact + np.timedelta64(30, 'D')).astype(object),
+            'discharge_reason': pd.Categorical.from_codes(self.rng.integers(0, len(self.DISCHARGE_REASONS), n),
+                                                          categories=self.DISCHARGE_REASONS),
+            'risk_assessment': pd.Categorical.from_codes(self.rng.integers(0, len(self.RISK_LEVELS), n),
+                                                         categories=self.RISK_LEVELS),
+            'created_timestamp': np.datetime64(datetime.datetime.now(), 'ns')  # one timestamp per batch, broadcast
+        })
     
-    def generate_care_contacts(self, referral_date: datetime.date, diagnosis: str) -> List[datetime.date]:
-        """Generate care contact dates"""
-        contacts = []
+    def build_care_contacts(self, referral_dates: np.ndarray,
+                            diagnosis: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Walk every referral's contact dates at once; returns (total, first, last) per referral"""
+        n = len(referral_dates)
         
         # Number of contacts based on diagnosis severity
-        if diagnosis in ['F20', 'F31']:  # Severe mental illness
-            num_contacts = random.randint(8, 25)
-        elif diagnosis in ['F32', 'F41']:  # Common mental health
-            num_contacts = random.randint(4, 12)
-        else:
-            num_contacts = random.randint(2, 8)
+        num_contacts = np.select(
+            [np.isin(diagnosis, ['F20', 'F31']), np.isin(diagnosis, ['F32', 'F41'])],  # Severe, common
+            [self.rng.integers(8, 26, n), self.rng.integers(4, 13, n)],
+            default=self.rng.integers(2, 9, n)
+        )
         
-        current_date = referral_date + timedelta(days=random.randint(7, 21))  # First appointment
+        first_contact = referral_dates + self.rng.integers(7, 22, n).astype('timedelta64[D]')  # First appointment
         
-        for _ in range(num_contacts):
-            contacts.append(current_date)
-            # Next contact in 1-4 weeks
-            current_date += timedelta(days=random.randint(7, 28))
+        # Next contact in 1-4 weeks: the last contact is the first plus the sum of the gaps in between
+        gaps = self.rng.integers(7, 29, int((num_contacts - 1).sum()))
+        span = np.bincount(np.repeat(np.arange(n), num_contacts - 1), weights=gaps, minlength=n)
+        last_contact = first_contact + span.astype(np.int64).astype('timedelta64[D]')
         
-        return contacts
+        return num_contacts, first_contact, last_contact
 
 class CSSDSGenerator:
     """Community Services Data Set Generator"""
     
+    # Uniformly drawn contact labels, gathered by index
+    CONTACT_MODES = np.array(['Face to face', 'Telephone', 'Video call'], dtype=object)
+    CARE_ACTIVITIES = np.array(['Assessment', 'Treatment', 'Review', 'Discharge planning'], dtype=object)
+    
     def __init__(self, patients_df: pd.DataFrame, config: DataGenerationConfig):
         self.patients_df = patients_df
         self.config = config
+        self.rng = np.random.default_rng(47)
     
     def generate_contacts(self) -> pd.DataFrame:
         """Generate community service contacts"""
-        contacts = []
-        contact_id = 1
-        
         # Community services more likely for elderly and deprived populations
-        weights = np.where(self.patients_df['age_at_start'] > 65, 3.0, 1.0)
-        weights = weights * (11 - self.patients_df['deprivation_decile'])
+        ages = self.patients_df['age_at_start'].to_numpy()
+        weights = (1.0 + 2.0 * (ages > 65)) * (11 - self.patients_df['deprivation_decile'].to_numpy())
         
         # Select patients receiving community services (~8% of population)
-        community_patients = self.patients_df.sample(
-            n=int(len(self.patients_df) * 0.08),
-            weights=weights
-        )
-        
-        for _, patient in community_patients.iterrows():
-            # Generate contacts over time period
-            num_contacts = random.randint(1, 20)
-            
-            for contact_num in range(num_contacts):
-                contact_date = self.config.start_date + timedelta(
-                    days=random.randint(0, 365 * self.config.years_of_data)
-                )
-                
-                contact = self.generate_single_contact(contact_id, patient, contact_date)
-                contacts.append(contact)
-                contact_id += 1
-        
-        return pd.DataFrame(contacts)
-    
-    def generate_single_contact(self, contact_id: int, patient: pd.Series, contact_date: datetime.date) -> dict:
-        """Generate single community service contact"""
-        # Service types
-        services = {
-            'N01': 'District nursing',
-            'N02': 'Health visiting', 
-            'A01': 'Physiotherapy',
-            'A02': 'Occupational therapy',
-            'A03': 'Speech and language therapy',
-            'A04': 'Dietitian',
-            'N03': 'Community mental health',
-            'N04': 'Specialist nursing'
-        }
-        
-        # Age influences service type
-        if patient['age_at_start'] > 75:
-            service_weights = [0.35, 0.05, 0.25, 0.15, 0.05, 0.05, 0.05, 0.05]
-        elif patient['age_at_start'] < 5:
-            service_weights = [0.1, 0.4, 0.1, 0.1, 0.15, 0.05, 0.05, 0.05]
-        else:
-            service_weights = [0.15, 0.1, 0.2, 0.15, 0.1, 0.1, 0.15, 0.05]
-        
-        service_code = random.choices(list(services.keys()), weights=service_weights)[0]
+        community_idx = self.rng.choice(len(self.patients_df), size=int(len(self.patients_df) * 0.08),
+                                        replace=False, p=weights / weights.sum())
+        
+        # Generate 1-20 contacts per patient over the time period
+        num_contacts = self.rng.integers(1, 21, len(community_idx))
+        patient_idx = np.repeat(community_idx, num_contacts)
+        n = len(patient_idx)
+        contact_dates = (np.datetime64(self.config.start_date, 'D')
+                         + self.rng.integers(0, 365 * self.config.years_of_data + 1, n).astype('timedelta64[D]'))
+        
+        patients = {column: self.patients_df[column].to_numpy()[patient_idx]
+                    for column in ['patient_id', 'nhs_number', 'age_at_start']}
+        return self.build_contacts_df(n, patients, contact_dates)
+    
+    def build_contacts_df(self, n: int, patients: Dict[str, np.ndarray], contact_dates: np.ndarray) -> pd.DataFrame:
+        """Build all community service contacts column by column"""
+        ages = patients['age_at_start']
+        
+        # Service types: age influences service type
+        service_code = np.empty(n, dtype=object)
+        elderly = ages > 75
+        infant = ages < 5
+        adult = ~(elderly | infant)
+        for group, service_weights in [
+            (elderly, [0.35, 0.05, 0.25, 0.15, 0.05, 0.05, 0.05, 0.05]),
+            (infant, [0.1, 0.4, 0.1, 0.1, 0.15, 0.05, 0.05, 0.05]),
+            (adult, [0.15, 0.1, 0.2, 0.15, 0.1, 0.1, 0.15, 0.05]),
+        ]:
+            service_code[group] = self.rng.choice(COMMUNITY_SERVICE_KEYS, size=int(group.sum()), p=service_weights)
         
         # Contact setting
-        settings = {
-            '01': 'Patient home',
-            '02': 'Community clinic',
-            '03': 'GP practice',
-            '04': 'School',
-            '05': 'Care home'
-        }
-        
-        if patient['age_at_start'] > 75:
-            setting = random.choices(
-                list(settings.keys()),
-                weights=[0.6, 0.2, 0.1, 0.0, 0.1]
-            )[0]
-        else:
-            setting = random.choices(
-                list(settings.keys()),
-                weights=[0.4, 0.4, 0.15, 0.05, 0.0]
-            )[0]
-        
-        # Contact duration
-        if service_code in ['N01', 'N04']:  # Nursing
-            duration_mins = random.randint(15, 60)
-        elif service_code in ['A01', 'A02']:  # Therapy
-            duration_mins = random.randint(30, 90)
-        else:
-            duration_mins = random.randint(20, 60)
-        
-        return {
-            'contact_id': f'CS{contact_id:08d}',
-            'patient_id': patient['patient_id'],
-            'nhs_number': patient['nhs_number'],
-            'contact_date': contact_date,
-            'service_type': service_code,
-            'service_name': services[service_code],
-            'care_professional': f'CP{random.randint(1000, 9999)}',
-            'contact_setting': setting,
+        setting = np.empty(n, dtype=object)
+        setting[elderly] = self.rng.choice(CONTACT_SETTING_KEYS, size=int(elderly.sum()),
+                                           p=[0.6, 0.2, 0.1, 0.0, 0.1])
+        setting[~elderly] = self.rng.choice(CONTACT_SETTING_KEYS, size=int((~elderly).sum()),
+                                            p=[0.4, 0.4, 0.15, 0.05, 0.0])
+        
+        # Contact duration: nursing 15-60, therapy 30-90, otherwise 20-60 minutes
+        nursing = np.isin(service_code, ['N01', 'N04'])
+        therapy = np.isin(service_code, ['A01', 'A02'])
+        duration_mins = np.where(nursing, self.rng.integers(15, 61, n),
+                                 np.where(therapy, self.rng.integers(30, 91, n), self.rng.integers(20, 61, n)))
+        
+        service_type = pd.Categorical(service_code, categories=COMMUNITY_SERVICE_KEYS)
+        
+        return pd.DataFrame({
+            'contact_id': format_ids('CS', 1, n),
+            'patient_id': patients['patient_id'],
+            'nhs_number': patients['nhs_number'],
+            'contact_date': contact_dates.astype(object),
+            'service_type': service_type,
+            'service_name': pd.Categorical.from_codes(service_type.codes, categories=list(COMMUNITY_SERVICES.values())),
+            'care_professional': np.char.add('CP', self.rng.integers(1000, 10000, n).astype(str)),
+            'contact_setting': pd.Categorical(setting, categories=CONTACT_SETTING_KEYS),
             'contact_duration_mins': duration_mins,
-            'contact_mode': random.choice(['Face to face', 'Telephone', 'Video call']),
-            'care_activity': random.choice(['Assessment', 'Treatment', 'Review', 'Discharge planning']),
-            'onward_referral': random.choice([True, False]),
-            'safeguarding_concern': random.random() < 0.03,
-            'created_timestamp': datetime.datetime.now()
-        }
+            'contact_mode': pd.Categorical.from_codes(self.rng.integers(0, len(self.CONTACT_MODES), n),
+                                                      categories=self.CONTACT_MODES),
+            'care_activity': pd.Categorical.from_codes(self.rng.integers(0, len(self.CARE_ACTIVITIES), n),
+                                                       categories=self.CARE_ACTIVITIES),
+            'onward_referral': self.rng.random(n) < 0.5,
+            'safeguarding_concern': self.rng.random(n) < 0.03,
+            'created_timestamp': np.datetime64(datetime.datetime.now(), 'ns')  # one timestamp per batch, broadcast
+        })
 
 class PrescribingGenerator:
     """NHS BSA Prescribing Data Generator"""
     
+    # Months built per batch (~100k items), so writers never hold the full period in memory
+    CHUNK_MONTHS = 10
+    
+    # Patient sampling weight by age band (up to 50, over 50, over 70)
+    PATIENT_AGE_WEIGHTS = np.array([1.0, 2.0, 4.0])
+    
     def __init__(self, patients_df: pd.DataFrame, practices_df: pd.DataFrame, config: DataGenerationConfig):
         self.patients_df = patients_df
         self.practices_df = practices_df
         self.config = config
         self.bnf_codes = NHSCodebooks.get_bnf_codes()
+        
+        # BNF mix by age band (elderly, children, adults) as cumulative weights, built once
+        self._bnf_cum_bands = np.cumsum([[0.1, 0.2, 0.25, 0.1, 0.05, 0.15, 0.05, 0.05, 0.05],
+                                         [0.15, 0.05, 0.05, 0.1, 0.1, 0.05, 0.3, 0.15, 0.05],
+                                         [0.12, 0.1, 0.15, 0.12, 0.08, 0.1, 0.1, 0.13, 0.1]], axis=1)
+        self._bnf_codes_np = np.array(BNF_KEYS, dtype=object)
+        self._bnf_names = np.array([self.bnf_codes[code]['name'] for code in BNF_KEYS], dtype=object)
+        self._bnf_avg_costs = np.array([self.bnf_codes[code]['avg_cost'] for code in BNF_KEYS])
+        
+        # Select patient (prescribing more likely in elderly): weights are fixed, so keep them as a CDF
+        self.rng = np.random.default_rng(48)
+        self._patient_ids = self.patients_df['patient_id'].to_numpy()
+        self._nhs_numbers = self.patients_df['nhs_number'].to_numpy()
+        self._ages = self.patients_df['age_at_start'].to_numpy()
+        
+        # Weight by age band in one lookup: 1 up to 50, 2 over 50, 4 over 70
+        weights = self.PATIENT_AGE_WEIGHTS[(self._ages > 50).astype(np.intp) + (self._ages > 70)]
+        self._patient_cdf = np.cumsum(weights)
+        self._patient_cdf /= self._patient_cdf[-1]
+        self._practice_codes = self.practices_df['practice_code'].to_numpy()
+        # Practice codes are drawn at random and can repeat, so factorize them for the categorical column
+        self._practice_code_idx, self._practice_code_categories = pd.factorize(self._practice_codes)
     
     def generate_prescriptions(self) -> pd.DataFrame:
         """Generate prescription data"""
-        prescriptions = []
-        prescription_id = 1
-        
-        # Generate monthly prescription data
-        current_date = self.config.start_date
-        
-        while current_date < self.config.start_date + timedelta(days=365 * self.config.years_of_data):
-            # Monthly prescribing volume
-            monthly_prescriptions = random.randint(8000, 12000)
-            
-            for _ in range(monthly_prescriptions):
-                prescription = self.generate_single_prescription(prescription_id, current_date)
-                prescriptions.append(prescription)
-                prescription_id += 1
-            
-            # Move to next month
-            if current_date.month == 12:
-                current_date = current_date.replace(year=current_date.year + 1, month=1)
-            else:
-                current_date = current_date.replace(month=current_date.month + 1)
-        
-        return pd.DataFrame(prescriptions)
-    
-    def generate_single_prescription(self, prescription_id: int, month_date: datetime.date) -> dict:
-        """Generate single prescription item"""
-        # Select patient (prescribing more likely in elderly)
-        weights = np.where(self.patients_df['age_at_start'] > 50, 2.0, 1.0)
-        weights = np.where(self.patients_df['age_at_start'] > 70, 4.0, weights)
-        
-        patient = self.patients_df.sample(n=1, weights=weights).iloc[0]
-        practice = self.practices_df.sample(n=1).iloc[0]
-        
-        # Select BNF code based on age
-        if patient['age_at_start'] > 65:
-            # Elderly more likely cardiovascular, diabetes meds
-            bnf_weights = [0.1, 0.2, 0.25, 0.1, 0.05, 0.15, 0.05, 0.05, 0.05]
-        elif patient['age_at_start'] < 18:
-            # Children more likely antibiotics, simple analgesics
-            bnf_weights = [0.15, 0.05, 0.05, 0.1, 0.1, 0.05, 0.3, 0.15, 0.05]
-        else:
-            # Adults mixed pattern
-            bnf_weights = [0.12, 0.1, 0.15, 0.12, 0.08, 0.1, 0.1, 0.13, 0.1]
-        
-        bnf_code = random.choices(list(self.bnf_codes.keys()), weights=bnf_weights)[0]
-        bnf_data = self.bnf_codes[bnf_code]
+        return pd.concat(list(self.iter_prescription_chunks()), ignore_index=True)
+    
+    def iter_prescription_chunks(self) -> Iterator[pd.DataFrame]:
+        """Yield prescriptions CHUNK_MONTHS months at a time, numbered continuously across chunks"""
+        # Generate monthly prescription data: every month step from the start date before the end of the period
+        end_date = self.config.start_date + timedelta(days=365 * self.config.years_of_data)
+        month_dates = pd.date_range(self.config.start_date, end_date - timedelta(days=1),
+                                    freq=pd.DateOffset(months=1)).values.astype('datetime64[D]')
+        
+        # Monthly prescribing volume
+        monthly_counts = self.rng.integers(8000, 12001, len(month_dates))
+        
+        first_prescription_id = 1
+        for start in range(0, len(month_dates), self.CHUNK_MONTHS):
+            counts = monthly_counts[start:start + self.CHUNK_MONTHS]
+            yield self.build_prescriptions_df(month_dates[start:start + self.CHUNK_MONTHS], counts,
+                                              first_prescription_id)
+            first_prescription_id += int(counts.sum())
+    
+    def build_prescriptions_df(self, month_dates: np.ndarray, monthly_counts: np.ndarray,
+                               first_prescription_id: int = 1) -> pd.DataFrame:
+        """Build every prescription item for the given months column by column"""
+        n = int(monthly_counts.sum())
+        
+        # Patients (age-weighted, inverse CDF) and practices (uniform)
+        patient_idx = np.minimum(np.searchsorted(self._patient_cdf, self.rng.random(n), side='right'),
+                                 len(self._patient_cdf) - 1)
+        practice_idx = self.rng.integers(0, len(self._practice_codes), n)
+        ages = self._ages[patient_idx]
+        
+        # BNF code by age band: elderly (>65), children (<18), adults
+        band = np.select([ages > 65, ages < 18], [0, 1], default=2)
+        bnf_cum = self._bnf_cum_bands[band]
+        u = self.rng.random(n) * bnf_cum[:, -1]
+        bnf_idx = np.minimum((u[:, None] >= bnf_cum).sum(axis=1), len(self._bnf_codes_np) - 1)
         
         # Quantity and cost
-        quantity = random.randint(1, 6) * 28  # Usually 28-day supplies
-        unit_cost = bnf_data['avg_cost'] + random.uniform(-2, 5)
-        unit_cost = max(0.50, unit_cost)  # Minimum cost
-        
+        quantity = self.rng.integers(1, 7, n) * 28  # Usually 28-day supplies
+        unit_cost = np.maximum(0.50, self._bnf_avg_costs[bnf_idx] + self.rng.uniform(-2, 5, n))  # Minimum cost
         net_ingredient_cost = unit_cost * (quantity / 28)
-        actual_cost = net_ingredient_cost * random.uniform(0.9, 1.1)  # Discount variation
+        actual_cost = net_ingredient_cost * self.rng.uniform(0.9, 1.1, n)  # Discount variation
         
         # Prescription date within the month
-        prescription_date = month_date + timedelta(days=random.randint(0, 27))
-        
-        return {
-            'prescription_id': f'RX{prescription_id:08d}',
-            'patient_id': patient['patient_id'],
-            'nhs_number': patient['nhs_number'],
-            'practice_code': practice['practice_code'],
-            'prescription_date': prescription_date,
-            'bnf_code': bnf_code,
-            'bnf_name': bnf_data['name'],
+        month_starts = np.repeat(month_dates, monthly_counts)
+        prescription_dates = month_starts + self.rng.integers(0, 28, n).astype('timedelta64[D]')
+        
+        return pd.DataFrame({
+            'prescription_id': format_ids('RX', first_prescription_id, n),
+            'patient_id': self._patient_ids[patient_idx],
+            'nhs_number': self._nhs_numbers[patient_idx],
+            'practice_code': pd.Categorical.from_codes(self._practice_code_idx[practice_idx],
+                                                      categories=self._practice_code_categories),
+            'prescription_date': prescription_dates.astype(object),
+            'bnf_code': pd.Categorical.from_codes(bnf_idx, categories=self._bnf_codes_np),
+            'bnf_name': pd.Categorical.from_codes(bnf_idx, categories=self._bnf_names),
             'quantity': quantity,
-            'net_ingredient_cost': round(net_ingredient_cost, 2),
-            'actual_cost': round(actual_cost, 2),
-            'prescriber_code': f'PR{random.randint(100000, 999999)}',
+            'net_ingredient_cost': np.round(net_ingredient_cost, 2),
+            'actual_cost': np.round(actual_cost, 2),
+            'prescriber_code': np.char.add('PR', self.rng.integers(100000, 1000000, n).astype(str)),
             'prescription_items': 1,
-            'created_timestamp': datetime.datetime.now()
-        }
+            'created_timestamp': np.datetime64(datetime.datetime.now(), 'ns')  # one timestamp per batch, broadcast
+        })
 
 class SocialCareGenerator:
     """Adult Social Care Data Generator"""
@@ -1004,12 +1166,22 @@ class SocialCareGenerator:
     def __init__(self, patients_df: pd.DataFrame, config: DataGenerationConfig):
         self.patients_df = patients_df
         self.config = config
+        
+        # Package type (over 85, over 75, others) and assessment outcome (over 85, others) mixes as
+        # cumulative weights, built once
+        self.rng = np.random.default_rng(49)
+        self._package_cum_bands = np.cumsum([[0.3, 0.1, 0.25, 0.25, 0.05, 0.05],
+                                             [0.4, 0.2, 0.15, 0.15, 0.05, 0.05],
+                                             [0.35, 0.25, 0.1, 0.1, 0.1, 0.1]], axis=1)
+        self._outcome_cum_bands = np.cumsum([[0.1, 0.2, 0.4, 0.3],
+                                             [0.2, 0.4, 0.3, 0.1]], axis=1)
+        self._package_keys_np = np.array(list(SOCIAL_CARE_PACKAGE_TYPES), dtype=object)
+        self._package_names = np.array(list(SOCIAL_CARE_PACKAGE_TYPES.values()), dtype=object)
+        self._package_costs = np.array([SOCIAL_CARE_COST_RANGES[key] for key in SOCIAL_CARE_PACKAGE_TYPES])
+        self._outcome_keys_np = np.array(list(SOCIAL_CARE_ASSESSMENT_OUTCOMES), dtype=object)
     
     def generate_care_packages(self) -> pd.DataFrame:
         """Generate social care packages"""
-        packages = []
-        package_id = 1
-        
         # Social care primarily for elderly and disabled
         eligible_patients = self.patients_df[
             (self.patients_df['age_at_start'] > 65) |
@@ -1017,282 +1189,257 @@ class SocialCareGenerator:
         ]
         
         # About 3% receive social care
-        care_recipients = eligible_patients.sample(n=int(len(eligible_patients) * 0.03))
-        
-        for _, patient in care_recipients.iterrows():
-            package = self.generate_single_package(package_id, patient)
-            packages.append(package)
-            package_id += 1
-        
-        return pd.DataFrame(packages)
-    
-    def generate_single_package(self, package_id: int, patient: pd.Series) -> dict:
-        """Generate single social care package"""
-        # Package types
-        package_types = {
-            'HOMECARE': 'Home care',
-            'DAYCARE': 'Day care',
-            'RESIDENTIAL': 'Residential care',
-            'NURSING': 'Nursing home',
-            'EQUIPMENT': 'Equipment/adaptations',
-            'DIRECT_PAYMENT': 'Direct payment'
-        }
+        recipient_idx = self.rng.choice(len(eligible_patients), size=int(len(eligible_patients) * 0.03),
+                                        replace=False)
         
-        # Age influences package type
-        if patient['age_at_start'] > 85:
-            type_weights = [0.3, 0.1, 0.25, 0.25, 0.05, 0.05]
-        elif patient['age_at_start'] > 75:
-            type_weights = [0.4, 0.2, 0.15, 0.15, 0.05, 0.05]
-        else:
-            type_weights = [0.35, 0.25, 0.1, 0.1, 0.1, 0.1]
+        patients = {column: eligible_patients[column].to_numpy()[recipient_idx]
+                    for column in ['patient_id', 'nhs_number', 'age_at_start']}
+        return self.build_packages_df(len(recipient_idx), patients)
+    
+    def build_packages_df(self, n: int, patients: Dict[str, np.ndarray]) -> pd.DataFrame:
+        """Build all social care packages column by column, with dates kept as day offsets until assembly"""
+        ages = patients['age_at_start']
         
-        package_type = random.choices(list(package_types.keys()), weights=type_weights)[0]
+        # Age influences package type
+        type_cum = self._package_cum_bands[np.select([ages > 85, ages > 75], [0, 1], default=2)]
+        u = self.rng.random(n) * type_cum[:, -1]
+        type_idx = np.minimum((u[:, None] >= type_cum).sum(axis=1), len(self._package_keys_np) - 1)
         
         # Weekly cost based on package type
-        cost_ranges = {
-            'HOMECARE': (100, 500),
-            'DAYCARE': (150, 300),
-            'RESIDENTIAL': (600, 1200),
-            'NURSING': (800, 1500),
-            'EQUIPMENT': (50, 200),
-            'DIRECT_PAYMENT': (200, 800)
-        }
+        cost_range = self._package_costs[type_idx]
+        weekly_cost = self.rng.integers(cost_range[:, 0], cost_range[:, 1] + 1)
         
-        min_cost, max_cost = cost_ranges[package_type]
-        weekly_cost = random.randint(min_cost, max_cost)
-        
-        # Start date
-        start_date = self.config.start_date + timedelta(
-            days=random.randint(0, 365 * self.config.years_of_data - 180)
-        )
+        # Start date as a day offset into the period
+        start_offset = self.rng.integers(0, 365 * self.config.years_of_data - 180 + 1, n)
         
-        # Duration (some ongoing, some completed)
-        if random.random() < 0.3:  # 30% completed
-            duration_weeks = random.randint(4, 52)
-            end_date = start_date + timedelta(weeks=duration_weeks)
-            status = 'Completed'
-        else:  # Ongoing
-            duration_weeks = random.randint(12, 156)  # Up to 3 years
-            end_date = None
-            status = 'Active'
+        # Duration (some ongoing, some completed): 30% completed after 4-52 weeks, others ongoing for up to 3 years
+        completed = self.rng.random(n) < 0.3
+        duration_weeks = np.where(completed, self.rng.integers(4, 53, n), self.rng.integers(12, 157, n))
         
         # Assessment outcome
-        assessment_outcomes = {
-            'LOW': 'Low needs',
-            'MODERATE': 'Moderate needs', 
-            'SUBSTANTIAL': 'Substantial needs',
-            'CRITICAL': 'Critical needs'
-        }
-        
-        if patient['age_at_start'] > 85:
-            outcome = random.choices(
-                list(assessment_outcomes.keys()),
-                weights=[0.1, 0.2, 0.4, 0.3]
-            )[0]
-        else:
-            outcome = random.choices(
-                list(assessment_outcomes.keys()),
-                weights=[0.2, 0.4, 0.3, 0.1]
-            )[0]
-        
-        return {
-            'package_id': f'SC{package_id:08d}',
-            'patient_id': patient['patient_id'],
-            'nhs_number': patient['nhs_number'],
-            'package_type': package_type,
-            'package_name': package_types[package_type],
-            'start_date': start_date,
-            'end_date': end_date,
-            'status': status,
+        outcome_cum = self._outcome_cum_bands[np.where(ages > 85, 0, 1)]
+        u = self.rng.random(n) * outcome_cum[:, -1]
+        outcome_idx = np.minimum((u[:, None] >= outcome_cum).sum(axis=1), len(self._outcome_keys_np) - 1)
+        
+        homecare = self._package_keys_np[type_idx] == 'HOMECARE'
+        hours_per_week = np.where(homecare, self.rng.integers(2, 41, n), np.nan)
+        
+        base = np.datetime64(self.config.start_date, 'D')
+        start_dates = base + start_offset.astype('timedelta64[D]')
+        end_dates = (start_dates + (duration_weeks * 7).astype('timedelta64[D]')).astype(object)
+        end_dates[~completed] = None
+        
+        return pd.DataFrame({
+            'package_id': format_ids('SC', 1, n),
+            'patient_id': patients['patient_id'],
+            'nhs_number': patients['nhs_number'],
+            'package_type': pd.Categorical.from_codes(type_idx, categories=self._package_keys_np),
+            'package_name': pd.Categorical.from_codes(type_idx, categories=self._package_names),
+            'start_date': start_dates.astype(object),
+            'end_date': end_dates,
+            'status': pd.Categorical.from_codes(completed.astype(np.int8), categories=['Active', 'Completed']),
             'weekly_cost': weekly_cost,
-            'assessment_outcome': outcome,
-            'care_provider': f'Provider_{random.randint(1, 50)}',
-            'hours_per_week': random.randint(2, 40) if package_type == 'HOMECARE' else None,
-            'review_date': start_date + timedelta(weeks=12),
-            'created_timestamp': datetime.datetime.now()
-        }
+            'assessment_outcome': pd.Categorical.from_codes(outcome_idx, categories=self._outcome_keys_np),
+            'care_provider': np.char.add('Provider_', self.rng.integers(1, 51, n).astype(str)),
+            'hours_per_week': hours_per_week,
+            'review_date': (start_dates + np.timedelta64(12 * 7, 'D')).astype(object),
+            'created_timestamp': np.datetime64(datetime.datetime.now(), 'ns')  # one timestamp per batch, broadcast
+        })
 
 class DatasetLinker:
     """Links datasets using NHS number and creates patient journeys"""
     
+    # Care settings in name order, so a bitmask of them labels in sorted order
+    CARE_SETTINGS = ('Acute', 'Community', 'Emergency', 'Mental Health')
+    
+    # Columns create_patient_journeys reads from each source dataset
+    LINK_COLUMNS = {
+        'sus_episodes': ['patient_id', 'admission_date', 'primary_diagnosis', 'hrg_code', 'episode_id'],
+        'ecds_attendances': ['patient_id', 'arrival_datetime', 'presenting_complaint', 'attendance_id'],
+        'mhsds_referrals': ['patient_id', 'referral_date', 'primary_diagnosis', 'total_contacts', 'referral_id'],
+        'csds_contacts': ['patient_id', 'contact_date', 'service_type', 'contact_duration_mins', 'contact_id'],
+    }
+    
     def __init__(self, config: DataGenerationConfig):
         self.config = config
+        self._hrg_tariff = {code: hrg['tariff'] for code, hrg in NHSCodebooks.get_hrg_codes().items()}
+        self._default_tariff = 2000.0
     
     def create_patient_journeys(self, sus_df: pd.DataFrame, ecds_df: pd.DataFrame, 
                                mhsds_df: pd.DataFrame, csds_df: pd.DataFrame) -> pd.DataFrame:
         """Create integrated patient journey dataset"""
-        journeys = []
-        
-        # Get all patients with any activity
-        active_patients = set()
-        active_patients.update(sus_df['patient_id'].dropna())
-        active_patients.update(ecds_df['patient_id'].dropna())
-        active_patients.update(mhsds_df['patient_id'].dropna())
-        active_patients.update(csds_df['patient_id'].dropna())
-        
-        for patient_id in active_patients:
-            # Get all events for this patient
-            patient_events = []
-            
-            # SUS episodes
-            patient_sus = sus_df[sus_df['patient_id'] == patient_id]
-            for _, episode in patient_sus.iterrows():
-                patient_events.append({
-                    'patient_id': patient_id,
-                    'event_date': episode['admission_date'],
-                    'event_type': 'Hospital Admission',
-                    'care_setting': 'Acute',
-                    'primary_code': episode['primary_diagnosis'],
-                    'cost': self.estimate_episode_cost(episode['hrg_code']),
-                    'source_dataset': 'SUS+',
-                    'source_record_id': episode['episode_id']
-                })
-            
-            # ECDS attendances
-            patient_ecds = ecds_df[ecds_df['patient_id'] == patient_id]
-            for _, attendance in patient_ecds.iterrows():
-                patient_events.append({
-                    'patient_id': patient_id,
-                    'event_date': attendance['arrival_datetime'].date(),
-                    'event_type': 'A&E Attendance',
-                    'care_setting': 'Emergency',
-                    'primary_code': attendance['presenting_complaint'],
-                    'cost': 280.0,  # Average A&E tariff
-                    'source_dataset': 'ECDS',
-                    'source_record_id': attendance['attendance_id']
-                })
-            
-            # MHSDS referrals
-            patient_mh = mhsds_df[mhsds_df['patient_id'] == patient_id]
-            for _, referral in patient_mh.iterrows():
-                patient_events.append({
-                    'patient_id': patient_id,
-                    'event_date': referral['referral_date'],
-                    'event_type': 'Mental Health Referral',
-                    'care_setting': 'Mental Health',
-                    'primary_code': referral['primary_diagnosis'],
-                    'cost': referral['total_contacts'] * 180,  # Estimate per contact
-                    'source_dataset': 'MHSDS',
-                    'source_record_id': referral['referral_id']
-                })
-            
-            # CSDS contacts
-            patient_cs = csds_df[csds_df['patient_id'] == patient_id]
-            for _, contact in patient_cs.iterrows():
-                patient_events.append({
-                    'patient_id': patient_id,
-                    'event_date': contact['contact_date'],
-                    'event_type': 'Community Contact',
-                    'care_setting': 'Community',
-                    'primary_code': contact['service_type'],
-                    'cost': contact['contact_duration_mins'] * 2.5,  # £2.50 per minute estimate
-                    'source_dataset': 'CSDS',
-                    'source_record_id': contact['contact_id']
-                })
-            
-            # Sort events by date
-            patient_events.sort(key=lambda x: x['event_date'])
-            
-            # Create journey record
-            if patient_events:
-                total_events = len(patient_events)
-                total_cost = sum(event['cost'] for event in patient_events)
-                care_settings = set(event['care_setting'] for event in patient_events)
-                
-                # Identify care transitions within 30 days
-                transitions = []
-                for i in range(len(patient_events) - 1):
-                    days_diff = (patient_events[i+1]['event_date'] - patient_events[i]['event_date']).days
-                    if days_diff <= 30:
-                        transitions.append(f"{patient_events[i]['care_setting']} -> {patient_events[i+1]['care_setting']}")
-                
-                journeys.append({
-                    'patient_id': patient_id,
-                    'journey_start_date': patient_events[0]['event_date'],
-                    'journey_end_date': patient_events[-1]['event_date'],
-                    'total_events': total_events,
-                    'total_cost': total_cost,
-                    'care_settings_used': ','.join(sorted(care_settings)),
-                    'care_transitions': ','.join(transitions),
-                    'integrated_care_episode': len(care_settings) > 1,
-                    'high_intensity': total_events > 10,
-                    'created_timestamp': datetime.datetime.now()
-                })
-        
-        return pd.DataFrame(journeys)
-    
-    def estimate_episode_cost(self, hrg_code: str) -> float:
-        """Estimate episode cost from HRG code"""
-        hrg_costs = NHSCodebooks.get_hrg_codes()
-        return hrg_costs.get(hrg_code, {'tariff': 2000.0})['tariff']
+        # One column per event attribute across all four datasets (SUS+, ECDS, MHSDS, CSDS order),
+        # instead of a dict per event: patient, date, care setting (index into CARE_SETTINGS) and cost
+        sus_cost = sus_df['hrg_code'].map(self._hrg_tariff).astype(float).fillna(self._default_tariff)
+        sources = [
+            (sus_df, sus_df['admission_date'], 0, sus_cost.to_numpy()),
+            (ecds_df, ecds_df['arrival_datetime'], 2, np.full(len(ecds_df), 280.0)),  # Average A&E tariff
+            (mhsds_df, mhsds_df['referral_date'], 3,
+             mhsds_df['total_contacts'].to_numpy() * 180.0),  # Estimate per contact
+            (csds_df, csds_df['contact_date'], 1,
+             csds_df['contact_duration_mins'].to_numpy() * 2.5),  # £2.50 per minute estimate
+        ]
+        present = [df['patient_id'].notna().to_numpy() for df, _, _, _ in sources]
+        patient_ids = np.concatenate([df['patient_id'].to_numpy(dtype=object)[keep]
+                                      for (df, _, _, _), keep in zip(sources, present)])
+        event_dates = np.concatenate([np.asarray(dates.to_numpy(), dtype='datetime64[D]')[keep]
+                                      for (_, dates, _, _), keep in zip(sources, present)])
+        settings = np.concatenate([np.full(keep.sum(), setting, dtype=np.int8)
+                                   for (_, _, setting, _), keep in zip(sources, present)])
+        costs = np.concatenate([cost[keep] for (_, _, _, cost), keep in zip(sources, present)])
+        
+        # Patients with any activity, numbered in order of first appearance
+        patient_codes, active_patients = pd.factorize(patient_ids)
+        n = len(active_patients)
+        
+        # Each patient's events by date; lexsort is stable, so same-day events keep dataset order
+        order = np.lexsort((event_dates, patient_codes))
+        patient_codes = patient_codes[order]
+        event_dates = event_dates[order]
+        settings = settings[order]
+        total_events = np.bincount(patient_codes, minlength=n)
+        total_cost = np.bincount(patient_codes, weights=costs[order], minlength=n)
+        starts = np.cumsum(total_events) - total_events
+        ends = starts + total_events - 1
+        
+        # Settings used as a 4-bit mask per patient, labelled from a table of sorted names
+        setting_mask = np.zeros(n, dtype=np.int64)
+        np.bitwise_or.at(setting_mask, patient_codes, 1 << settings.astype(np.int64))
+        masks = range(1 << len(self.CARE_SETTINGS))
+        mask_labels = np.array([','.join(name for bit, name in enumerate(self.CARE_SETTINGS) if mask >> bit & 1)
+                                for mask in masks], dtype=object)
+        settings_used = np.array([bin(mask).count('1') for mask in masks])[setting_mask]
+        
+        # Care transitions: consecutive events of the same patient within 30 days
+        is_transition = (patient_codes[1:] == patient_codes[:-1]) & \
+            ((event_dates[1:] - event_dates[:-1]).astype(np.int64) <= 30)
+        transition_idx = np.flatnonzero(is_transition)
+        transition_labels = np.array([f"{a} -> {b}" for a in self.CARE_SETTINGS for b in self.CARE_SETTINGS],
+                                     dtype=object)[settings[transition_idx] * len(self.CARE_SETTINGS)
+                                                   + settings[transition_idx + 1]]
+        transition_bounds = np.searchsorted(transition_idx, starts)
+        transitions = [','.join(group) for group in np.split(transition_labels, transition_bounds[1:])] if n else []
+        
+        return pd.DataFrame({
+            'patient_id': active_patients,
+            'journey_start_date': event_dates[starts].astype(object),
+            'journey_end_date': event_dates[ends].astype(object),
+            'total_events': total_events,
+            'total_cost': total_cost,
+            'care_settings_used': mask_labels[setting_mask],
+            'care_transitions': transitions,
+            'integrated_care_episode': settings_used > 1,
+            'high_intensity': total_events > 10,
+            'created_timestamp': np.datetime64(datetime.datetime.now(), 'ns')
+        })
 
 class DataQualitySimulator:
     """Simulates realistic data quality issues"""
     
-    @staticmethod
-    def apply_missing_data(df: pd.DataFrame, columns: List[str], missing_rate: float = 0.1) -> pd.DataFrame:
-        """Apply missing data patterns"""
-        df_copy = df.copy()
-        
-        for col in columns:
-            if col in df_copy.columns:
-                mask = np.random.random(len(df_copy)) < missing_rate
-                df_copy.loc[mask, col] = None
+    def __init__(self, rng: Optional[np.random.Generator] = None):
+        # The suite hands each dataset its own seeded generator, so a seeded run is reproducible end to end
+        self.rng = rng if rng is not None else np.random.default_rng()
+    
+    def apply_quality(self, df: pd.DataFrame, missing_columns: List[str] = (), missing_rate: float = 0.1,
+                      date_inconsistencies: bool = False) -> pd.DataFrame:
+        """Apply missing data and date logic errors to one frame in a single pass"""
+        # Every changed column is computed from the input and then set on one shallow copy,
+        # so the frame is materialised once however many issues are applied
+        updates = {}
+        n = len(df)
+        
+        # One draw per row for every issue, in a single row-major block, so applying this to
+        # consecutive chunks of a table draws exactly what applying it to the whole table would
+        present = [col for col in missing_columns if col in df.columns]
+        dates = date_inconsistencies and 'admission_date' in df.columns and 'discharge_date' in df.columns
+        draws = self.rng.random((n, len(present) + dates))
+        
+        # Missing data
+        for j, col in enumerate(present):
+            updates[col] = df[col].mask(draws[:, j] < missing_rate, None)
         
+        # SUS data: discharge before admission
+        if dates:
+            error_mask = draws[:, -1] < 0.005  # 0.5% error rate
+            
+            # Day arithmetic on the selected rows only, rather than per-object date - Timedelta
+            discharge = updates.get('discharge_date', df['discharge_date']).to_numpy(dtype=object, copy=True)
+            admission = df['admission_date'].to_numpy()[error_mask].astype('datetime64[D]')
+            discharge[error_mask] = (admission - np.timedelta64(1, 'D')).astype(object)
+            updates['discharge_date'] = discharge
+        
+        df_copy = df.copy(deep=False)
+        for col, values in updates.items():
+            df_copy[col] = values
         return df_copy
     
-    @staticmethod
-    def apply_duplicates(df: pd.DataFrame, duplicate_rate: float = 0.05) -> pd.DataFrame:
+    def apply_missing_data(self, df: pd.DataFrame, columns: List[str], missing_rate: float = 0.1) -> pd.DataFrame:
+        """Apply missing data patterns (one mask draw for all columns)"""
+        return self.apply_quality(df, missing_columns=columns, missing_rate=missing_rate)
+    
+    def apply_duplicates(self, df: pd.DataFrame, duplicate_rate: float = 0.05) -> pd.DataFrame:
         """Create duplicate records"""
-        num_duplicates = int(len(df) * duplicate_rate)
+        n = len(df)
+        num_duplicates = int(n * duplicate_rate)
         if num_duplicates > 0:
-            duplicate_indices = np.random.choice(df.index, size=num_duplicates, replace=False)
-            duplicates = df.loc[duplicate_indices].copy()
+            duplicate_positions = self.rng.choice(n, size=num_duplicates, replace=False)
+            
+            # Originals followed by duplicates in a single gather
+            df_out = df.take(np.concatenate([np.arange(n), duplicate_positions]))
+            df_out.reset_index(drop=True, inplace=True)
             
             # Slightly modify duplicates to simulate data entry variations
             for col in ['postcode', 'nhs_number']:
-                if col in duplicates.columns:
-                    duplicates[col] = duplicates[col].apply(
-                        lambda x: x + 'X' if isinstance(x, str) and random.random() < 0.5 else x
-                    )
+                if col in df_out.columns:
+                    values = df_out[col].to_numpy(dtype=object, copy=True)
+                    duplicates = values[n:]
+                    mask = (self.rng.random(num_duplicates) < 0.5) & pd.notna(duplicates)
+                    duplicates[mask] = duplicates[mask] + 'X'
+                    df_out[col] = values
             
-            return pd.concat([df, duplicates], ignore_index=True)
+            return df_out
         return df
-    
-    @staticmethod
-    def apply_date_inconsistencies(df: pd.DataFrame) -> pd.DataFrame:
-        """Create date logic errors"""
-        df_copy = df.copy()
-        
-        # SUS data: discharge before admission
-        if 'admission_date' in df_copy.columns and 'discharge_date' in df_copy.columns:
-            error_mask = np.random.random(len(df_copy)) < 0.005  # 0.5% error rate
-            df_copy.loc[error_mask, 'discharge_date'] = df_copy.loc[error_mask, 'admission_date'] - pd.Timedelta(days=1)
-        
-        return df_copy
 
 class PseudonymisationEngine:
     """Implements NHS-compliant pseudonymisation"""
     
     def __init__(self, salt: str = "NHS_SALT_2025"):
         self.salt = salt
+        self._salt_suffix = f"_{salt}".encode()
+        # Pseudonyms are shared across datasets, so each patient is hashed once per run
+        self._pseudonym_cache: Dict[str, str] = {}
     
-    def pseudonymise_nhs_number(self, nhs_number: str) -> str:
-        """Create pseudonymised NHS number"""
-        if pd.isna(nhs_number) or nhs_number == 'INVALID':
-            return nhs_number
-        
-        # SHA-256 hash with salt
-        combined = f"{nhs_number}_{self.salt}"
-        hash_object = hashlib.sha256(combined.encode())
-        return f"PSEUDO_{hash_object.hexdigest()[:16].upper()}"
+    def pseudonymise_nhs_numbers(self, nhs_numbers: pd.Series) -> np.ndarray:
+        """Pseudonymise a column of NHS numbers, hashing each distinct number once"""
+        codes, uniques = pd.factorize(nhs_numbers)
+        
+        # hashlib.sha256 is OpenSSL's implementation (SHA extensions where the CPU has them)
+        sha256 = hashlib.sha256
+        salt_suffix = self._salt_suffix
+        cache = self._pseudonym_cache
+        pseudo = np.empty(len(uniques), dtype=object)
+        for i, nhs_number in enumerate(uniques.tolist()):
+            pseudo_number = cache.get(nhs_number)
+            if pseudo_number is None:
+                if nhs_number == 'INVALID':
+                    pseudo_number = nhs_number
+                else:
+                    pseudo_number = 'PSEUDO_' + sha256(str(nhs_number).encode() + salt_suffix).digest()[:8].hex().upper()
+                cache[nhs_number] = pseudo_number
+            pseudo[i] = pseudo_number
+        
+        # Missing numbers (code -1) pass through unchanged
+        result = nhs_numbers.to_numpy(dtype=object, copy=True)
+        present = codes >= 0
+        result[present] = pseudo[codes[present]]
+        return result
     
     def pseudonymise_dataset(self, df: pd.DataFrame) -> pd.DataFrame:
         """Apply pseudonymisation to dataset"""
         df_pseudo = df.copy()
         
         if 'nhs_number' in df_pseudo.columns:
-            df_pseudo['nhs_number'] = df_pseudo['nhs_number'].apply(self.pseudonymise_nhs_number)
+            df_pseudo['nhs_number'] = self.pseudonymise_nhs_numbers(df_pseudo['nhs_number'])
         
         # Remove direct identifiers
         identifiers_to_remove = ['patient_name', 'address', 'phone_number', 'email']
@@ -1307,75 +1454,114 @@ class PseudonymisationEngine:
         
         return df_pseudo
 
+# Clinical generators shared by the dataset workers, set once per process
+_dataset_generators = None
+
+def _init_dataset_worker(generators):
+    global _dataset_generators
+    _dataset_generators = generators
+
+def _run_dataset_generator(name: str) -> pd.DataFrame:
+    generator, method = _dataset_generators[name]
+    return getattr(generator, method)()
+
 class NHSDataGeneratorSuite:
     """Main class orchestrating all data generation"""
     
+    # Rows per Parquet row group when saving
+    PARQUET_BATCH_ROWS = 65536
+    # Event tables written as Hive-partitioned datasets: name -> (date column the year comes from, partition columns).
+    # Consumers load <name>/ as a dataset (year=YYYY/trust_code=XXX/*.parquet) after the reference
+    # tables (patients, trusts, practices), which stay single <name>.parquet files.
+    PARTITIONED_DATASETS = {
+        'sus_episodes': ('admission_date', ['year', 'trust_code']),
+        'ecds_attendances': ('arrival_datetime', ['year', 'trust_code']),
+        'prescriptions': ('prescription_date', ['year']),
+    }
+    # Clinical datasets that can be generated a chunk at a time: name -> generator method yielding the chunks.
+    # When saving as it goes, the suite runs these in the parent process and finishes and saves each chunk
+    # in turn, so the whole table is never held at once
+    CHUNKED_GENERATORS = {
+        'sus_episodes': 'iter_episode_shards',
+        'prescriptions': 'iter_prescription_chunks',
+    }
+    # Progress line printed as each clinical dataset is reached
+    GENERATING_MESSAGES = {
+        'sus_episodes': "🚑 Generating SUS+ hospital episodes...",
+        'ecds_attendances': "🚨 Generating ECDS A&E attendances...",
+        'mhsds_referrals': "🧠 Generating MHSDS mental health data...",
+        'csds_contacts': "🏠 Generating CSDS community services...",
+        'prescriptions': "💊 Generating prescribing data...",
+        'social_care': "👥 Generating social care data...",
+    }
+    # Rows sampled per object column when estimating report memory usage
+    MEMORY_SAMPLE_ROWS = 1024
+    
     def __init__(self, config: DataGenerationConfig = None):
         self.config = config or DataGenerationConfig()
         self.pseudo_engine = PseudonymisationEngine()
-        self.output_dir = "nhs_synthetic_data"
+        # One child seed per dataset for its quality issues, so each is drawn the same whether the datasets
+        # are kept and finished together or finished one at a time (and chunk by chunk) as they are saved
+        names = ['patients', 'trusts', 'practices', *self.GENERATING_MESSAGES, 'patient_journeys']
+        self.quality_seeds = dict(zip(names, np.random.SeedSequence(self.config.seed).spawn(len(names))))
+        # Arrow schemas inferred on first save, keyed by dataset name, columns and dtypes
+        self._schemas: Dict[Tuple, pa.Schema] = {}
+        # Schema each partitioned dataset's first chunk was written with, which later chunks are cast to
+        self._dataset_schemas: Dict[str, pa.Schema] = {}
+        # A Path, so files are joined with / and pyarrow opens them on the local filesystem directly
+        self.output_dir = pathlib.Path("nhs_synthetic_data")
         
         # Create output directory
-        os.makedirs(self.output_dir, exist_ok=True)
+        self.output_dir.mkdir(parents=True, exist_ok=True)
     
     def generate_all_datasets(self, apply_quality_issues: bool = True, 
-                            apply_pseudonymisation: bool = True) -> Dict[str, pd.DataFrame]:
-        """Generate complete suite of NHS datasets"""
+                            apply_pseudonymisation: bool = True,
+                            save_csv: bool = True, keep_datasets: bool = True) -> Dict[str, pd.DataFrame]:
+        """Generate complete suite of NHS datasets
+        
+        CSV copies are written next to the Parquet files, as they always have been; save_csv=False writes
+        Parquet only. With keep_datasets=False each dataset is saved and released as soon as it is finished, and the
+        returned dict is empty. The tables in CHUNKED_GENERATORS go through quality issues,
+        pseudonymisation and the partitioned writer one chunk at a time. Peak memory is then roughly the
+        largest other table with workers=1; with more workers, up to one finished clinical table or chunk
+        per worker can wait alongside the one being saved.
+        """
         print("🏥 Starting NHS Data Generation Suite...")
         
-        # Step 1: Generate foundational data
-        print("📊 Generating patient population...")
-        patient_gen = PatientGenerator(self.config)
-        patients_df = patient_gen.generate_patients()
-        
-        print("🏢 Generating provider organizations...")
-        provider_gen = ProviderGenerator(self.config)
-        trusts_df = provider_gen.generate_trusts()
-        practices_df = provider_gen.generate_practices()
-        
-        # Step 2: Generate clinical datasets
-        print("🚑 Generating SUS+ hospital episodes...")
-        sus_gen = SUSPlusGenerator(patients_df, trusts_df, self.config)
-        sus_df = sus_gen.generate_episodes()
-        
-        print("🚨 Generating ECDS A&E attendances...")
-        ecds_gen = ECDSGenerator(patients_df, trusts_df, self.config)
-        ecds_df = ecds_gen.generate_attendances()
-        
-        print("🧠 Generating MHSDS mental health data...")
-        mhsds_gen = MHSDSGenerator(patients_df, self.config)
-        mhsds_df = mhsds_gen.generate_referrals()
-        
-        print("🏠 Generating CSDS community services...")
-        csds_gen = CSSDSGenerator(patients_df, self.config)
-        csds_df = csds_gen.generate_contacts()
-        
-        print("💊 Generating prescribing data...")
-        prescribing_gen = PrescribingGenerator(patients_df, practices_df, self.config)
-        prescribing_df = prescribing_gen.generate_prescriptions()
+        # Steps 1-3: Generate foundational data, clinical datasets and patient journeys
+        raw_datasets = self.iter_raw_datasets(chunked=not keep_datasets)
+        
+        if not keep_datasets:
+            print("💾 Processing and saving datasets one at a time...")
+            quality_sims = {}
+            dataset_summary = {}
+            for name, df in raw_datasets:
+                # A chunked table's chunks carry on drawing from the simulator its first chunk used
+                if name not in quality_sims:
+                    quality_sims[name] = self.quality_simulator(name)
+                df = self.finish_dataset(name, df, quality_sims[name], apply_quality_issues, apply_pseudonymisation)
+                # Later chunks of a chunked table are added to the dataset its first chunk started
+                summary = self.summarise_dataset(df)
+                first_chunk = name not in dataset_summary
+                self.save_dataset(name, df, save_csv=save_csv, append=not first_chunk)
+                if not first_chunk:
+                    summary['record_count'] += dataset_summary[name]['record_count']
+                    summary['memory_usage_mb'] = round(summary['memory_usage_mb']
+                                                       + dataset_summary[name]['memory_usage_mb'], 2)
+                dataset_summary[name] = summary
+                print(f"   ✓ Saved {name}: {summary['record_count']:,} records")
+                
+                # Hand the frame's memory back before the next dataset is built
+                del df
+                gc.collect()
+                pa.default_memory_pool().release_unused()
+            
+            self.generate_summary_report({}, dataset_summary)
+            print("✅ NHS Data Generation Suite completed!")
+            print(f"📁 Data saved to: {self.output_dir}")
+            return {}
         
-        print("👥 Generating social care data...")
-        social_care_gen = SocialCareGenerator(patients_df, self.config)
-        social_care_df = social_care_gen.generate_care_packages()
-        
-        # Step 3: Create patient journeys
-        print("🔗 Creating integrated patient journeys...")
-        linker = DatasetLinker(self.config)
-        journeys_df = linker.create_patient_journeys(sus_df, ecds_df, mhsds_df, csds_df)
-        
-        # Compile all datasets
-        datasets = {
-            'patients': patients_df,
-            'trusts': trusts_df,
-            'practices': practices_df,
-            'sus_episodes': sus_df,
-            'ecds_attendances': ecds_df,
-            'mhsds_referrals': mhsds_df,
-            'csds_contacts': csds_df,
-            'prescriptions': prescribing_df,
-            'social_care': social_care_df,
-            'patient_journeys': journeys_df
-        }
+        datasets = dict(raw_datasets)
         
         # Step 4: Apply data quality issues
         if apply_quality_issues:
@@ -1387,11 +1573,14 @@ class NHSDataGeneratorSuite:
             print("🔒 Applying NHS-compliant pseudonymisation...")
             datasets = self.apply_pseudonymisation(datasets)
         
-        # Step 6: Save datasets
+        # Step 6: Move string and date columns onto Arrow buffers so Parquet writes hand them over without copying
+        datasets = {name: self.to_arrow_backed(df) for name, df in datasets.items()}
+        
+        # Step 7: Save datasets
         print("💾 Saving datasets to files...")
-        self.save_datasets(datasets)
+        self.save_datasets(datasets, save_csv=save_csv)
         
-        # Step 7: Generate summary report
+        # Step 8: Generate summary report
         self.generate_summary_report(datasets)
         
         print("✅ NHS Data Generation Suite completed!")
@@ -1399,54 +1588,310 @@ class NHSDataGeneratorSuite:
         
         return datasets
     
-    def apply_data_quality_issues(self, datasets: Dict[str, pd.DataFrame]) -> Dict[str, pd.DataFrame]:
-        """Apply realistic data quality issues across datasets"""
-        quality_sim = DataQualitySimulator()
+    def iter_raw_datasets(self, chunked: bool = False) -> Iterator[Tuple[str, pd.DataFrame]]:
+        """Yield each generated dataset in turn, before quality issues and pseudonymisation
         
-        # Apply missing data
-        datasets['sus_episodes'] = quality_sim.apply_missing_data(
-            datasets['sus_episodes'], 
-            ['secondary_diagnoses', 'secondary_procedures', 'ward_code'],
-            missing_rate=0.15
-        )
+        With chunked=True the tables in CHUNKED_GENERATORS come as a run of chunks under the same name.
+        """
+        # Step 1: Generate foundational data
+        print("📊 Generating patient population...")
+        patient_gen = PatientGenerator(self.config)
+        patients_df = patient_gen.generate_patients()
         
-        datasets['ecds_attendances'] = quality_sim.apply_missing_data(
-            datasets['ecds_attendances'],
-            ['investigations', 'referred_to_specialist'],
-            missing_rate=0.12
-        )
+        print("🏢 Generating provider organizations...")
+        provider_gen = ProviderGenerator(self.config)
+        trusts_df = provider_gen.generate_trusts()
+        practices_df = provider_gen.generate_practices()
         
-        # Apply duplicates
-        datasets['patients'] = quality_sim.apply_duplicates(datasets['patients'], duplicate_rate=0.08)
+        # Callers never modify the frames they are handed, so the clinical generators can keep using these
+        yield 'patients', patients_df
+        yield 'trusts', trusts_df
+        yield 'practices', practices_df
         
-        # Apply date inconsistencies
-        datasets['sus_episodes'] = quality_sim.apply_date_inconsistencies(datasets['sus_episodes'])
+        # Step 2: Generate clinical datasets (independent of each other, so run side by side when possible).
+        # Only the columns the linker needs are kept back once a dataset has been handed on
+        link_frames = {name: [] for name in DatasetLinker.LINK_COLUMNS}
+        for name, df in self.iter_clinical_datasets(patients_df, trusts_df, practices_df, chunked=chunked):
+            if name in DatasetLinker.LINK_COLUMNS:
+                link_frames[name].append(df[DatasetLinker.LINK_COLUMNS[name]])
+            yield name, df
+            del df
         
-        return datasets
+        # Step 3: Create patient journeys
+        print("🔗 Creating integrated patient journeys...")
+        linker = DatasetLinker(self.config)
+        link_frames = {name: pd.concat(frames, ignore_index=True) if len(frames) > 1 else frames[0]
+                       for name, frames in link_frames.items()}
+        yield 'patient_journeys', linker.create_patient_journeys(
+            link_frames['sus_episodes'], link_frames['ecds_attendances'],
+            link_frames['mhsds_referrals'], link_frames['csds_contacts'])
     
-    def apply_pseudonymisation(self, datasets: Dict[str, pd.DataFrame]) -> Dict[str, pd.DataFrame]:
-        """Apply pseudonymisation to all datasets"""
-        pseudonymised_datasets = {}
+    def finish_dataset(self, name: str, df: pd.DataFrame, quality_sim: DataQualitySimulator,
+                       apply_quality_issues: bool = True, apply_pseudonymisation: bool = True) -> pd.DataFrame:
+        """Apply quality issues, pseudonymisation and Arrow dtypes to one dataset"""
+        if apply_quality_issues:
+            df = self.apply_dataset_quality_issues(name, df, quality_sim)
+        if apply_pseudonymisation:
+            df = self.pseudo_engine.pseudonymise_dataset(df)
+        return self.to_arrow_backed(df)
+    
+    def iter_clinical_datasets(self, patients_df: pd.DataFrame, trusts_df: pd.DataFrame, practices_df: pd.DataFrame,
+                               chunked: bool = False) -> Iterator[Tuple[str, pd.DataFrame]]:
+        """Yield the six clinical datasets in order as their generators finish
+        
+        With chunked=True the tables in CHUNKED_GENERATORS are generated here, one chunk at a time, and
+        yielded as a run of chunks under the same name; the others still go to the worker pool.
+        """
+        generators = {
+            'sus_episodes': (SUSPlusGenerator(patients_df, trusts_df, self.config), 'generate_parallel'),
+            'ecds_attendances': (ECDSGenerator(patients_df, trusts_df, self.config), 'generate_attendances'),
+            'mhsds_referrals': (MHSDSGenerator(patients_df, self.config), 'generate_referrals'),
+            'csds_contacts': (CSSDSGenerator(patients_df, self.config), 'generate_contacts'),
+            'prescriptions': (PrescribingGenerator(patients_df, practices_df, self.config), 'generate_prescriptions'),
+            'social_care': (SocialCareGenerator(patients_df, self.config), 'generate_care_packages')
+        }
         
-        for name, df in datasets.items():
-            pseudonymised_datasets[name] = self.pseudo_engine.pseudonymise_dataset(df)
+        chunked_names = set(self.CHUNKED_GENERATORS) if chunked else set()
+        for name in chunked_names:
+            generators[name] = (generators[name][0], self.CHUNKED_GENERATORS[name])
+        _init_dataset_worker(generators)
+        try:
+            # Forked workers inherit the generators (and the shared patient/provider frames) instead of pickling them;
+            # SUS+ is submitted first as the largest, and still shards its own episodes inside its worker (or here,
+            # when chunked). Every generator draws from its own seeded rng, so results do not depend on the worker count
+            pooled = [name for name in generators if name not in chunked_names]
+            workers = min(self.config.workers, len(pooled))
+            if workers < 2 or 'fork' not in mp.get_all_start_methods():
+                pooled, workers = [], 0
+            
+            with (ProcessPoolExecutor(max_workers=workers, mp_context=mp.get_context('fork'),
+                                      initializer=_init_dataset_worker, initargs=(generators,))
+                  if pooled else contextlib.nullcontext()) as pool:
+                # Only one generator per worker is in flight, topped up as each result is handed on, so
+                # finished tables cannot pile up in the parent while the caller is still saving earlier ones
+                queued = iter(pooled)
+                pending = {name: pool.submit(_run_dataset_generator, name) for name in itertools.islice(queued, workers)}
+                for name in generators:
+                    print(self.GENERATING_MESSAGES[name])
+                    if name in pending:
+                        df = pending.pop(name).result()
+                        for next_name in itertools.islice(queued, 1):
+                            pending[next_name] = pool.submit(_run_dataset_generator, next_name)
+                        yield name, df
+                        del df
+                    elif name in chunked_names:
+                        for chunk in _run_dataset_generator(name):
+                            yield name, chunk
+                            del chunk
+                    else:
+                        yield name, _run_dataset_generator(name)
+        finally:
+            # The parent's copy would otherwise keep every generator and its frames alive after the run
+            _init_dataset_worker(None)
+    
+    def apply_data_quality_issues(self, datasets: Dict[str, pd.DataFrame]) -> Dict[str, pd.DataFrame]:
+        """Apply realistic data quality issues across datasets"""
+        return {name: self.apply_dataset_quality_issues(name, df, self.quality_simulator(name))
+                for name, df in datasets.items()}
+    
+    def quality_simulator(self, name: str) -> DataQualitySimulator:
+        """A fresh simulator on the dataset's own seed"""
+        return DataQualitySimulator(rng=np.random.default_rng(self.quality_seeds[name]))
+    
+    def apply_dataset_quality_issues(self, name: str, df: pd.DataFrame,
+                                     quality_sim: DataQualitySimulator) -> pd.DataFrame:
+        """Apply the data quality issues for one dataset"""
+        if name == 'patients':
+            # Apply duplicates
+            df = quality_sim.apply_duplicates(df, duplicate_rate=0.08)
+        
+        elif name == 'sus_episodes':
+            # Apply missing data and date inconsistencies in one pass
+            df = quality_sim.apply_quality(
+                df,
+                ['secondary_diagnoses', 'secondary_procedures', 'ward_code'],
+                missing_rate=0.15,
+                date_inconsistencies=True
+            )
+        
+        elif name == 'ecds_attendances':
+            df = quality_sim.apply_missing_data(
+                df,
+                ['investigations', 'referred_to_specialist'],
+                missing_rate=0.12
+            )
         
-        return pseudonymised_datasets
+        return df
     
-    def save_datasets(self, datasets: Dict[str, pd.DataFrame]):
-        """Save all datasets to files"""
-        for name, df in datasets.items():
-            # Save as both CSV and Parquet
-            csv_path = os.path.join(self.output_dir, f"{name}.csv")
-            parquet_path = os.path.join(self.output_dir, f"{name}.parquet")
-            
-            df.to_csv(csv_path, index=False)
-            df.to_parquet(parquet_path, index=False)
-            
-            print(f"   ✓ Saved {name}: {len(df):,} records")
+    def apply_pseudonymisation(self, datasets: Dict[str, pd.DataFrame]) -> Dict[str, pd.DataFrame]:
+        """Apply pseudonymisation to all datasets"""
+        # One thread per dataset, as the copies, regex extraction and OpenSSL hashing can overlap.
+        # The engine is stateless apart from its pseudonym cache, where a race only means a
+        # number is hashed twice to the same value
+        with ThreadPoolExecutor(max_workers=max(1, min(len(datasets), self.config.workers))) as pool:
+            return dict(zip(datasets, pool.map(self.pseudo_engine.pseudonymise_dataset, datasets.values())))
+    
+    def save_datasets(self, datasets: Dict[str, pd.DataFrame], save_csv: bool = False,
+                      parquet_compression: str = "zstd"):
+        """Save all datasets to files
+        
+        Parquet is always written; its row-group statistics let downstream readers skip data the CSV
+        copies cannot, so CSV is only written when asked for (e.g. for flat-file loads).
+        """
+        # One thread per dataset: the frames are shared rather than copied, and the
+        # Arrow/CSV encoders and file writes overlap across datasets
+        with ThreadPoolExecutor(max_workers=max(1, min(len(datasets), self.config.workers))) as pool:
+            saved = pool.map(lambda item: self.save_dataset(*item, save_csv, parquet_compression), datasets.items())
+            for name, records in saved:
+                print(f"   ✓ Saved {name}: {records:,} records")
+    
+    def to_arrow_backed(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Convert object and timestamp columns to Arrow-backed dtypes"""
+        # Integer, float and bool columns keep their numpy dtypes (already zero-copy into Arrow, and
+        # NaN stays NaN) and categoricals become Arrow dictionaries on write, so only object and
+        # timestamp columns move
+        df = df.convert_dtypes(dtype_backend="pyarrow", convert_integer=False,
+                               convert_floating=False, convert_boolean=False)
+        
+        # convert_dtypes leaves datetime.date columns as objects; Arrow infers date32 for them
+        for column in df.columns[df.dtypes == object]:
+            df[column] = pd.arrays.ArrowExtensionArray(pa.array(df[column].to_numpy(), from_pandas=True))
+        return df
+    
+    def downcast_integers(self, table: pa.Table) -> pa.Table:
+        """Store int64 columns whose values fit in int32 as int32"""
+        # Always int32 rather than the narrowest fit, so a dataset's schema doesn't change from run to run.
+        # Floats stay float64: they carry costs, where float32 would lose pence
+        int32 = np.iinfo(np.int32)
+        fields = []
+        for field, column in zip(table.schema, table.columns):
+            if pa.types.is_int64(field.type):
+                bounds = pc.min_max(column)
+                if bounds['min'].as_py() is None or \
+                        (int32.min <= bounds['min'].as_py() and bounds['max'].as_py() <= int32.max):
+                    field = field.with_type(pa.int32())
+            fields.append(field)
+        return table.cast(pa.schema(fields, metadata=table.schema.metadata))
     
-    def generate_summary_report(self, datasets: Dict[str, pd.DataFrame]):
-        """Generate data generation summary report"""
+    def csv_text(self, column: pa.Array) -> pa.Array:
+        """One column's CSV fields as DataFrame.to_csv writes them, empty for missing values"""
+        if pa.types.is_boolean(column.type):
+            text = pc.if_else(column, 'True', 'False')
+        elif pa.types.is_timestamp(column.type):
+            # Timestamps print like str(pd.Timestamp): fractional digits only when there are any,
+            # six unless the nanoseconds are set
+            text = pc.strftime(column, format='%Y-%m-%d %H:%M:%S')
+            text = pc.replace_substring_regex(text, r'(\.\d{6})000$', r'\1')
+            text = pc.replace_substring_regex(text, r'\.0{6}$', '')
+        elif pa.types.is_floating(column.type):
+            # Python's float repr (1.0, 1e-05), which Arrow's shortest form (1, 0.00001) does not follow
+            text = pa.array(column.to_numpy(zero_copy_only=False).astype(str),
+                            mask=column.is_null().to_numpy(zero_copy_only=False))
+        else:
+            text = column.cast(pa.string())
+        if pa.types.is_string(text.type):
+            # Quote only fields holding a delimiter, quote or line break, doubling inner quotes
+            needs_quotes = pc.match_substring_regex(text, r'[,"\r\n]')
+            quoted = pc.binary_join_element_wise('"', pc.replace_substring(text, '"', '""'), '"', '')
+            text = pc.if_else(needs_quotes, quoted, text)
+        return text.fill_null('')
+    
+    def csv_rows(self, columns: List[pa.Array]) -> pa.Buffer:
+        """CSV text for whole columns at once: fields joined per row, rows joined into one buffer"""
+        rows = pc.binary_join_element_wise(*(self.csv_text(column) for column in columns), ',')
+        rows = pc.binary_join_element_wise(rows, '', '\n')
+        return pc.binary_join(pa.ListArray.from_arrays([0, len(rows)], rows), '')[0].as_buffer()
+    
+    def save_dataset(self, name: str, df: pd.DataFrame, save_csv: bool = False,
+                     parquet_compression: str = "zstd", append: bool = False) -> Tuple[str, int]:
+        """Save one dataset as Parquet (and optionally CSV); returns (name, records)
+        
+        With append=True the frame is another chunk of a partitioned dataset and is added to its files.
+        """
+        if append and name not in self.PARTITIONED_DATASETS:
+            raise ValueError(f"{name} is saved as a single file and cannot be appended to")
+        # Reuse the schema inferred last time this dataset was saved with the same columns and dtypes.
+        # The key holds the dtype objects themselves, so categoricals only match on the same categories;
+        # object columns are inferred from their values, so frames with any are never cached.
+        schema_key = None
+        if not any(dtype == object for dtype in df.dtypes):
+            schema_key = (name, tuple(df.columns), tuple(df.dtypes))
+        table = pa.Table.from_pandas(df, schema=self._schemas.get(schema_key), preserve_index=False)
+        if schema_key is not None:
+            self._schemas.setdefault(schema_key, table.schema)
+        table = self.downcast_integers(table)
+        if append:
+            # A chunk's own values could infer other types (int64 where the first chunk fitted int32, say),
+            # leaving part files and CSV rows that disagree; casting raises if the values don't fit
+            table = table.cast(self._dataset_schemas[name])
+        elif name in self.PARTITIONED_DATASETS:
+            self._dataset_schemas[name] = table.schema
+        parquet_options = dict(compression=parquet_compression,
+                               compression_level=3 if parquet_compression == "zstd" else None,
+                               use_dictionary=True, write_statistics=True, data_page_size=1 << 20)
+        
+        if name in self.PARTITIONED_DATASETS:
+            # Hive layout so year/trust filtered reads skip whole directories, and partitions are written in parallel
+            date_column, partition_cols = self.PARTITIONED_DATASETS[name]
+            partitioned = table.append_column('year', pc.year(table.column(date_column)))
+            # Replace the whole dataset so partitions from an earlier, longer run don't linger, and drop
+            # the single-file copy earlier versions wrote so readers can't pick up stale rows
+            dataset_dir = self.output_dir / name
+            if not append:
+                shutil.rmtree(dataset_dir, ignore_errors=True)
+                (self.output_dir / f"{name}.parquet").unlink(missing_ok=True)
+            # Every call writes new uniquely named files, so chunks sit side by side in each partition
+            pq.write_to_dataset(partitioned, dataset_dir, partition_cols=partition_cols, use_threads=True,
+                                min_rows_per_group=self.PARQUET_BATCH_ROWS, max_rows_per_group=self.PARQUET_BATCH_ROWS,
+                                **parquet_options)
+        else:
+            # Stream 64k-row batches (one row group each) through a single writer with dictionary
+            # encoding and column statistics on, rather than one monolithic to_parquet call
+            parquet_path = self.output_dir / f"{name}.parquet"
+            with pq.ParquetWriter(parquet_path, table.schema, **parquet_options) as writer:
+                for batch in table.to_batches(max_chunksize=self.PARQUET_BATCH_ROWS):
+                    writer.write_batch(batch)
+        
+        if save_csv:
+            # Formatted from the already converted table with Arrow kernels, 64k rows at a time, in the
+            # text DataFrame.to_csv wrote (Arrow's own CSV writer quotes every string and prints
+            # true/false). Later chunks are appended without a header
+            with open(self.output_dir / f"{name}.csv", 'ab' if append else 'wb') as csv_file:
+                if not append:
+                    csv_file.write(self.csv_rows([pa.array([column]) for column in table.column_names]))
+                for batch in table.to_batches(max_chunksize=self.PARQUET_BATCH_ROWS):
+                    csv_file.write(self.csv_rows(batch.columns))
+        
+        return name, len(df)
+    
+    def estimate_memory_bytes(self, df: pd.DataFrame) -> int:
+        """Estimate in-memory size without walking every object in the frame"""
+        # Shallow usage is exact for numeric, datetime and categorical columns
+        # and counts the pointers of object columns
+        total = int(df.memory_usage(deep=False).sum())
+        n = len(df)
+        if n == 0:
+            return total
+        
+        # Extrapolate the Python objects behind each object column from an evenly spaced sample
+        step = max(1, n // self.MEMORY_SAMPLE_ROWS)
+        getsizeof = sys.getsizeof
+        for column in df.columns[df.dtypes == object]:
+            sample = df[column].to_numpy()[::step]
+            total += int(sum(map(getsizeof, sample)) / len(sample) * n)
+        return total
+    
+    def summarise_dataset(self, df: pd.DataFrame) -> Dict:
+        """Summary report entry for one dataset"""
+        return {
+            "record_count": len(df),
+            "columns": list(df.columns),
+            "memory_usage_mb": round(self.estimate_memory_bytes(df) / 1024 / 1024, 2)
+        }
+    
+    def generate_summary_report(self, datasets: Dict[str, pd.DataFrame],
+                                dataset_summary: Optional[Dict[str, Dict]] = None):
+        """Generate data generation summary report (from summaries taken earlier when given)"""
         report = {
             "generation_timestamp": datetime.datetime.now().isoformat(),
             "configuration": {
@@ -1455,20 +1900,16 @@ class NHSDataGeneratorSuite:
                 "trusts": self.config.trusts,
                 "practices": self.config.practices
             },
-            "dataset_summary": {}
-        }
-        
-        for name, df in datasets.items():
-            report["dataset_summary"][name] = {
-                "record_count": len(df),
-                "columns": list(df.columns),
-                "memory_usage_mb": round(df.memory_usage(deep=True).sum() / 1024 / 1024, 2)
+            "memory_estimator": f"shallow + object sizes sampled from {self.MEMORY_SAMPLE_ROWS} rows",
+            "dataset_summary": dataset_summary if dataset_summary is not None else {
+                name: self.summarise_dataset(df) for name, df in datasets.items()
             }
+        }
         
         # Save report
-        report_path = os.path.join(self.output_dir, "generation_report.json")
-        with open(report_path, 'w') as f:
-            json.dump(report, f, indent=2)
+        report_path = self.output_dir / "generation_report.json"
+        with open(report_path, 'wb') as f:
+            f.write(orjson.dumps(report, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY))
         
         print(f"📋 Generation report saved to: {report_path}")
 
@@ -1489,7 +1930,8 @@ if __name__ == "__main__":
     generator = NHSDataGeneratorSuite(config)
     datasets = generator.generate_all_datasets(
         apply_quality_issues=True,
-        apply_pseudonymisation=True
+        apply_pseudonymisation=True,
+        save_csv=True  # CSV copies feed the flat-file loads into the source databases
     )
     
     # Display summary statistics
@@ -1502,10 +1944,9 @@ if __name__ == "__main__":
     print(f"📅 Data period: {config.start_date} to {config.start_date + timedelta(days=365*config.years_of_data)}")
     print(f"💾 Data saved to: {generator.output_dir}")
     
-    # Example: Show patient journey for high-activity patients
-    high_activity_journeys = datasets['patient_journeys'][
-        datasets['patient_journeys']['total_events'] > 5
-    ].head()
+    # Example: Show patient journey for high-activity patients (top five by events, via a partial sort)
+    high_activity_journeys = datasets['patient_journeys'].nlargest(5, 'total_events')
+    high_activity_journeys = high_activity_journeys[high_activity_journeys['total_events'] > 5]
     
     if not high_activity_journeys.empty:
         print(f"\n🔄 Example High-Activity Patient Journeys:")
@@ -8,7 +8,7 @@ processing by Azure Data Factory (ADF).
 
 Key Features:
 - Secure authentication via Azure Key Vault and Active Directory.
-- Hash-based change detection (MD5 on non-volatile columns).
+- Hash-based change detection (64-bit hash computed in SQL Server on non-volatile columns).
 - Blob Storage for persistent logs and baselines.
 - Error handling with retries and logging.
 - ADF integration via JSON summary output.
@@ -20,27 +20,40 @@ Tables Monitored:
 - prescriptions (primary key: prescription_id)
 - Add more in the TABLES dict as needed.
 
+Row Hashing:
+- SQL Server reduces each row to the first 64 bits of HASHBYTES('SHA2_256') over its non-volatile
+  columns; only the primary key and that hash are transferred.
+- Columns are serialised in name order, so reordering columns in the table leaves every row hash
+  unchanged; renaming a column does not.
+- The hash only drives change detection; the truncated value is not a full digest.
+- Baselines and change logs carry the hash as an integer; consumers must not expect hex digests.
+
 Prerequisites:
 - Azure Key Vault with secrets: 'sqlserver-connstr' and 'blob-connstr'.
 - Blob Storage container: 'cdc-logs' (or set via BLOB_CONTAINER env var).
-- ODBC drivers for SQL Server.
+- ODBC drivers for SQL Server; SQL Server 2016+ or Azure SQL (HASHBYTES over inputs > 8000 bytes).
 - Python environment with required packages (managed via Poetry).
 
 Usage:
 1. Update .env.development with real Azure credentials and connection strings.
 2. Run: poetry run python app/python_cdc.py
-3. Check Blob Storage for logs (e.g., {table}_log_{run_id}.json) and baselines.
+3. Check Blob Storage for logs (e.g., {table}_log_{run_id}.json) and baselines
+   ({table}_baseline_part_{bucket}.parquet, listed by {table}_baseline_manifest.json).
 4. Integrate with ADF for automated execution.
 
 Environment Variables (.env.development):
 - KEY_VAULT_URL: Azure Key Vault URL.
 - BLOB_CONTAINER: Blob container name (default: 'cdc-logs').
+- CDC_CHUNK_SIZE: Rows streamed from SQL Server per chunk (default: 200000).
+- CDC_MAX_WORKERS: Tables processed concurrently (default: one per table).
+- CDC_BLOB_WORKERS: Blob transfers in flight across all tables (default: 16).
+- CDC_BASELINE_BUCKETS: Parquet parts each table's baseline is sharded into (default: 64).
 - AZURE_CLIENT_ID, AZURE_CLIENT_SECRET, AZURE_TENANT_ID: For local auth (optional if using managed identity).
 
 Output:
 - Console logs for monitoring.
-- JSON summary printed for ADF capture.
-- Blob files: Change logs and updated baselines.
+- JSON summary printed for ADF capture; tables checked with no changes are listed under "no_change".
+- Blob files: Change logs (JSON) and updated baselines (Parquet).
 
 Error Handling:
 - Retries for SQL connections.
@@ -51,11 +64,17 @@ Author: Chibueze Igwe (scientistigwe@gmail.com)
 Version: 0.1.0
 """
 
+import numpy as np
+import orjson
 import pandas as pd
-import pyodbc, hashlib, os, json, time, logging
+import pyarrow as pa
+import pyarrow.parquet as pq
+import io, os, json, time, logging, threading, urllib.parse
+from concurrent.futures import ThreadPoolExecutor
 from azure.storage.blob import BlobServiceClient
 from azure.eventhub import EventHubProducerClient, EventData
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import SQLAlchemyError
 
 
 # Set up logging for ADF integration and error handling
@@ -71,9 +90,15 @@ container_name = os.getenv('BLOB_CONTAINER', 'cdc-logs')
 eventhub_conn_str = os.getenv('EVENTHUB_CONN_STR', 'Endpoint=sb://your-namespace.servicebus.windows.net/;SharedAccessKeyName=RootManageSharedAccessKey;SharedAccessKey=your-key;')
 eventhub_name = os.getenv('EVENTHUB_NAME', 'cdc-events')
 
-# Initialize clients directly
-blob_service_client = BlobServiceClient.from_connection_string(blob_conn_str)
-producer = EventHubProducerClient.from_connection_string(conn_str=eventhub_conn_str, eventhub_name=eventhub_name)
+# Blob transfer tuning: payloads up to 64 MiB go out as one PUT, larger ones as 64 MiB blocks
+# staged BLOB_TRANSFER_CONCURRENCY at a time (SDK defaults are 64 MiB single-put, 4 MiB blocks)
+BLOB_BLOCK_SIZE = 64 * 1024 * 1024
+BLOB_TRANSFER_CONCURRENCY = 8
+
+# Clients are created by main(), so the helpers below can be imported without connecting to anything
+blob_service_client = None
+producer = None
+producer_lock = threading.Lock()
 
 # -------------------------------
 # ⚙️ 2. Table config (name : primary key)
@@ -91,13 +116,36 @@ TABLES = {
     "trusts": "trust_id",
 }
 
+# Rows fetched per round-trip; bounds memory independently of table size
+CHUNK_SIZE = int(os.getenv('CDC_CHUNK_SIZE', '200000'))
+
+# Tables processed concurrently (one worker per table by default)
+MAX_WORKERS = int(os.getenv('CDC_MAX_WORKERS', str(len(TABLES))))
+
+# Baseline parts per table; a run only rewrites the parts that hold changed rows
+BASELINE_BUCKETS = int(os.getenv('CDC_BASELINE_BUCKETS', '64'))
+
+# Headroom per event for AMQP framing on top of the JSON body when sizing Event Hub batches
+EVENT_OVERHEAD_BYTES = 40
+
+# Blob transfers run on their own pool so a table's round-trips overlap its SQL read and each
+# other; the cap bounds requests in flight against the storage account across all tables
+BLOB_WORKERS = int(os.getenv('CDC_BLOB_WORKERS', '16'))
+blob_executor = ThreadPoolExecutor(max_workers=BLOB_WORKERS)
+
+# One pooled engine for the whole run (created by main()): each worker checks out a connection instead
+# of paying the ODBC/TLS handshake per table and per retry
+engine = None
+
 # -------------------------------
 # 🗄️ 3. Blob Storage helpers for change logs and baselines
 # -------------------------------
 def upload_to_blob(blob_name, data):
     try:
         blob_client = blob_service_client.get_blob_client(container=container_name, blob=blob_name)
-        blob_client.upload_blob(json.dumps(data), overwrite=True)
+        # orjson encodes in C and passes numpy scalars/arrays through without conversion
+        payload = orjson.dumps(data, option=orjson.OPT_SERIALIZE_NUMPY)
+        blob_client.upload_blob(payload, overwrite=True, length=len(payload), max_concurrency=BLOB_TRANSFER_CONCURRENCY)
         logger.info(f"Uploaded {blob_name} to Blob Storage.")
     except Exception as e:
         logger.error(f"Failed to upload {blob_name}: {e}")
@@ -106,122 +154,396 @@ def upload_to_blob(blob_name, data):
 def download_from_blob(blob_name):
     try:
         blob_client = blob_service_client.get_blob_client(container=container_name, blob=blob_name)
-        data = blob_client.download_blob().readall()
-        return json.loads(data)
+        data = blob_client.download_blob(max_concurrency=BLOB_TRANSFER_CONCURRENCY).readall()
+        return orjson.loads(data)
     except Exception as e:
         logger.warning(f"Blob {blob_name} not found or failed to download: {e}")
         return {}
 
+def delete_blob(blob_name):
+    try:
+        blob_client = blob_service_client.get_blob_client(container=container_name, blob=blob_name)
+        blob_client.delete_blob()
+        logger.info(f"Deleted {blob_name} from Blob Storage.")
+    except Exception as e:
+        # A blob left behind is only wasted storage; nothing reads it once the manifest moved on
+        logger.warning(f"Failed to delete {blob_name}: {e}")
+
+# Baselines are columnar (primary_key, row_hash) pairs: Parquet keeps them compact and
+# decodes straight into arrays instead of parsing one JSON object per row.
+# Both columns are unique per row, so dictionary encoding never pays off and is disabled; the
+# hash is stored as plain fixed-width uint64 and left uncompressed since random bits don't shrink.
+BASELINE_COMPRESSION = {"primary_key": "snappy", "row_hash": "none"}
+
+def upload_parquet_to_blob(blob_name, df):
+    try:
+        buf = io.BytesIO()
+        pq.write_table(
+            pa.Table.from_pandas(df, preserve_index=False),
+            buf,
+            compression=BASELINE_COMPRESSION,
+            use_dictionary=False,
+            write_statistics=False,
+        )
+        blob_client = blob_service_client.get_blob_client(container=container_name, blob=blob_name)
+        payload = buf.getvalue()
+        blob_client.upload_blob(payload, overwrite=True, length=len(payload), max_concurrency=BLOB_TRANSFER_CONCURRENCY)
+        logger.info(f"Uploaded {blob_name} to Blob Storage.")
+    except Exception as e:
+        logger.error(f"Failed to upload {blob_name}: {e}")
+        raise
+
+def download_parquet_from_blob(blob_name):
+    try:
+        blob_client = blob_service_client.get_blob_client(container=container_name, blob=blob_name)
+        data = blob_client.download_blob(max_concurrency=BLOB_TRANSFER_CONCURRENCY).readall()
+        return pq.read_table(io.BytesIO(data)).to_pandas()
+    except Exception as e:
+        logger.warning(f"Blob {blob_name} not found or failed to download: {e}")
+        return None
+
+# Baselines are sharded by primary key into parts plus a small manifest recording the bucket
+# count, so a run rewrites only the parts whose rows changed instead of the whole table.
+def baseline_manifest_blob(tbl):
+    return f"{tbl}_baseline_manifest.json"
+
+def baseline_part_blob(tbl, bucket):
+    return f"{tbl}_baseline_part_{bucket:02d}.parquet"
+
+def baseline_buckets(pks, n_buckets):
+    """Part number per primary key; pandas' default hash key is fixed, so keys map the same every run."""
+    return pd.util.hash_array(np.asarray(pks, dtype=object)) % np.uint64(n_buckets)
+
+def legacy_baseline_blob(tbl):
+    return f"{tbl}_baseline.json"
+
+def download_legacy_baseline(tbl):
+    """Primary keys of the single-blob JSON baseline written before the sharded layout, or None.
+
+    Its row hashes are MD5 hex digests of a different serialisation, so only the keys are kept.
+    """
+    records = download_from_blob(legacy_baseline_blob(tbl))
+    if not records:
+        return None
+    return pd.DataFrame({"primary_key": [record["primary_key"] for record in records], "row_hash": None})
+
+def submit_baseline_download(tbl):
+    """Read the manifest and queue every baseline part on the blob pool.
+
+    Returns (bucket count, futures, legacy). Without a manifest the bucket count is None, which
+    makes the upload rewrite every part, and the {tbl}_baseline.json of earlier versions is queued
+    instead with legacy set: its keys still tell inserts and deletes apart, but its hashes cannot
+    be compared with the SQL Server row hashes.
+    """
+    manifest = download_from_blob(baseline_manifest_blob(tbl))
+    if "buckets" not in manifest:
+        return None, [blob_executor.submit(download_legacy_baseline, tbl)], True
+    n_buckets = manifest["buckets"]
+    futures = [blob_executor.submit(download_parquet_from_blob, baseline_part_blob(tbl, b)) for b in range(n_buckets)]
+    return n_buckets, futures, False
+
 # -------------------------------
 # 🔁 4. CDC processing loop with error handling
 # -------------------------------
-run_summary = {"run_id": str(int(time.time())), "changes": {}}
+run_summary = {"run_id": str(int(time.time())), "changes": {}, "no_change": []}
+
+# Columns left out of the read and the hash because they change without the row changing
+VOLATILE_COLUMNS = {"created_timestamp"}
+
+def quote_ident(name):
+    """T-SQL QUOTENAME: bracket an identifier, doubling any closing bracket inside it."""
+    return "[" + name.replace("]", "]]") + "]"
+
+def table_columns(tbl):
+    """(column, SQL data type) pairs for dbo.{tbl} in table order, volatile columns excluded."""
+    schema = pd.read_sql(
+        text("SELECT COLUMN_NAME, DATA_TYPE FROM INFORMATION_SCHEMA.COLUMNS "
+             "WHERE TABLE_SCHEMA = 'dbo' AND TABLE_NAME = :tbl ORDER BY ORDINAL_POSITION"),
+        engine,
+        params={"tbl": tbl},
+    )
+    return [(c, t.lower()) for c, t in zip(schema["COLUMN_NAME"], schema["DATA_TYPE"])
+            if c.lower() not in VOLATILE_COLUMNS]
+
+# CONVERT styles that render a value losslessly as text; the default style would drop seconds
+# from datetimes, digits from floats/money and turn binary into characters
+CONVERT_STYLES = {
+    **dict.fromkeys(["date", "time", "datetime", "datetime2", "smalldatetime", "datetimeoffset"], 126),
+    **dict.fromkeys(["float", "real"], 3),
+    **dict.fromkeys(["money", "smallmoney"], 2),
+    **dict.fromkeys(["binary", "varbinary"], 1),
+}
 
-for tbl, pk in TABLES.items():
+def row_hash_sql(columns):
+    """T-SQL expression hashing a row in SQL Server to a BIGINT.
+
+    Columns are taken in name order, so DDL reordering keeps every hash stable. Each value is
+    length-prefixed and NULL gets its own marker, so no two distinct rows serialise the same way.
+    """
+    parts = []
+    for col, data_type in sorted(columns):
+        style = CONVERT_STYLES.get(data_type)
+        value = f"CONVERT(NVARCHAR(MAX), {quote_ident(col)}{'' if style is None else f', {style}'})"
+        # '+' (unlike CONCAT) propagates NULL, so ISNULL sees it and substitutes the marker
+        parts.append(f"ISNULL(CONVERT(NVARCHAR(20), DATALENGTH({value})) + N':' + {value}, N'~')")
+    return f"CONVERT(BIGINT, SUBSTRING(HASHBYTES('SHA2_256', {' + '.join(parts)}), 1, 8))"
+
+def sorted_pairs(pks, hashes):
+    """Sort (pk, hash) arrays by key, keeping the last row of any duplicate key; also flags duplicates."""
+    keys = np.asarray(pks)
+    if keys.dtype == object:
+        # Fixed-width unicode sorts and compares in C rather than through Python objects
+        keys = keys.astype(str)
+    order = np.argsort(keys, kind="stable")
+    keys, hashes = keys[order], np.asarray(hashes)[order]
+    # A stable sort keeps rows of one key in arrival order, so the last of each run is the last row read
+    last = np.ones(len(keys), dtype=bool)
+    last[:-1] = keys[1:] != keys[:-1]
+    return keys[last], hashes[last], not last.all()
+
+def lookup(sorted_keys, keys):
+    """Position of each key in sorted_keys and whether it is present there."""
+    pos = np.searchsorted(sorted_keys, keys)
+    pos[pos == len(sorted_keys)] = 0
+    found = sorted_keys[pos] == keys if len(sorted_keys) else np.zeros(len(keys), dtype=bool)
+    return pos, found
+
+def diff_baseline(tbl, df, prev, legacy=False):
+    """Changes between the current (primary_key, row_hash) frame and the previous baseline.
+
+    Returns {"INSERT" | "DELETE" | "UPDATE": (keys, hashes)}; deletes carry the baseline hash.
+    With legacy set the baseline hashes are not comparable, so no updates are reported.
+    """
+    # Compare old vs new on key-sorted arrays: one binary search of each side into the
+    # other gives inserts/deletes (not found) and updates (found with a different hash)
+    new_keys, new_hashes, new_dups = sorted_pairs(df["primary_key"].to_numpy(), df["row_hash"].to_numpy())
+    old_keys, old_hashes, old_dups = sorted_pairs(prev["primary_key"].to_numpy(), prev["row_hash"].to_numpy())
+    for side, has_dups in (("current", new_dups), ("baseline", old_dups)):
+        if has_dups:
+            logger.warning(f"{tbl}: duplicate primary keys in {side} data, keeping the last row for each.")
+
+    pos, found = lookup(old_keys, new_keys)
+    if legacy:
+        # Migrating from the JSON baseline: keys seen before are not inserts, but their old
+        # hashes say nothing about updates, so none are logged on this run
+        logger.warning(f"{tbl}: migrating the legacy JSON baseline; updates since its last run are not logged.")
+        updated = np.zeros(len(new_keys), dtype=bool)
+    else:
+        updated = found & (old_hashes[pos] != new_hashes) if len(old_keys) else found
+    deleted = ~lookup(new_keys, old_keys)[1]
+    return {
+        "INSERT": (new_keys[~found], new_hashes[~found]),
+        "DELETE": (old_keys[deleted], old_hashes[deleted]),
+        "UPDATE": (new_keys[updated], new_hashes[updated]),
+    }
+
+def send_change_events(producer, encoded):
+    """Send JSON-encoded change events to Event Hub in as few batches as fit."""
+    event_data_batch = producer.create_batch()
+    for body in encoded:
+        event_data = EventData(body)
+        # Roll over before the batch would overflow, so add() rarely has to raise
+        if (len(event_data_batch) > 0 and event_data_batch.size_in_bytes + len(body)
+                + EVENT_OVERHEAD_BYTES > event_data_batch.max_size_in_bytes):
+            producer.send_batch(event_data_batch)
+            event_data_batch = producer.create_batch()
+        try:
+            event_data_batch.add(event_data)
+        except ValueError:
+            # The overhead estimate fell short (large properties, framing
+            # changes): send what fits and start the event in a fresh batch
+            producer.send_batch(event_data_batch)
+            event_data_batch = producer.create_batch()
+            event_data_batch.add(event_data)
+    if len(event_data_batch) > 0:
+        producer.send_batch(event_data_batch)
+
+def process_table(tbl, pk):
+    """Run CDC for one table; returns (table, change count or error string, None if empty)."""
     logger.info(f"🔄 Checking table: {tbl}")
     start = time.strftime("%Y-%m-%d %H:%M:%S")
     changes_logged = 0
+    prev_futures = []
 
     try:
-        # Step 1: Load current data with retry
+        # Step 3 (overlapped): the previous baseline only depends on the table name, so fetch its
+        # parts from Blob while the SQL read below is in progress
+        prev_buckets, prev_futures, legacy = submit_baseline_download(tbl)
+
+        # Step 1 & 2: Stream (primary_key, row_hash) pairs with retry. SQL Server hashes each row
+        # next to the data, so only 8 bytes of hash plus the key per row cross the wire
         max_retries = 3
         for attempt in range(max_retries):
             try:
-                df = pd.read_sql(f"SELECT * FROM dbo.{tbl}", pyodbc.connect(conn_str))
+                pk_parts, hash_parts = [], []
+                columns = table_columns(tbl)
+                if not columns:
+                    raise ValueError(f"no columns found for dbo.{tbl}")
+                if pk not in {c for c, _ in columns}:
+                    raise ValueError(f"primary key {pk} not found in dbo.{tbl}")
+                select_sql = (f"SELECT {quote_ident(pk)} AS primary_key, {row_hash_sql(columns)} AS row_hash "
+                              f"FROM dbo.{quote_ident(tbl)}")
+                for chunk in pd.read_sql(select_sql, engine, chunksize=CHUNK_SIZE):
+                    pk_parts.append(chunk["primary_key"].to_numpy())
+                    # BIGINT arrives signed; reinterpret the same 64 bits as the unsigned baseline hash
+                    hash_parts.append(chunk["row_hash"].to_numpy(dtype=np.int64).view(np.uint64))
                 break
-            except Exception as e:
+            except SQLAlchemyError as e:
                 logger.warning(f"Attempt {attempt+1} failed for {tbl}: {e}")
                 if attempt == max_retries - 1:
                     raise
                 time.sleep(2)
 
-        if df.empty:
+        if not pk_parts or sum(len(part) for part in pk_parts) == 0:
             logger.info(f"{tbl}: no rows found, skipping.")
-            continue
-
-        # Step 2: Compute hash per row (excluding volatile timestamp)
-        cols_to_hash = [c for c in df.columns if c.lower() not in ["created_timestamp"]]
-        df["row_hash"] = df[cols_to_hash].astype(str).sum(axis=1).apply(lambda x: hashlib.md5(x.encode()).hexdigest())
-
-        # Step 3: Load previous baseline from Blob
-        baseline_blob = f"{tbl}_baseline.json"
-        prev_data = download_from_blob(baseline_blob)
-        prev = pd.DataFrame(prev_data) if prev_data else pd.DataFrame(columns=["primary_key", "row_hash"])
-
-        df.rename(columns={pk: "primary_key"}, inplace=True)
+            # Nothing will read the baseline; drop the queued part downloads (running ones just finish)
+            for f in prev_futures:
+                f.cancel()
+            return tbl, None
+
+        df = pd.DataFrame({
+            "primary_key": np.concatenate(pk_parts),
+            "row_hash": np.concatenate(hash_parts),
+        })
+
+        # Step 3: Collect the previous baseline fetched alongside the read
+        prev_parts = [part for part in (f.result() for f in prev_futures) if part is not None]
+        if prev_parts:
+            prev = pd.concat(prev_parts, ignore_index=True)
+        else:
+            prev = pd.DataFrame({"primary_key": pd.Series(dtype=object), "row_hash": pd.Series(dtype="uint64")})
 
         # Step 4: Compare old vs new
-        merged = df.merge(prev, on="primary_key", how="outer", suffixes=("_new", "_old"))
-
-        inserted = merged[merged["row_hash_old"].isna()]
-        deleted = merged[merged["row_hash_new"].isna()]
-        changed = merged[
-            (~merged["row_hash_old"].isna()) &
-            (merged["row_hash_new"] != merged["row_hash_old"])
-        ]
+        changes = diff_baseline(tbl, df, prev, legacy)
 
         # Step 5: Log changes to Blob
         log_entries = []
-        for change_type, subset in {
-            "INSERT": inserted,
-            "DELETE": deleted,
-            "UPDATE": changed
-        }.items():
-            if not subset.empty:
-                count = len(subset)
+        changed_keys = []
+        for change_type, (keys, hashes) in changes.items():
+            if len(keys):
+                changed_keys.append(keys)
+                count = len(keys)
                 changes_logged += count
                 logger.info(f"  → {change_type}: {count} rows")
-                for _, row in subset.iterrows():
-                    log_entries.append({
-                        "run_id": run_summary["run_id"],
+                # Pull keys and hashes out as whole columns, then zip them into entries
+                run_id = run_summary["run_id"]
+                log_entries.extend(
+                    {
+                        "run_id": run_id,
                         "change_type": change_type,
-                        "primary_key": row["primary_key"],
-                        "row_hash": row["row_hash_new"] if change_type != "DELETE" else row["row_hash_old"],
+                        "primary_key": primary_key,
+                        "row_hash": row_hash,
                         "change_time": start
-                    })
+                    }
+                    for primary_key, row_hash in zip(keys.tolist(), hashes.tolist())
+                )
 
+        log_future = None
         if log_entries:
+            # The log upload runs in the background while events go to Event Hub
             log_blob = f"{tbl}_log_{run_summary['run_id']}.json"
-            upload_to_blob(log_blob, log_entries)
+            log_future = blob_executor.submit(upload_to_blob, log_blob, log_entries)
 
             # Send change events to Event Hub for real-time processing
             if producer:
                 try:
-                    event_data_batch = producer.create_batch()
-                    for entry in log_entries:
-                        event_data = EventData(json.dumps(entry))
-                        try:
-                            event_data_batch.add(event_data)
-                        except ValueError:
-                            # Batch is full, send current batch and create new one
-                            producer.send_batch(event_data_batch)
-                            event_data_batch = producer.create_batch()
-                            event_data_batch.add(event_data)
-                    if len(event_data_batch) > 0:
-                        producer.send_batch(event_data_batch)
+                    # The producer is shared by all workers; serialise sends on it
+                    # Encode every entry up front, outside the lock, so batching only compares sizes
+                    encoded = [orjson.dumps(entry) for entry in log_entries]
+                    with producer_lock:
+                        send_change_events(producer, encoded)
                     logger.info(f"Sent {len(log_entries)} change events to Event Hub for {tbl}.")
                 except Exception as e:
                     logger.error(f"Failed to send events to Event Hub for {tbl}: {e}")
             else:
                 logger.warning(f"No Event Hub producer available for {tbl}, skipping Event Hub send.")
 
-        # Step 6: Update baseline in Blob
-        baseline_data = df[["primary_key", "row_hash"]].to_dict(orient="records")
-        upload_to_blob(baseline_blob, baseline_data)
-
-        run_summary["changes"][tbl] = changes_logged
+        # Step 6: An unchanged table with the current layout has nothing to rewrite; skip the
+        # bucketing pass and every baseline PUT
+        if changes_logged == 0 and prev_buckets == BASELINE_BUCKETS:
+            logger.info(f"{tbl}: no changes, baseline left as is.")
+            return tbl, changes_logged
+
+        # Update baseline in Blob, only once the change log is safely stored; a failed log
+        # upload raises here and leaves the old baseline in place so the changes are seen again
+        if log_future is not None:
+            log_future.result()
+        new_buckets = baseline_buckets(df["primary_key"].to_numpy(), BASELINE_BUCKETS)
+        if prev_buckets == BASELINE_BUCKETS:
+            # Only parts holding an inserted, deleted or updated key differ from what is stored
+            dirty = np.unique(baseline_buckets(np.concatenate(changed_keys), BASELINE_BUCKETS)) if changed_keys else []
+        else:
+            # First run, or the layout changed: write every part so the manifest covers them all
+            dirty = np.arange(BASELINE_BUCKETS, dtype=np.uint64)
+        part_futures = [
+            blob_executor.submit(upload_parquet_to_blob, baseline_part_blob(tbl, int(b)),
+                                 df.loc[new_buckets == b, ["primary_key", "row_hash"]])
+            for b in dirty
+        ]
+        for f in part_futures:
+            f.result()
+        if prev_buckets != BASELINE_BUCKETS:
+            upload_to_blob(baseline_manifest_blob(tbl), {"buckets": BASELINE_BUCKETS})
+            # Only once the new manifest is stored: drop what it no longer lists, i.e. the parts
+            # above a reduced bucket count, or the JSON baseline that was just migrated
+            stale = [baseline_part_blob(tbl, b) for b in range(BASELINE_BUCKETS, prev_buckets or 0)]
+            if legacy:
+                stale.append(legacy_baseline_blob(tbl))
+            for f in [blob_executor.submit(delete_blob, blob_name) for blob_name in stale]:
+                f.result()
+        logger.info(f"{tbl}: rewrote {len(dirty)} of {BASELINE_BUCKETS} baseline parts.")
+
+        return tbl, changes_logged
 
     except Exception as e:
         logger.error(f"Error processing table {tbl}: {e}")
-        run_summary["changes"][tbl] = f"Error: {str(e)}"
-        continue
-
-if producer:
-    producer.close()
-    logger.info("Event Hub producer closed.")
-
-# Output summary for ADF integration
-summary_blob = f"cdc_summary_{run_summary['run_id']}.json"
-upload_to_blob(summary_blob, run_summary)
-logger.info(f"CDC process complete. Summary uploaded to {summary_blob}.")
-print(json.dumps(run_summary))  # For ADF to capture output
+        for f in prev_futures:
+            f.cancel()
+        return tbl, f"Error: {str(e)}"
+
+
+def main():
+    global blob_service_client, producer, engine
+    blob_service_client = BlobServiceClient.from_connection_string(
+        blob_conn_str,
+        max_single_put_size=BLOB_BLOCK_SIZE,
+        max_block_size=BLOB_BLOCK_SIZE,
+        max_chunk_get_size=BLOB_BLOCK_SIZE,
+    )
+    producer = EventHubProducerClient.from_connection_string(conn_str=eventhub_conn_str, eventhub_name=eventhub_name)
+    # pre_ping drops connections the server closed
+    engine = create_engine(
+        "mssql+pyodbc:///?odbc_connect=" + urllib.parse.quote_plus(conn_str),
+        pool_size=MAX_WORKERS,
+        max_overflow=0,
+        pool_pre_ping=True,
+    )
+
+    # Tables are independent and each one is bound by SQL and Blob round-trips, so running them
+    # concurrently lets those latencies overlap. Every worker checks out its own pooled connection.
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        futures = [executor.submit(process_table, tbl, pk) for tbl, pk in TABLES.items()]
+        for future in futures:
+            tbl, result = future.result()
+            if result is not None:
+                run_summary["changes"][tbl] = result
+            if result == 0:
+                # Lets ADF tell an idle table (no_change) apart from a failed one (error string in changes)
+                run_summary["no_change"].append(tbl)
+
+    if producer:
+        producer.close()
+        logger.info("Event Hub producer closed.")
+
+    engine.dispose()
+    blob_executor.shutdown()
+
+    # Output summary for ADF integration
+    summary_blob = f"cdc_summary_{run_summary['run_id']}.json"
+    upload_to_blob(summary_blob, run_summary)
+    logger.info(f"CDC process complete. Summary uploaded to {summary_blob}.")
+    print(json.dumps(run_summary))  # For ADF to capture output
+
+
+if __name__ == "__main__":
+    main()
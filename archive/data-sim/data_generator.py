@@ -19,18 +19,27 @@ Generates large, messy, and realistic simulated clinical data for multi-source p
 Adds UK NHS numbers (valid Mod 11, some invalid), data quality issues, duplicates, type drift, and schema drift.
 
 Outputs:
-- CSVs: patients.csv, encounters.csv, labs.csv, device_readings.csv, registry.csv, imaging.csv, medications.csv, claims.csv
+- CSVs: patients.csv, registry.csv, medications.csv, claims.csv
+- Parquet (Snappy): encounters.parquet, labs.parquet, device_readings.parquet, imaging.parquet
+  (CSV as well with WRITE_CSV_FOR_PARQUET_DOMAINS)
 - JSONL/NDJSON: patients.jsonl, encounters.jsonl, labs.jsonl, device_readings.jsonl, registry.jsonl, imaging.jsonl
 - Mongo JSONL: mongo_<collection>.jsonl
 - FHIR-like JSON: procedures.json, fhir_patients.json, fhir_encounters.json, fhir_observations.json
 """
 
 import csv
-import json
+import os
 import random
-import uuid
 import math
-from datetime import datetime, timedelta, timezone
+import multiprocessing as mp
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+import numpy as np
+import orjson
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
 from faker import Faker
 
 # ---------------------------
@@ -40,6 +49,7 @@ fake = Faker("en_GB")
 
 RANDOM_SEED = 42
 random.seed(RANDOM_SEED)
+rng = np.random.default_rng(RANDOM_SEED)
 
 # Sizes (increase to scale)
 NUM_PATIENTS = 2000
@@ -63,144 +73,294 @@ BAD_REF_PROB = 0.02
 OUTLIER_PROB = 0.02
 FUTURE_DATE_PROB = 0.01
 
-# ---------------------------
-# Helpers: dates, formats, drift
-# ---------------------------
-def random_past_date(days_back=365 * 90, min_back=0):
-    d = random.randint(min_back, days_back)
-    dt = datetime.now() - timedelta(days=d)
-    return dt
-
-def random_recent_timestamp(days=60):
-    # Some with timezones, some naive
-    ts = datetime.now(timezone.utc) - timedelta(
-        days=random.randint(0, days),
-        seconds=random.randint(0, 86400)
-    )
-    if random.random() < FORMAT_DRIFT_PROB:
-        return ts.isoformat()
-    return ts.replace(tzinfo=None)
-
-def maybe_missing(v, p=MISSING_PROB):
-    return v if random.random() > p else ("" if random.random() < 0.5 else None)
-
-def maybe_whitespace(v):
+# Worker processes for the domains that only depend on patients/encounters (1 = build in-process)
+DOMAIN_WORKERS = os.cpu_count() or 1
+
+# Output: the high-volume domains go to Parquet; set True to also get the old CSV for them
+WRITE_CSV_FOR_PARQUET_DOMAINS = False
+
+# ---------------------------
+# Drift decisions: pre-drawn Bernoulli masks
+# ---------------------------
+MASK_BLOCK = 1 << 16  # decisions drawn per refill
+
+class BernoulliMask:
+    """Yes/no decisions with P(yes) = p, drawn MASK_BLOCK at a time in one vectorised call."""
+
+    def __init__(self, p):
+        self.p = p
+        self._refill()
+
+    def _refill(self):
+        self.bits = rng.random(MASK_BLOCK) < self.p
+        self.i = 0
+
+    def __call__(self):
+        if self.i == MASK_BLOCK:
+            self._refill()
+        hit = self.bits[self.i]
+        self.i += 1
+        return bool(hit)
+
+    def take(self, n):
+        """The next n decisions as one boolean array (for whole-column drift)."""
+        parts = []
+        while n:
+            if self.i == MASK_BLOCK:
+                self._refill()
+            k = min(n, MASK_BLOCK - self.i)
+            parts.append(self.bits[self.i:self.i + k])
+            self.i += k
+            n -= k
+        return np.concatenate(parts) if parts else np.zeros(0, dtype=bool)
+
+def _mask(p):
+    return field(default_factory=lambda: BernoulliMask(p))
+
+@dataclass
+class DriftMasks:
+    """One decision stream per data quality knob (plus a fair coin for 50/50 variants)."""
+    missing: BernoulliMask = _mask(MISSING_PROB)
+    duplicate: BernoulliMask = _mask(DUPLICATE_ROW_PROB)
+    near_duplicate: BernoulliMask = _mask(NEAR_DUPLICATE_EDIT_PROB)
+    schema_drift: BernoulliMask = _mask(SCHEMA_DRIFT_PROB)
+    type_drift: BernoulliMask = _mask(TYPE_DRIFT_PROB)
+    format_drift: BernoulliMask = _mask(FORMAT_DRIFT_PROB)
+    bad_ref: BernoulliMask = _mask(BAD_REF_PROB)
+    outlier: BernoulliMask = _mask(OUTLIER_PROB)
+    future_date: BernoulliMask = _mask(FUTURE_DATE_PROB)
+    coin: BernoulliMask = _mask(0.5)
+
+masks = DriftMasks()
+
+# ---------------------------
+# Helpers: dates, formats
+# ---------------------------
+# Dates are generated as datetime64[us] arrays: one offset draw per column, no per-row timedelta
+DAY = np.timedelta64(1, "D")
+SECOND = np.timedelta64(1, "s")
+
+def past_dates(n, days_back=365 * 90, min_back=0):
+    """n stamps a whole number of days (min_back..days_back) before now (local time)."""
+    return np.datetime64(datetime.now(), "us") - rng.integers(min_back, days_back + 1, n) * DAY
+
+def recent_timestamps(n, days=60):
+    """n UTC stamps from the last `days` days: some tz-aware ISO strings, some naive datetimes."""
+    now = np.datetime64(datetime.now(timezone.utc).replace(tzinfo=None), "us")
+    ts = now - rng.integers(0, days + 1, n) * DAY - rng.integers(0, 86401, n) * SECOND
+    out = ts.astype(object)
+    aware = masks.format_drift.take(n)
+    out[aware] = np.char.add(np.datetime_as_string(ts[aware], unit="us"), "+00:00").astype(object)
+    return out
+
+MONTH_ABBR = np.array(["Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"])
+
+def format_dates_chaos(stamps):
+    """Format datetime64 stamps, each as %Y-%m-%d, %d/%m/%Y, isoformat (maybe with a Z) or %d-%b-%Y."""
+    stamps = np.asarray(stamps).astype("datetime64[us]")
+    n = len(stamps)
+    # every format is a rearrangement of the ISO string's characters, as in uuid4_batch
+    iso = np.datetime_as_string(stamps, unit="us").astype("U26")
+    chars = iso.view("U1").reshape(n, 26)
+    day, month, year = chars[:, 8:10], chars[:, 5:7], chars[:, 0:4]
+    slash, dash = np.full((n, 1), "/"), np.full((n, 1), "-")
+    dmy = np.ascontiguousarray(np.hstack([day, slash, month, slash, year])).view("U10").ravel()
+    # datetime.isoformat() drops the fraction when it is zero
+    iso_s = np.ascontiguousarray(chars[:, :19]).view("U19").ravel()
+    iso_t = np.where(stamps.astype("datetime64[s]") == stamps, iso_s, iso)
+    iso_t = np.char.add(iso_t, np.where(masks.coin.take(n), "Z", ""))
+    abbr = MONTH_ABBR[stamps.astype("datetime64[M]").astype(np.int64) % 12]
+    d_b_y = np.ascontiguousarray(np.hstack([day, dash, abbr.view("U1").reshape(n, 3), dash, year])).view("U11").ravel()
+    formats = (iso_s.astype("U10"), dmy, iso_t, d_b_y)
+    choice = rng.integers(0, len(formats), n)
+    out = np.empty(n, dtype=object)
+    for k, formatted in enumerate(formats):
+        pick = choice == k
+        out[pick] = formatted[pick]
+    return out
+
+def maybe_future_dates(stamps):
+    """Push a FUTURE_DATE_PROB share of the stamps 1..365 days forward."""
+    future = masks.future_date.take(len(stamps))
+    return stamps + np.where(future, rng.integers(1, 366, len(stamps)), 0) * DAY
+
+def recent_or_now(n, days, p_recent):
+    """recent_timestamps(days) with probability p_recent, otherwise the current time in a chaos format."""
+    now = format_dates_chaos(np.full(n, np.datetime64(datetime.now(), "us")))
+    return np.where(rng.random(n) < p_recent, recent_timestamps(n, days), now)
+
+# ---------------------------
+# Helpers: column-wise drift
+# ---------------------------
+# Each domain is a DataFrame of object columns, so a cell keeps whatever Python value drift gives it.
+# The drift_* steps rewrite a single hit cell; drift_columns draws every step's mask for a column up
+# front, packs them into one flag byte per cell and visits each flagged cell once.
+class _Absent:
+    """Cell of a schema-drift column in a row that never got that key; pickles back to the same object."""
+
+    def __repr__(self):
+        return "ABSENT"
+
+    def __reduce__(self):
+        return "ABSENT"
+
+ABSENT = _Absent()
+SCHEMA_DRIFT_COLUMNS = ("ExtraNote", "LegacyCode")
+
+def drift_missing(v):
+    return "" if masks.coin() else None
+
+def drift_whitespace(v):
     if v is None or v == "":
         return v
-    if random.random() < FORMAT_DRIFT_PROB:
-        return f" {v} " if random.random() < 0.5 else f"{v}\t"
-    return v
+    return f" {v} " if masks.coin() else f"{v}\t"
 
-def maybe_case(v):
+def drift_case(v):
     if not isinstance(v, str):
         return v
-    if random.random() < FORMAT_DRIFT_PROB:
-        return v.upper() if random.random() < 0.5 else v.lower()
-    return v
+    return v.upper() if masks.coin() else v.lower()
 
-def maybe_type_drift(v):
-    if random.random() > TYPE_DRIFT_PROB:
-        return v
+def drift_type(v):
     # convert to string or list-like weirdness
     if isinstance(v, (int, float)):
         return str(v)
     if isinstance(v, str):
         try:
             num = float(''.join([c for c in v if c.isdigit() or c == '.']))
-            return num if random.random() < 0.5 else v
+            return num if masks.coin() else v
         except Exception:
-            return v
+            pass
     return v
 
-def maybe_duplicate_rows(row):
-    if random.random() < DUPLICATE_ROW_PROB:
-        rows = [row.copy(), row.copy()]
-        # maybe near-duplicate tweak (typo/value change)
-        if random.random() < NEAR_DUPLICATE_EDIT_PROB:
-            k = random.choice(list(row.keys()))
-            if isinstance(rows[1][k], str) and rows[1][k]:
-                rows[1][k] = rows[1][k] + random.choice([" ", "  ", ".", "🙂"])
-            elif isinstance(rows[1][k], (int, float)):
-                rows[1][k] = rows[1][k] + random.choice([1, -1, 0])
-        return rows
-    return [row]
-
-def maybe_schema_drift(row):
-    if random.random() < SCHEMA_DRIFT_PROB:
-        row = row.copy()
-        if random.random() < 0.5:
-            row["ExtraNote"] = random.choice(["legacy import", "migrated", ""])
-        else:
-            row["LegacyCode"] = random.randint(1000, 9999)
-    return row
-
-def format_date_chaos(dt):
-    if isinstance(dt, (datetime,)):
-        date_obj = dt
-    else:
-        date_obj = datetime.combine(dt, datetime.min.time())
-
-    # Randomly vary format
-    choice = random.random()
-    if choice < 0.25:
-        s = date_obj.strftime("%Y-%m-%d")
-    elif choice < 0.5:
-        s = date_obj.strftime("%d/%m/%Y")
-    elif choice < 0.75:
-        s = date_obj.isoformat() + ("Z" if random.random() < 0.5 else "")
-    else:
-        s = date_obj.strftime("%d-%b-%Y")
-    return s
-
-def maybe_future_date(dt):
-    if random.random() < FUTURE_DATE_PROB:
-        return dt + timedelta(days=random.randint(1, 365))
-    return dt
+DRIFT_STREAMS = {  # looked up on the current masks, which a domain worker reseeds
+    drift_missing: "missing",
+    drift_whitespace: "format_drift",
+    drift_case: "format_drift",
+    drift_type: "type_drift",
+}
+
+def drift_columns(df, *steps, columns=None):
+    """Run the drift steps in order over each column (all by default); ABSENT cells are skipped."""
+    for col in columns or list(df.columns):
+        values = df[col].to_numpy(dtype=object, copy=True)
+        present = np.array([v is not ABSENT for v in values], dtype=bool) if col in SCHEMA_DRIFT_COLUMNS else slice(None)
+        sub = values[present]
+        flags = np.zeros(len(sub), dtype=np.uint8)
+        for bit, step in enumerate(steps):
+            flags |= getattr(masks, DRIFT_STREAMS[step]).take(len(sub)).astype(np.uint8) << bit
+        for i in np.flatnonzero(flags).tolist():
+            v, f = sub[i], int(flags[i])
+            for bit, step in enumerate(steps):
+                if f >> bit & 1:
+                    v = step(v)
+            sub[i] = v
+        values[present] = sub
+        df[col] = values
+    return df
+
+def schema_drift(df):
+    """Give a SCHEMA_DRIFT_PROB share of rows an ExtraNote or a LegacyCode column."""
+    n = len(df)
+    drifted = masks.schema_drift.take(n)
+    note = masks.coin.take(n)
+    extra_note, legacy_code = drifted & note, drifted & ~note
+    if extra_note.any():
+        values = np.full(n, ABSENT, dtype=object)
+        values[extra_note] = [random.choice(["legacy import", "migrated", ""]) for _ in range(int(extra_note.sum()))]
+        df["ExtraNote"] = values
+    if legacy_code.any():
+        values = np.full(n, ABSENT, dtype=object)
+        values[legacy_code] = [random.randint(1000, 9999) for _ in range(int(legacy_code.sum()))]
+        df["LegacyCode"] = values
+    return df
+
+def duplicate_rows(df):
+    """Repeat a DUPLICATE_ROW_PROB share of rows next to themselves; some copies get a near-duplicate edit."""
+    order = np.repeat(np.arange(len(df)), np.where(masks.duplicate.take(len(df)), 2, 1))
+    out = df.iloc[order].reset_index(drop=True)
+    copies = np.flatnonzero(np.r_[False, order[1:] == order[:-1]])
+    edited = copies[masks.near_duplicate.take(len(copies))]
+    if not len(edited):
+        return out
+    # maybe near-duplicate tweak (typo/value change), on the column arrays rather than row Series
+    columns = list(out.columns)
+    values = [out[c].to_numpy(dtype=object, copy=True) for c in columns]
+    present = np.array([[v is not ABSENT for v in col[edited]] for col in values]).T  # edited rows x columns
+    # all edit choices drawn up front: a random present column, a typo suffix and a numeric nudge per row
+    pick = np.argmax(rng.random(present.shape) * present, axis=1)
+    suffixes = np.array([" ", "  ", ".", "🙂"], dtype=object)[rng.integers(0, 4, len(edited))].tolist()
+    nudges = rng.integers(-1, 2, len(edited)).tolist()
+    for i, j, suffix, nudge in zip(edited.tolist(), pick.tolist(), suffixes, nudges):
+        col = values[j]
+        v = col[i]
+        if isinstance(v, str) and v:
+            col[i] = v + suffix
+        elif isinstance(v, (int, float)):
+            col[i] = v + nudge
+    for c, col in zip(columns, values):
+        out[c] = col
+    return out
+
+def corrupt_refs(df, col, prefix, rows=None):
+    """Point a BAD_REF_PROB share of rows (or the given rows) at IDs that don't exist; returns the rows hit."""
+    if rows is None:
+        rows = masks.bad_ref.take(len(df))
+    df.loc[rows, col] = [f"{prefix}{random.randint(999999, 9999999)}" for _ in range(int(rows.sum()))]
+    return rows
+
+def records(df):
+    """Row dicts for JSON export; schema-drift keys only appear in the rows that have them."""
+    names = list(df.columns)
+    return [{k: v for k, v in zip(names, row) if v is not ABSENT} for row in zip(*(df[c].tolist() for c in names))]
+
+# ---------------------------
+# Random UUIDs in bulk
+# ---------------------------
+# Hex digit positions within the 36-char 8-4-4-4-12 form (the rest are dashes)
+UUID_HEX_POS = np.r_[0:8, 9:13, 14:18, 19:23, 24:36]
+
+def uuid4_batch(n):
+    """n random version-4 UUID strings from one os.urandom call and a vectorised hex formatter."""
+    raw = np.frombuffer(os.urandom(16 * n), dtype=np.uint8).reshape(n, 16).copy()
+    raw[:, 6] = (raw[:, 6] & 0x0F) | 0x40  # version 4
+    raw[:, 8] = (raw[:, 8] & 0x3F) | 0x80  # RFC 4122 variant
+    hex_chars = np.frombuffer(raw.tobytes().hex().encode("ascii"), dtype=np.uint8).reshape(n, 32)
+    out = np.full((n, 36), ord("-"), dtype=np.uint8)
+    out[:, UUID_HEX_POS] = hex_chars
+    return out.view("S36").ravel().astype("U36").tolist()
 
 # ---------------------------
 # NHS number (Mod 11)
 # ---------------------------
-def generate_valid_nhs_number():
-    digits = [random.randint(0, 9) for _ in range(9)]
-    weights = list(range(10, 1, -1))  # 10..2
-    total = sum(d * w for d, w in zip(digits, weights))
-    remainder = total % 11
-    check = 11 - remainder
-    if check == 11:
-        check = 0
-    if check == 10:
-        # regenerate to avoid invalid check digit
-        return generate_valid_nhs_number()
-    digits.append(check)
-    s = "".join(str(d) for d in digits)
-    # format 3-3-4 sometimes
-    if random.random() < 0.8:
-        return f"{s[0:3]} {s[3:6]} {s[6:10]}"
-    return s
-
-def generate_nhs_number():
-    if random.random() < INVALID_NHS_PROB:
-        # corrupted or wrong check
-        base = [random.randint(0, 9) for _ in range(10)]
-        s = "".join(map(str, base))
-        if random.random() < 0.5:
-            s = f"{s[0:3]} {s[3:6]} {s[6:10]}"
-        return s
-    return generate_valid_nhs_number()
+NHS_WEIGHTS = np.arange(10, 1, -1, dtype=np.int32)  # 10..2; digits stay int8 and widen only for the dot product
+
+def generate_nhs_numbers(n):
+    """Batch of n NHS numbers (valid Mod 11, an INVALID_NHS_PROB share corrupted), mostly 3-3-4 spaced."""
+    digits = np.empty((n, 10), dtype=np.int8)
+    pending = np.arange(n)
+    while len(pending):
+        body = rng.integers(0, 10, size=(len(pending), 9), dtype=np.int8)
+        check = (11 - body.astype(np.int32) @ NHS_WEIGHTS % 11) % 11  # remainder 0 gives check 11 -> 0
+        ok = check != 10  # a check digit of 10 is invalid: redraw those rows
+        digits[pending[ok], :9] = body[ok]
+        digits[pending[ok], 9] = check[ok]
+        pending = pending[~ok]
+
+    # corrupted or wrong check
+    invalid = rng.random(n) < INVALID_NHS_PROB
+    digits[invalid] = rng.integers(0, 10, size=(int(invalid.sum()), 10), dtype=np.int8)
+    spaced = rng.random(n) < np.where(invalid, 0.5, 0.8)
+
+    # ASCII digit bytes, with the 3-3-4 spaced form laid out by inserting space columns
+    ascii_digits = (digits + ord("0")).astype(np.uint8)
+    gap = np.full((n, 1), ord(" "), dtype=np.uint8)
+    plain = ascii_digits.view("S10").ravel().astype("U10")
+    spaced_form = np.hstack([ascii_digits[:, :3], gap, ascii_digits[:, 3:6], gap, ascii_digits[:, 6:]]).view("S12").ravel()
+    return np.where(spaced, spaced_form.astype("U12"), plain).tolist()
 
 # ---------------------------
 # Domains
 # ---------------------------
-patients = []
-encounters = []
-labs = []
-device_readings = []
-registry = []
-imaging = []
-medications = []
-procedures = []
-claims = []
-
 # Reference sets
 lab_types = ["Potassium", "Sodium", "Hemoglobin", "WBC", "Glucose", "Creatinine", "CRP"]
 device_types = ["HeartRate", "BloodPressure", "SpO2", "Temp"]
@@ -210,358 +370,464 @@ modalities = ["CT", "MRI", "XRay", "Ultrasound"]
 drug_names = ["Atorvastatin", "Metformin", "Lisinopril", "Ibuprofen", "Amoxicillin", "Levothyroxine"]
 procedure_texts = ["Appendectomy", "MRI Scan", "Blood Transfusion", "Knee Surgery", "Cataract Surgery"]
 
+# Faker values come from pools filled once per provider: Faker's per-call provider machinery is
+# pure Python, so past FAKER_POOL_SIZE rows values are drawn (with replacement) from the pool
+FAKER_POOL_SIZE = 10_000
+FAKER_SOURCES = {
+    "first_name": fake.first_name,
+    "last_name": fake.last_name,
+    "address": lambda: fake.address().replace("\n", ", "),  # flattened once per pool entry
+    "phone_number": fake.phone_number,
+    "free_email": fake.free_email,
+    "city": fake.city,
+    "county": fake.county,
+}
+faker_pools = {name: [] for name in FAKER_SOURCES}
+
+def fake_column(name, n):
+    """n values of a Faker provider; distinct pool entries while n fits in the pool."""
+    pool = faker_pools[name]
+    source = FAKER_SOURCES[name]
+    pool.extend(source() for _ in range(min(n, FAKER_POOL_SIZE) - len(pool)))
+    idx = rng.permutation(len(pool))[:n] if n <= len(pool) else rng.integers(0, len(pool), size=n)
+    return [pool[i] for i in idx.tolist()]
+
+def choices(options, n):
+    """n uniform picks from a small vocabulary: int8 codes drawn in one call, mapped to the strings once."""
+    return np.array(options, dtype=object)[rng.integers(0, len(options), n, dtype=np.int8)]
+
+def per_row_counts(n_rows, low, high):
+    """Child rows per parent row (low..high inclusive) and the parent index of every child row."""
+    counts = rng.integers(low, high + 1, size=n_rows)
+    return counts, np.repeat(np.arange(n_rows), counts)
+
 # ---------------------------
 # 1) Patients & Encounters
 # ---------------------------
-for i in range(1, NUM_PATIENTS + 1):
-    patient_id = f"PAT{i:06d}"
-
-    dob = random_past_date(days_back=365 * 95, min_back=365 * 1)
-    gender = random.choices(["M", "F", "U", "Unknown"], weights=[0.45, 0.45, 0.05, 0.05])[0]
-    nhs = generate_nhs_number()
-
-    p = {
-        "PatientID": patient_id,
-        "NHSNumber": nhs,
-        "FirstName": fake.first_name(),
-        "LastName": fake.last_name(),
-        "Gender": gender,
-        "DOB": format_date_chaos(dob.date()),
-        "Address": maybe_whitespace(fake.address().replace("\n", ", ")),
-        "Phone": maybe_missing(fake.phone_number()),
-        "Email": maybe_missing(fake.free_email()),
-    }
-    # Drift and types
-    p = maybe_schema_drift(p)
-    p = {k: maybe_type_drift(maybe_case(v)) for k, v in p.items()}
-    for drow in maybe_duplicate_rows(p):
-        patients.append(drow)
-
-    # Encounters
-    num_enc = random.randint(1, MAX_ENCOUNTERS)
-    for e in range(num_enc):
-        enc_id = f"ENC{i:06d}{e+1:02d}"
-        enc_dt = maybe_future_date(random_past_date(days_back=365 * 6, min_back=0))
-
-        enc = {
-            "EncounterID": enc_id,
-            "PatientID": patient_id,
-            "EncounterDate": format_date_chaos(enc_dt),
-            "EncounterType": random.choice(encounter_types),
-            "Location": maybe_whitespace(fake.city()),
-        }
-        enc = maybe_schema_drift(enc)
-        enc = {k: maybe_type_drift(maybe_case(maybe_missing(v))) for k, v in enc.items()}
-        for drow in maybe_duplicate_rows(enc):
-            encounters.append(drow)
+patient_ids = [f"PAT{i:06d}" for i in range(1, NUM_PATIENTS + 1)]
+
+patients = pd.DataFrame({
+    "PatientID": patient_ids,
+    "NHSNumber": generate_nhs_numbers(NUM_PATIENTS),
+    "FirstName": fake_column("first_name", NUM_PATIENTS),
+    "LastName": fake_column("last_name", NUM_PATIENTS),
+    "Gender": random.choices(["M", "F", "U", "Unknown"], weights=[0.45, 0.45, 0.05, 0.05], k=NUM_PATIENTS),
+    "DOB": format_dates_chaos(past_dates(NUM_PATIENTS, days_back=365 * 95, min_back=365 * 1).astype("datetime64[D]")),
+    "Address": fake_column("address", NUM_PATIENTS),
+    "Phone": fake_column("phone_number", NUM_PATIENTS),
+    "Email": fake_column("free_email", NUM_PATIENTS),
+}, dtype=object)
+drift_columns(patients, drift_whitespace, columns=["Address"])
+drift_columns(patients, drift_missing, columns=["Phone", "Email"])
+# Drift and types
+patients = schema_drift(patients)
+drift_columns(patients, drift_case, drift_type)
+patients = duplicate_rows(patients)
+
+# Encounters (numbered per patient, from the clean patient IDs)
+enc_counts, enc_patient = per_row_counts(NUM_PATIENTS, 1, MAX_ENCOUNTERS)
+enc_seq = np.arange(len(enc_patient)) - np.repeat(np.cumsum(enc_counts) - enc_counts, enc_counts) + 1
+n_enc = len(enc_patient)
+
+encounters = pd.DataFrame({
+    "EncounterID": [f"ENC{i + 1:06d}{e:02d}" for i, e in zip(enc_patient.tolist(), enc_seq.tolist())],
+    "PatientID": [patient_ids[i] for i in enc_patient.tolist()],
+    "EncounterDate": format_dates_chaos(maybe_future_dates(past_dates(n_enc, days_back=365 * 6, min_back=0))),
+    "EncounterType": choices(encounter_types, n_enc),
+    "Location": fake_column("city", n_enc),
+}, dtype=object)
+drift_columns(encounters, drift_whitespace, columns=["Location"])
+encounters = schema_drift(encounters)
+drift_columns(encounters, drift_missing, drift_case, drift_type)
+encounters = duplicate_rows(encounters)
 
 # ---------------------------
 # 2) Labs / Observations
 # ---------------------------
-for enc in encounters:
-    if random.random() < 0.1:
-        continue  # some encounters without labs
-    n = random.randint(1, MAX_LABS_PER_ENC)
-    for _ in range(n):
-        lab_id = str(uuid.uuid4())
-        lab_type = random.choice(lab_types)
-
-        # Base value ranges with occasional outliers
-        if lab_type == "Potassium":
-            val = round(random.uniform(2.5, 6.5), 2)
-        elif lab_type == "Sodium":
-            val = round(random.uniform(120, 160), 1)
-        elif lab_type == "Hemoglobin":
-            val = round(random.uniform(6, 18), 1)
-        elif lab_type == "WBC":
-            val = round(random.uniform(2, 20), 1)
-        elif lab_type == "Glucose":
-            val = round(random.uniform(2.5, 22.0), 1)
-        elif lab_type == "Creatinine":
-            val = round(random.uniform(40, 300), 1)
-        else:  # CRP
-            val = round(random.uniform(0, 200), 1)
-
-        if random.random() < OUTLIER_PROB:
-            val = val * random.choice([0.1, 3, 5])
-
-        # Mixed units or nonsense as strings
-        if random.random() < TYPE_DRIFT_PROB:
-            val = f"{val}{random.choice(['', ' mg/dL', ' mmol/L'])}"
-
-        lrow = {
-            "LabID": lab_id,
-            "EncounterID": enc.get("EncounterID", ""),
-            "PatientID": enc.get("PatientID", ""),
-            "LabType": lab_type,
-            "Value": maybe_missing(val),
-            "LabDate": enc.get("EncounterDate", ""),
-        }
-        lrow = maybe_schema_drift(lrow)
-        lrow = {k: maybe_type_drift(maybe_case(maybe_whitespace(v))) for k, v in lrow.items()}
-
-        # Introduce bad references
-        if random.random() < BAD_REF_PROB:
-            lrow["EncounterID"] = f"ENC{random.randint(999999, 9999999)}"
-            if random.random() < 0.5:
-                lrow["PatientID"] = f"PAT{random.randint(999999, 9999999)}"
-
-        for drow in maybe_duplicate_rows(lrow):
-            labs.append(drow)
+# Base value range and rounding per lab type
+LAB_RANGES = {
+    "Potassium": (2.5, 6.5, 2),
+    "Sodium": (120, 160, 1),
+    "Hemoglobin": (6, 18, 1),
+    "WBC": (2, 20, 1),
+    "Glucose": (2.5, 22.0, 1),
+    "Creatinine": (40, 300, 1),
+    "CRP": (0, 200, 1),
+}
+LAB_LOW, LAB_HIGH, LAB_DECIMALS = (np.array(col) for col in zip(*(LAB_RANGES[t] for t in lab_types)))
+
+def lab_values(type_idx):
+    """Values for labs whose types are given as indices into lab_types, drawn for all rows at once."""
+    n = len(type_idx)
+    vals = LAB_LOW[type_idx] + rng.random(n) * (LAB_HIGH[type_idx] - LAB_LOW[type_idx])
+    decimals = LAB_DECIMALS[type_idx]
+    for d in np.unique(decimals):
+        vals[decimals == d] = np.round(vals[decimals == d], d)
+
+    # occasional outliers
+    outlier = masks.outlier.take(n)
+    vals[outlier] *= rng.choice([0.1, 3, 5], size=int(outlier.sum()))
+
+    # Mixed units or nonsense as strings
+    values = vals.tolist()
+    drifted = np.flatnonzero(masks.type_drift.take(n))
+    for i, unit in zip(drifted.tolist(), rng.choice(['', ' mg/dL', ' mmol/L'], size=len(drifted)).tolist()):
+        values[i] = f"{values[i]}{unit}"
+    return values
+
+lab_counts, lab_enc = per_row_counts(len(encounters), 1, MAX_LABS_PER_ENC)
+lab_enc = lab_enc[(rng.random(len(encounters)) >= 0.1)[lab_enc]]  # some encounters without labs
+n_labs = len(lab_enc)
+lab_type_idx = rng.integers(0, len(lab_types), size=n_labs, dtype=np.int8)
+
+labs = pd.DataFrame({
+    "LabID": uuid4_batch(n_labs),
+    "EncounterID": encounters["EncounterID"].to_numpy()[lab_enc],
+    "PatientID": encounters["PatientID"].to_numpy()[lab_enc],
+    "LabType": np.array(lab_types, dtype=object)[lab_type_idx],
+    "Value": lab_values(lab_type_idx),
+    "LabDate": encounters["EncounterDate"].to_numpy()[lab_enc],
+}, dtype=object)
+drift_columns(labs, drift_missing, columns=["Value"])
+labs = schema_drift(labs)
+drift_columns(labs, drift_whitespace, drift_case, drift_type)
+
+# Introduce bad references
+bad_enc = corrupt_refs(labs, "EncounterID", "ENC")
+corrupt_refs(labs, "PatientID", "PAT", bad_enc & masks.coin.take(n_labs))
+labs = duplicate_rows(labs)
 
 # ---------------------------
 # 3) Device / IoMT readings
 # ---------------------------
-for p in patients:
-    num = random.randint(1, MAX_DEVICE_READINGS_PER_PAT)
-    for _ in range(num):
-        reading_id = str(uuid.uuid4())
-        device_type = random.choice(device_types)
-        ts = random_recent_timestamp(days=30)
-
-        if device_type == "HeartRate":
-            value = random.randint(45, 140)
-            if random.random() < OUTLIER_PROB:
-                value = random.choice([0, 250])
-        elif device_type == "BloodPressure":
-            syst = random.randint(90, 160)
-            dias = random.randint(55, 100)
-            if random.random() < OUTLIER_PROB:
-                syst, dias = dias, syst  # swapped
-            value = f"{syst}/{dias}"
-        elif device_type == "SpO2":
-            value = random.randint(80, 100)
-        else:  # Temp
-            temp_c = round(random.uniform(34.0, 40.5), 1)
-            if random.random() < TYPE_DRIFT_PROB:
-                # Fahrenheit drift
-                temp_c = round(temp_c * 9/5 + 32, 1)
-            value = temp_c
-
-        drow = {
-            "ReadingID": reading_id,
-            "PatientID": p.get("PatientID", ""),
-            "DeviceType": device_type,
-            "Value": maybe_missing(value),
-            "Timestamp": ts if random.random() < 0.7 else format_date_chaos(datetime.now()),
-        }
-        drow = maybe_schema_drift(drow)
-        drow = {k: maybe_type_drift(maybe_case(maybe_whitespace(v))) for k, v in drow.items()}
-        if random.random() < BAD_REF_PROB:
-            drow["PatientID"] = f"PAT{random.randint(999999, 9999999)}"
-        for rr in maybe_duplicate_rows(drow):
-            device_readings.append(rr)
+HEART_RATE, BLOOD_PRESSURE, SPO2, TEMP = (device_types.index(t) for t in ("HeartRate", "BloodPressure", "SpO2", "Temp"))
+
+def device_values(type_idx):
+    """Readings for devices whose types are given as indices into device_types, drawn per type for all rows at once."""
+    values = np.empty(len(type_idx), dtype=object)
+
+    rows = np.flatnonzero(type_idx == HEART_RATE)
+    rate = rng.integers(45, 141, len(rows))
+    outlier = masks.outlier.take(len(rows))
+    rate[outlier] = rng.choice([0, 250], size=int(outlier.sum()))
+    values[rows] = rate.astype(object)
+
+    rows = np.flatnonzero(type_idx == BLOOD_PRESSURE)
+    syst, dias = rng.integers(90, 161, len(rows)), rng.integers(55, 101, len(rows))
+    swapped = masks.outlier.take(len(rows))
+    syst, dias = np.where(swapped, dias, syst), np.where(swapped, syst, dias)
+    values[rows] = np.char.add(np.char.add(syst.astype(str), "/"), dias.astype(str)).astype(object)
+
+    rows = np.flatnonzero(type_idx == SPO2)
+    values[rows] = rng.integers(80, 101, len(rows)).astype(object)
+
+    rows = np.flatnonzero(type_idx == TEMP)
+    temp_c = np.round(rng.uniform(34.0, 40.5, len(rows)), 1)
+    fahrenheit = masks.type_drift.take(len(rows))  # Fahrenheit drift
+    temp_c[fahrenheit] = np.round(temp_c[fahrenheit] * 9 / 5 + 32, 1)
+    values[rows] = temp_c.astype(object)
+    return values
+
+def build_device_readings():
+    _, dev_patient = per_row_counts(len(patients), 1, MAX_DEVICE_READINGS_PER_PAT)
+    n_dev = len(dev_patient)
+    device_type_idx = rng.integers(0, len(device_types), size=n_dev, dtype=np.int8)
+
+    device_readings = pd.DataFrame({
+        "ReadingID": uuid4_batch(n_dev),
+        "PatientID": patients["PatientID"].to_numpy()[dev_patient],
+        "DeviceType": np.array(device_types, dtype=object)[device_type_idx],
+        "Value": device_values(device_type_idx),
+        "Timestamp": recent_or_now(n_dev, days=30, p_recent=0.7),
+    }, dtype=object)
+    drift_columns(device_readings, drift_missing, columns=["Value"])
+    device_readings = schema_drift(device_readings)
+    drift_columns(device_readings, drift_whitespace, drift_case, drift_type)
+    corrupt_refs(device_readings, "PatientID", "PAT")
+    device_readings = duplicate_rows(device_readings)
+    return device_readings
 
 # ---------------------------
 # 4) Registry / Administrative CSV
 # ---------------------------
-for p in patients:
-    r = {
-        "PatientID": p.get("PatientID", ""),
-        "InsuranceType": random.choice(insurance_types),
-        "Region": maybe_whitespace(fake.county()),
-        "EnrollmentDate": format_date_chaos(random_past_date(days_back=365 * 15, min_back=365).date()),
-    }
-    r = maybe_schema_drift(r)
-    r = {k: maybe_type_drift(maybe_case(maybe_missing(v))) for k, v in r.items()}
-    if random.random() < BAD_REF_PROB:
-        r["PatientID"] = f"PAT{random.randint(999999, 9999999)}"
-    for rr in maybe_duplicate_rows(r):
-        registry.append(rr)
+def build_registry():
+    n_reg = len(patients)
+    registry = pd.DataFrame({
+        "PatientID": patients["PatientID"].to_numpy(),
+        "InsuranceType": choices(insurance_types, n_reg),
+        "Region": fake_column("county", n_reg),
+        "EnrollmentDate": format_dates_chaos(past_dates(n_reg, days_back=365 * 15, min_back=365).astype("datetime64[D]")),
+    }, dtype=object)
+    drift_columns(registry, drift_whitespace, columns=["Region"])
+    registry = schema_drift(registry)
+    drift_columns(registry, drift_missing, drift_case, drift_type)
+    corrupt_refs(registry, "PatientID", "PAT")
+    registry = duplicate_rows(registry)
+    return registry
 
 # ---------------------------
 # 5) Imaging metadata
 # ---------------------------
-for enc in encounters:
-    nimg = random.randint(0, MAX_IMAGING_PER_ENC)
-    for _ in range(nimg):
-        image_id = str(uuid.uuid4())
-        modality = random.choice(modalities)
-        imaging_date = enc.get("EncounterDate", format_date_chaos(datetime.now()))
-
-        im = {
-            "ImageID": image_id,
-            "EncounterID": enc.get("EncounterID", ""),
-            "PatientID": enc.get("PatientID", ""),
-            "Modality": modality,
-            "ImagingDate": imaging_date,
-        }
-        im = maybe_schema_drift(im)
-        im = {k: maybe_type_drift(maybe_case(maybe_missing(v))) for k, v in im.items()}
-        if random.random() < BAD_REF_PROB:
-            im["EncounterID"] = f"ENC{random.randint(999999, 9999999)}"
-        for rr in maybe_duplicate_rows(im):
-            imaging.append(rr)
+_, img_enc = per_row_counts(len(encounters), 0, MAX_IMAGING_PER_ENC)
+n_img = len(img_enc)
+
+imaging = pd.DataFrame({
+    "ImageID": uuid4_batch(n_img),
+    "EncounterID": encounters["EncounterID"].to_numpy()[img_enc],
+    "PatientID": encounters["PatientID"].to_numpy()[img_enc],
+    "Modality": choices(modalities, n_img),
+    "ImagingDate": encounters["EncounterDate"].to_numpy()[img_enc],
+}, dtype=object)
+imaging = schema_drift(imaging)
+drift_columns(imaging, drift_missing, drift_case, drift_type)
+corrupt_refs(imaging, "EncounterID", "ENC")
+imaging = duplicate_rows(imaging)
 
 # ---------------------------
 # 6) Medications (CSV)
 # ---------------------------
-for p in patients:
-    count = random.randint(*MEDS_PER_PAT_RANGE)
-    for _ in range(count):
-        start = random_past_date(days_back=365 * 5, min_back=0)
-        end = start + timedelta(days=random.randint(1, 400))
-        m = {
-            "PatientID": p.get("PatientID", ""),
-            "EncounterID": random.choice(encounters)["EncounterID"] if encounters and random.random() > BAD_REF_PROB else f"ENC{random.randint(500000,999999)}",
-            "DrugName": random.choice(drug_names),
-            "Dosage": f"{random.randint(1, 500)}mg",
-            "Route": random.choice(["Oral", "IV", "Subcutaneous", "Topical"]),
-            "StartDate": format_date_chaos(start.date()),
-            "EndDate": format_date_chaos(maybe_future_date(end).date()),
-        }
-        m = maybe_schema_drift(m)
-        m = {k: maybe_type_drift(maybe_case(maybe_missing(v))) for k, v in m.items()}
-        for rr in maybe_duplicate_rows(m):
-            medications.append(rr)
+encounter_ids = encounters["EncounterID"].to_numpy(dtype=object)
+
+def encounter_refs(n):
+    """n EncounterIDs drawn from the generated encounters, with a BAD_REF_PROB share left dangling."""
+    bad_ids = np.char.add("ENC", rng.integers(500000, 1000000, n).astype(str)).astype(object)
+    if not len(encounter_ids):
+        return bad_ids
+    valid_ids = encounter_ids[rng.integers(0, len(encounter_ids), n)]
+    return np.where(masks.bad_ref.take(n), bad_ids, valid_ids)
+
+def build_medications():
+    _, med_patient = per_row_counts(len(patients), *MEDS_PER_PAT_RANGE)
+    n_med = len(med_patient)
+    med_start = past_dates(n_med, days_back=365 * 5, min_back=0)
+    med_end = maybe_future_dates(med_start + rng.integers(1, 401, n_med) * DAY)
+
+    medications = pd.DataFrame({
+        "PatientID": patients["PatientID"].to_numpy()[med_patient],
+        "EncounterID": encounter_refs(n_med),
+        "DrugName": choices(drug_names, n_med),
+        "Dosage": [f"{random.randint(1, 500)}mg" for _ in range(n_med)],
+        "Route": choices(["Oral", "IV", "Subcutaneous", "Topical"], n_med),
+        "StartDate": format_dates_chaos(med_start.astype("datetime64[D]")),
+        "EndDate": format_dates_chaos(med_end.astype("datetime64[D]")),
+    }, dtype=object)
+    medications = schema_drift(medications)
+    drift_columns(medications, drift_missing, drift_case, drift_type)
+    medications = duplicate_rows(medications)
+    return medications
 
 # ---------------------------
 # 7) Procedures (FHIR-like JSON)
 # ---------------------------
-for p in patients:
-    count = random.randint(*PROCS_PER_PAT_RANGE)
-    for _ in range(count):
+def build_procedures():
+    procedures = []
+    _, proc_patient = per_row_counts(len(patients), *PROCS_PER_PAT_RANGE)
+
+    n_proc = len(proc_patient)
+    for patient_id, proc_id, encounter_id, performed in zip(
+        patients["PatientID"].to_numpy()[proc_patient].tolist(), uuid4_batch(n_proc), encounter_refs(n_proc).tolist(),
+        recent_or_now(n_proc, days=900, p_recent=0.5).tolist(),
+    ):
         procedures.append(
             {
                 "resourceType": "Procedure",
-                "id": str(uuid.uuid4()),
-                "subject": {"reference": f"Patient/{p.get('PatientID','')}"},
-                "encounter": {"reference": f"Encounter/{random.choice(encounters)['EncounterID']}" if encounters and random.random() > BAD_REF_PROB else f"Encounter/ENC{random.randint(500000,999999)}"},
+                "id": proc_id,
+                "subject": {"reference": f"Patient/{patient_id}"},
+                "encounter": {"reference": f"Encounter/{encounter_id}"},
                 "code": {"text": random.choice(procedure_texts)},
-                "performedDateTime": random_recent_timestamp(days=900) if random.random() < 0.5 else format_date_chaos(datetime.now()),
+                "performedDateTime": performed,
                 "status": random.choice(["completed", "in-progress", "scheduled", "entered-in-error"]),
             }
         )
+    return procedures
 
 # ---------------------------
 # 8) Claims (CSV)
 # ---------------------------
-for p in patients:
-    count = random.randint(*CLAIMS_PER_PAT_RANGE)
-    for _ in range(count):
-        claims.append(
-            {
-                "ClaimID": str(uuid.uuid4()),
-                "PatientID": p.get("PatientID", ""),
-                "EncounterID": random.choice(encounters)["EncounterID"] if encounters and random.random() > BAD_REF_PROB else f"ENC{random.randint(500000,999999)}",
-                "ServiceDate": format_date_chaos(random_past_date(days_back=365 * 5, min_back=0).date()),
-                "ClaimAmount": round(random.uniform(50, 15000), 2),
-                "Status": random.choice(["Pending", "Paid", "Denied", "Reversed"]),
-            }
-        )
+def build_claims():
+    _, claim_patient = per_row_counts(len(patients), *CLAIMS_PER_PAT_RANGE)
+    n_claims = len(claim_patient)
+
+    claims = pd.DataFrame({
+        "ClaimID": uuid4_batch(n_claims),
+        "PatientID": patients["PatientID"].to_numpy()[claim_patient],
+        "EncounterID": encounter_refs(n_claims),
+        "ServiceDate": format_dates_chaos(past_dates(n_claims, days_back=365 * 5, min_back=0).astype("datetime64[D]")),
+        "ClaimAmount": [round(random.uniform(50, 15000), 2) for _ in range(n_claims)],
+        "Status": choices(["Pending", "Paid", "Denied", "Reversed"], n_claims),
+    }, dtype=object)
+    return claims
+
+# ---------------------------
+# Independent domains (3, 4, 6, 7, 8), built in worker processes
+# ---------------------------
+# Each domain draws from its own streams seeded with RANDOM_SEED + its position in the list, so the
+# output does not depend on DOMAIN_WORKERS.
+INDEPENDENT_DOMAINS = (build_device_readings, build_registry, build_medications, build_procedures, build_claims)
+
+def run_domain(offset, build):
+    global rng, masks
+    random.seed(RANDOM_SEED + offset)
+    fake.seed_instance(RANDOM_SEED + offset)
+    rng = np.random.default_rng(RANDOM_SEED + offset)
+    masks = DriftMasks()
+    return build()
+
+def build_independent_domains():
+    global rng, masks
+    offsets = range(1, len(INDEPENDENT_DOMAINS) + 1)
+    # forked workers inherit patients/encounters instead of re-running this script
+    if DOMAIN_WORKERS > 1 and "fork" in mp.get_all_start_methods():
+        workers = min(DOMAIN_WORKERS, len(INDEPENDENT_DOMAINS))
+        with ProcessPoolExecutor(max_workers=workers, mp_context=mp.get_context("fork")) as pool:
+            return list(pool.map(run_domain, offsets, INDEPENDENT_DOMAINS))
+    saved = random.getstate(), fake.random, rng, masks
+    try:
+        return [run_domain(offset, build) for offset, build in zip(offsets, INDEPENDENT_DOMAINS)]
+    finally:
+        random.setstate(saved[0])
+        fake.random, rng, masks = saved[1:]
+
+device_readings, registry, medications, procedures, claims = build_independent_domains()
 
 # ---------------------------
 # FHIR-like bundles for core resources
 # ---------------------------
+# Reference strings, valueString and status are computed a column at a time; the row loops only
+# pack them into the nested resource dicts. Cells keep their drifted Python type, so the
+# resources are not routed through Arrow structs, which need one type per field.
+def references(resource_type, values):
+    return np.char.add(f"{resource_type}/", values.to_numpy(dtype=object).astype(str)).tolist()
+
 fhir_patients = [
     {
         "resourceType": "Patient",
-        "id": p["PatientID"],
-        "identifier": [{"system": "https://fhir.nhs.uk/Id/nhs-number", "value": p.get("NHSNumber")}],
-        "name": [{"given": [p.get("FirstName")], "family": p.get("LastName")}],
-        "gender": (p.get("Gender") or "").lower() if isinstance(p.get("Gender"), str) else p.get("Gender"),
-        "birthDate": p.get("DOB"),
-        "address": [{"text": p.get("Address")}],
-        "telecom": [{"system": "phone", "value": p.get("Phone")}, {"system": "email", "value": p.get("Email")}],
+        "id": pid,
+        "identifier": [{"system": "https://fhir.nhs.uk/Id/nhs-number", "value": nhs}],
+        "name": [{"given": [first], "family": last}],
+        "gender": (gender or "").lower() if isinstance(gender, str) else gender,
+        "birthDate": dob,
+        "address": [{"text": address}],
+        "telecom": [{"system": "phone", "value": phone}, {"system": "email", "value": email}],
     }
-    for p in patients
+    for pid, nhs, first, last, gender, dob, address, phone, email in zip(
+        *(patients[c].tolist() for c in ("PatientID", "NHSNumber", "FirstName", "LastName", "Gender", "DOB", "Address", "Phone", "Email"))
+    )
 ]
 
 fhir_encounters = [
     {
         "resourceType": "Encounter",
-        "id": e.get("EncounterID"),
-        "subject": {"reference": f"Patient/{e.get('PatientID')}"},
-        "period": {"start": e.get("EncounterDate")},
-        "class": {"code": e.get("EncounterType")},
-        "serviceProvider": {"display": e.get("Location")},
+        "id": eid,
+        "subject": {"reference": subject},
+        "period": {"start": date},
+        "class": {"code": etype},
+        "serviceProvider": {"display": location},
     }
-    for e in encounters
+    for eid, subject, date, etype, location in zip(
+        encounters["EncounterID"].tolist(), references("Patient", encounters["PatientID"]),
+        *(encounters[c].tolist() for c in ("EncounterDate", "EncounterType", "Location"))
+    )
 ]
 
-fhir_observations = []
-for l in labs:
-    fhir_observations.append(
-        {
-            "resourceType": "Observation",
-            "id": l.get("LabID"),
-            "subject": {"reference": f"Patient/{l.get('PatientID')}"},
-            "encounter": {"reference": f"Encounter/{l.get('EncounterID')}"},
-            "code": {"text": l.get("LabType")},
-            "valueString": str(l.get("Value")),
-            "effectiveDateTime": l.get("LabDate"),
-            "status": random.choice(["final", "amended", "corrected"]),
-        }
+fhir_observations = [
+    {
+        "resourceType": "Observation",
+        "id": lab_id,
+        "subject": {"reference": subject},
+        "encounter": {"reference": encounter},
+        "code": {"text": lab_type},
+        "valueString": value,
+        "effectiveDateTime": lab_date,
+        "status": status,
+    }
+    for lab_id, subject, encounter, lab_type, value, lab_date, status in zip(
+        labs["LabID"].tolist(), references("Patient", labs["PatientID"]), references("Encounter", labs["EncounterID"]),
+        labs["LabType"].tolist(), labs["Value"].to_numpy(dtype=object).astype(str).tolist(), labs["LabDate"].tolist(),
+        choices(["final", "amended", "corrected"], len(labs)).tolist(),
     )
+]
 
 # ---------------------------
 # Export helpers
 # ---------------------------
-def write_csv(filename, rows, fieldnames):
-    with open(filename, "w", newline="", encoding="utf-8") as f:
-        writer = csv.DictWriter(f, fieldnames=fieldnames, extrasaction="ignore")
-        writer.writeheader()
-        for r in rows:
-            writer.writerow(r)
-    print(f"Wrote {filename} ({len(rows)} rows)")
+WRITE_BUFFER_BYTES = 1 << 20
+
+def write_csv(filename, df, fieldnames):
+    # Schema-drift columns are left out, as DictWriter(extrasaction="ignore") used to; rows go to
+    # csv.writer as tuples zipped from the column lists
+    columns = [df[c].tolist() if c in df.columns else [None] * len(df) for c in fieldnames]
+    with open(filename, "w", newline="", encoding="utf-8", buffering=WRITE_BUFFER_BYTES) as f:
+        writer = csv.writer(f)
+        writer.writerow(fieldnames)
+        writer.writerows(zip(*columns))
+    print(f"Wrote {filename} ({len(df)} rows)")
+
+def write_parquet(filename, df, fieldnames, categorical=()):
+    # Drifted columns mix text, numbers and None, so every column is stored as nullable text;
+    # low-cardinality ones are dictionary-encoded, with int8 codes while the dictionary fits
+    arrays = []
+    for c in fieldnames:
+        arr = pa.array([None if v is None else str(v) for v in df[c].tolist()], type=pa.string())
+        if c in categorical:
+            arr = arr.dictionary_encode()
+            index_type = pa.int8() if len(arr.dictionary) <= np.iinfo(np.int8).max else pa.int16()
+            arr = arr.cast(pa.dictionary(index_type, pa.string()))
+        arrays.append(arr)
+    pq.write_table(pa.Table.from_arrays(arrays, names=fieldnames), filename, compression="snappy")
+    print(f"Wrote {filename} ({len(df)} rows)")
+
+# orjson serialises datetimes (as ISO 8601, like isoformat()) and numpy values itself,
+# so records go out as they are with no Python-side conversion walk
+ORJSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY
 
 def write_json(filename, data):
-    def convert(obj):
-        if isinstance(obj, datetime):
-            return obj.isoformat()
-        elif isinstance(obj, dict):
-            return {k: convert(v) for k, v in obj.items()}
-        elif isinstance(obj, list):
-            return [convert(item) for item in obj]
-        else:
-            return obj
-
-    with open(filename, 'w', encoding='utf-8') as f:
-        json.dump(convert(data), f, indent=2, ensure_ascii=False)
+    with open(filename, "wb") as f:
+        f.write(orjson.dumps(data, option=ORJSON_OPTIONS | orjson.OPT_INDENT_2))
     print(f"Wrote {filename} with {len(data)} records.")
 
 def write_jsonl(filename, rows):
-    def convert(obj):
-        if isinstance(obj, datetime):
-            return obj.isoformat()
-        elif isinstance(obj, dict):
-            return {k: convert(v) for k, v in obj.items()}
-        elif isinstance(obj, list):
-            return [convert(item) for item in obj]
-        else:
-            return obj
-
-    with open(filename, "w", encoding="utf-8") as f:
-        for r in rows:
-            f.write(json.dumps(convert(r), ensure_ascii=False) + "\n")
+    # stream through a 1 MiB buffer instead of joining the whole file in memory first
+    with open(filename, "wb", buffering=WRITE_BUFFER_BYTES) as f:
+        f.writelines(orjson.dumps(r, option=ORJSON_OPTIONS | orjson.OPT_APPEND_NEWLINE) for r in rows)
     print(f"Wrote {filename} ({len(rows)} docs)")
 
 # ---------------------------
 # Export CSVs
 # ---------------------------
 write_csv("patients.csv", patients, ["PatientID","NHSNumber","FirstName","LastName","Gender","DOB","Address","Phone","Email"])
-write_csv("encounters.csv", encounters, ["EncounterID","PatientID","EncounterDate","EncounterType","Location"])
-write_csv("labs.csv", labs, ["LabID","EncounterID","PatientID","LabType","Value","LabDate"])
-write_csv("device_readings.csv", device_readings, ["ReadingID","PatientID","DeviceType","Value","Timestamp"])
 write_csv("registry.csv", registry, ["PatientID","InsuranceType","Region","EnrollmentDate"])
-write_csv("imaging.csv", imaging, ["ImageID","EncounterID","PatientID","Modality","ImagingDate"])
 write_csv("medications.csv", medications, ["PatientID","EncounterID","DrugName","Dosage","Route","StartDate","EndDate"])
 write_csv("claims.csv", claims, ["ClaimID","PatientID","EncounterID","ServiceDate","ClaimAmount","Status"])
 
+# ---------------------------
+# Export Parquet (high-volume domains)
+# ---------------------------
+parquet_domains = [
+    ("encounters", encounters, ["EncounterID","PatientID","EncounterDate","EncounterType","Location"], ["EncounterType"]),
+    ("labs", labs, ["LabID","EncounterID","PatientID","LabType","Value","LabDate"], ["LabType"]),
+    ("device_readings", device_readings, ["ReadingID","PatientID","DeviceType","Value","Timestamp"], ["DeviceType"]),
+    ("imaging", imaging, ["ImageID","EncounterID","PatientID","Modality","ImagingDate"], ["Modality"]),
+]
+for name, df, fieldnames, categorical in parquet_domains:
+    write_parquet(f"{name}.parquet", df, fieldnames, categorical)
+    if WRITE_CSV_FOR_PARQUET_DOMAINS:
+        write_csv(f"{name}.csv", df, fieldnames)
+
 # ---------------------------
 # Export JSONL (per collection + Mongo-ready)
 # ---------------------------
-write_jsonl("patients.jsonl", patients)
-write_jsonl("encounters.jsonl", encounters)
-write_jsonl("labs.jsonl", labs)
-write_jsonl("device_readings.jsonl", device_readings)
-write_jsonl("registry.jsonl", registry)
-write_jsonl("imaging.jsonl", imaging)
-
-write_jsonl("mongo_patients.jsonl", [{"_id": p["PatientID"], **p} for p in patients])
-write_jsonl("mongo_encounters.jsonl", [{"_id": e["EncounterID"], **e} for e in encounters])
-write_jsonl("mongo_labs.jsonl", labs)
-write_jsonl("mongo_device_readings.jsonl", device_readings)
+write_jsonl("patients.jsonl", records(patients))
+write_jsonl("encounters.jsonl", records(encounters))
+write_jsonl("labs.jsonl", records(labs))
+write_jsonl("device_readings.jsonl", records(device_readings))
+write_jsonl("registry.jsonl", records(registry))
+write_jsonl("imaging.jsonl", records(imaging))
+
+write_jsonl("mongo_patients.jsonl", [{"_id": p["PatientID"], **p} for p in records(patients)])
+write_jsonl("mongo_encounters.jsonl", [{"_id": e["EncounterID"], **e} for e in records(encounters)])
+write_jsonl("mongo_labs.jsonl", records(labs))
+write_jsonl("mongo_device_readings.jsonl", records(device_readings))
 
 # ---------------------------
 # Export FHIR-like JSON
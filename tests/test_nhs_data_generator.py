@@ -0,0 +1,117 @@
+import importlib.util
+import json
+import pathlib
+import random
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+import pytest
+
+_spec = importlib.util.spec_from_file_location(
+    "nhs_data_generator",
+    pathlib.Path(__file__).resolve().parents[1] / "app" / "docs" / "nhs_data_generator.py",
+)
+nhs_data_generator = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(nhs_data_generator)
+
+# Too few patients for any MHSDS, CSDS or social care records
+SMALL_CONFIG = dict(base_population=5, trusts=2, practices=3, years_of_data=1, workers=1)
+EMPTY_TABLES = ["mhsds_referrals", "csds_contacts", "social_care"]
+
+
+@pytest.mark.parametrize("keep_datasets", [True, False])
+def test_small_population_writes_empty_tables(tmp_path, monkeypatch, keep_datasets):
+    monkeypatch.chdir(tmp_path)
+    suite = nhs_data_generator.NHSDataGeneratorSuite(
+        nhs_data_generator.DataGenerationConfig(**SMALL_CONFIG)
+    )
+    datasets = suite.generate_all_datasets(keep_datasets=keep_datasets)
+
+    if keep_datasets:
+        assert all(len(datasets[name]) == 0 for name in EMPTY_TABLES)
+    for name in EMPTY_TABLES:
+        assert (tmp_path / "nhs_synthetic_data" / f"{name}.parquet").exists()
+
+
+@pytest.mark.parametrize(
+    "name, id_column",
+    [("sus_episodes", "episode_id"), ("prescriptions", "prescription_id")],
+)
+def test_streamed_chunks_form_one_dataset(tmp_path, monkeypatch, name, id_column):
+    monkeypatch.chdir(tmp_path)
+    suite = nhs_data_generator.NHSDataGeneratorSuite(
+        nhs_data_generator.DataGenerationConfig(**SMALL_CONFIG)
+    )
+    suite.generate_all_datasets(keep_datasets=False)
+
+    output_dir = tmp_path / "nhs_synthetic_data"
+    report = json.loads((output_dir / "generation_report.json").read_text())
+    table = ds.dataset(output_dir / name, partitioning="hive").to_table()
+    assert table.num_rows == report["dataset_summary"][name]["record_count"]
+    assert len(set(table.column(id_column).to_pylist())) == table.num_rows
+
+
+@pytest.mark.parametrize("keep_datasets", [True, False])
+def test_worker_globals_released_after_run(tmp_path, monkeypatch, keep_datasets):
+    monkeypatch.chdir(tmp_path)
+    suite = nhs_data_generator.NHSDataGeneratorSuite(
+        nhs_data_generator.DataGenerationConfig(**SMALL_CONFIG)
+    )
+    suite.generate_all_datasets(keep_datasets=keep_datasets)
+
+    assert nhs_data_generator._dataset_generators is None
+    assert nhs_data_generator._shard_generator is None
+
+
+def test_csv_copies_match_to_csv(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    suite = nhs_data_generator.NHSDataGeneratorSuite(
+        nhs_data_generator.DataGenerationConfig(**SMALL_CONFIG)
+    )
+    datasets = suite.generate_all_datasets(save_csv=True)
+
+    for name, df in datasets.items():
+        csv_path = tmp_path / "nhs_synthetic_data" / f"{name}.csv"
+        assert csv_path.read_text() == df.to_csv(index=False), name
+
+
+def test_streamed_run_matches_kept_run(tmp_path, monkeypatch):
+    for keep_datasets in (True, False):
+        run_dir = tmp_path / f"keep_{keep_datasets}"
+        run_dir.mkdir()
+        monkeypatch.chdir(run_dir)
+        # The provider generators draw from the module-level random state seeded on import
+        random.seed(42)
+        suite = nhs_data_generator.NHSDataGeneratorSuite(
+            nhs_data_generator.DataGenerationConfig(**SMALL_CONFIG)
+        )
+        suite.generate_all_datasets(save_csv=True, keep_datasets=keep_datasets)
+
+    # Everything but the creation timestamps is drawn from seeded generators
+    kept_dir = tmp_path / "keep_True" / "nhs_synthetic_data"
+    streamed_dir = tmp_path / "keep_False" / "nhs_synthetic_data"
+    for csv_path in sorted(kept_dir.glob("*.csv")):
+        kept = pd.read_csv(csv_path).drop(columns="created_timestamp", errors="ignore")
+        streamed = pd.read_csv(streamed_dir / csv_path.name).drop(columns="created_timestamp", errors="ignore")
+        pd.testing.assert_frame_equal(kept, streamed, obj=csv_path.name)
+
+
+def test_appended_chunks_keep_first_chunk_schema(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    suite = nhs_data_generator.NHSDataGeneratorSuite(
+        nhs_data_generator.DataGenerationConfig(**SMALL_CONFIG)
+    )
+    dates = pd.to_datetime(["2024-01-01", "2024-02-01"])
+    # Only the first chunk's quantities need 64 bits
+    suite.save_dataset("prescriptions", pd.DataFrame({"prescription_date": dates, "quantity": [2**40, 1]}),
+                       save_csv=True)
+    suite.save_dataset("prescriptions", pd.DataFrame({"prescription_date": dates, "quantity": [2, 3]}),
+                       save_csv=True, append=True)
+
+    output_dir = tmp_path / "nhs_synthetic_data"
+    part_files = list((output_dir / "prescriptions").rglob("*.parquet"))
+    assert len(part_files) == 2
+    assert all(pq.read_schema(path).field("quantity").type == pa.int64() for path in part_files)
+    assert pd.read_csv(output_dir / "prescriptions.csv")["quantity"].tolist() == [2**40, 1, 2, 3]